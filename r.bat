@@ -1,12 +1,20 @@
 @echo off
 setlocal ENABLEDELAYEDEXPANSION
-REM Usage: r [stg|prod] [chromium|firefox|webkit] [headed]
+REM Usage: r [stg|prod] [chromium|firefox|webkit|all] [headed]
+REM   all runs the three engines in parallel as a cross-browser matrix
 
 REM Defaults from args
 set ENV=%1
 if "%ENV%"=="" set ENV=stg
 set BROWSER=%2
 if "%BROWSER%"=="" set BROWSER=chromium
+set BROWSER_ARGS=--browser=%BROWSER%
+set INSTALL_BROWSERS=%BROWSER%
+if /I "%BROWSER%"=="all" (
+  set BROWSERS=chromium,firefox,webkit
+  set BROWSER_ARGS=-n 3 --dist=loadgroup
+  set INSTALL_BROWSERS=chromium firefox webkit
+)
 set HEADFLAG=
 if /I "%3"=="headed" set HEADFLAG=--headed
 
@@ -14,6 +22,13 @@ echo ==================================================
 echo Markopolo Playwright Test Runner
 echo ==================================================
 
+REM Set SKIP_INSTALL=1 to skip the dependency and browser checks on repeat runs
+if "%SKIP_INSTALL%"=="1" (
+  echo.
+  echo [1/3] [2/3] Skipping dependency and browser install ^(SKIP_INSTALL=1^)
+  goto :select_env
+)
+
 REM Ensure requirements are installed for Python 3.13
 echo.
 echo [1/3] Installing/updating Python dependencies...
@@ -24,16 +39,17 @@ if errorlevel 1 (
   goto :eof
 )
 
-REM Ensure Playwright browsers are installed
+REM Ensure the selected Playwright browser is installed
 echo.
-echo [2/3] Ensuring Playwright browsers are installed...
-py -3.13 -m playwright install >nul
+echo [2/3] Ensuring Playwright !BROWSER! is installed...
+py -3.13 -m playwright install !INSTALL_BROWSERS! >nul
 if errorlevel 1 (
   echo Playwright install failed. Showing output:
-  py -3.13 -m playwright install
+  py -3.13 -m playwright install !INSTALL_BROWSERS!
   goto :eof
 )
 
+:select_env
 REM Ask user which environment to test (use arg as default)
 echo.
 echo [3/3] Select environment to test:
@@ -67,8 +83,7 @@ echo.
 
 REM Export environment variables for this session
 set BASE_URL=!BASE_URL!
-
 REM Run pytest (generic discovery)
-py -3.13 -m pytest -v !HEADFLAG! --browser=!BROWSER!
+py -3.13 -m pytest -v !HEADFLAG! !BROWSER_ARGS!
 
 endlocal
@@ -0,0 +1,35 @@
+import pytest
+from playwright.sync_api import Browser, BrowserContext
+from typing import Dict, Any
+from local_server.server import LocalMarkopoloServer
+from utils.benchmark import BenchmarkSuite, save_baseline_requested
+from utils.scenario_registry import get_registry
+
+@pytest.fixture(scope="session")
+def benchmark_suite(pytestconfig) -> BenchmarkSuite:
+    suite = BenchmarkSuite()
+    # Read by the terminal summary in tests/conftest.py
+    pytestconfig.benchmark_suite = suite
+    yield suite
+    suite.save()
+    if save_baseline_requested():
+        suite.save(suite.baseline_path)
+
+@pytest.fixture(scope="session")
+def bench_server() -> LocalMarkopoloServer:
+    # Always the local stand-in with no injected latency, whatever BASE_URL says
+    defaults = get_registry().defaults
+    server = LocalMarkopoloServer(credentials=(defaults.email, defaults.password))
+    server.start()
+    try:
+        yield server
+    finally:
+        server.stop()
+
+@pytest.fixture(scope="function")
+def bench_context(browser: Browser, browser_context_args: Dict[str, Any]) -> BrowserContext:
+    ctx = browser.new_context(**{k: v for k, v in browser_context_args.items() if v is not None})
+    try:
+        yield ctx
+    finally:
+        ctx.close()
@@ -0,0 +1,126 @@
+import pytest
+from typing import Dict, List
+from pages.markopolo_login_page import MarkopoloLoginPage
+from utils.benchmark import BenchmarkSuite, benchmark_enabled, measure, measure_lifecycle
+from utils.browser_server import BrowserServer, browser_server_enabled
+from utils.scenario_registry import get_registry
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.timeout(900),
+    pytest.mark.skipif(not benchmark_enabled(), reason="benchmarks run only with BENCHMARK=true"),
+]
+
+
+def _record(suite: BenchmarkSuite, samples: Dict[str, List[float]]) -> None:
+    """Record every benchmark, then fail once if any of them regressed."""
+    problems = [problem for name, values in samples.items() if (problem := suite.record(name, values))]
+    if problems:
+        pytest.fail("Overhead regressed beyond the baseline:\n" + "\n".join(problems))
+
+
+class TestFixtureOverhead:
+    """Setup and teardown cost of the browser, context and page fixtures."""
+
+    def test_browser(self, pw, engine: str, benchmark_suite: BenchmarkSuite):
+        browser_type = getattr(pw, engine)
+        if browser_server_enabled():
+            server = BrowserServer(engine)
+
+            def setup():
+                return server.connect(browser_type)
+
+            def teardown(browser):
+                server.release()
+                browser.close()
+        else:
+            def setup():
+                return browser_type.launch(headless=True)
+
+            def teardown(browser):
+                browser.close()
+
+        setups, teardowns = measure_lifecycle(setup, teardown, benchmark_suite.trials, benchmark_suite.warmup)
+        _record(benchmark_suite, {f"{engine}/browser_setup": setups, f"{engine}/browser_teardown": teardowns})
+
+    def test_context(self, browser, browser_context_args, context_pool, engine: str,
+                     benchmark_suite: BenchmarkSuite):
+        if context_pool:
+            setup = context_pool.acquire
+
+            def teardown(ctx):
+                context_pool.release(ctx, failed=False)
+        else:
+            def setup():
+                return browser.new_context(**{k: v for k, v in browser_context_args.items() if v is not None})
+
+            def teardown(ctx):
+                ctx.close()
+
+        setups, teardowns = measure_lifecycle(setup, teardown, benchmark_suite.trials, benchmark_suite.warmup)
+        _record(benchmark_suite, {f"{engine}/context_setup": setups, f"{engine}/context_teardown": teardowns})
+
+    def test_page(self, bench_context, bench_server, engine: str, benchmark_suite: BenchmarkSuite):
+        def setup():
+            page = bench_context.new_page()
+            page.set_default_timeout(30000)
+            page.goto(bench_server.base_url)
+            return page
+
+        setups, teardowns = measure_lifecycle(setup, lambda page: page.close(),
+                                              benchmark_suite.trials, benchmark_suite.warmup)
+        _record(benchmark_suite, {f"{engine}/page_setup": setups, f"{engine}/page_teardown": teardowns})
+
+
+class TestLoginPageOverhead:
+    """Cost of the login page object's steps against the local server."""
+
+    @pytest.fixture
+    def login(self, bench_context, bench_server) -> MarkopoloLoginPage:
+        page = bench_context.new_page()
+        login = MarkopoloLoginPage(page)
+        login.navigate_to_prod_env(bench_server.base_url)
+        yield login
+        page.close()
+
+    def test_find_element(self, login: MarkopoloLoginPage, engine: str, benchmark_suite: BenchmarkSuite):
+        # Forget the memoized locators so every trial resolves the selector race
+        samples = measure(lambda _: login._find_element('password'), benchmark_suite.trials,
+                          benchmark_suite.warmup, before=login._memo.clear)
+        _record(benchmark_suite, {f"{engine}/find_element": samples})
+
+    def test_enter_credentials(self, login: MarkopoloLoginPage, bench_server, engine: str,
+                               benchmark_suite: BenchmarkSuite):
+        defaults = get_registry().defaults
+        samples = measure(lambda _: login.enter_credentials(defaults.invalid_email, defaults.invalid_password),
+                          benchmark_suite.trials, benchmark_suite.warmup,
+                          before=lambda: login.navigate_to_prod_env(bench_server.base_url))
+        _record(benchmark_suite, {f"{engine}/enter_credentials": samples})
+
+    def test_click_sign_in(self, login: MarkopoloLoginPage, bench_server, engine: str,
+                           benchmark_suite: BenchmarkSuite):
+        def before():
+            login.navigate_to_prod_env(bench_server.base_url)
+            login.enter_invalid_credentials()
+
+        samples = measure(lambda _: login.click_sign_in(), benchmark_suite.trials, benchmark_suite.warmup,
+                          before=before)
+        _record(benchmark_suite, {f"{engine}/click_sign_in": samples})
+
+    def test_perform_login(self, browser, browser_context_args, bench_server, engine: str,
+                           benchmark_suite: BenchmarkSuite):
+        defaults = get_registry().defaults
+
+        def before():
+            # A fresh context per trial, so no trial starts out logged in
+            ctx = browser.new_context(**{k: v for k, v in browser_context_args.items() if v is not None})
+            return MarkopoloLoginPage(ctx.new_page())
+
+        def login_once(login: MarkopoloLoginPage):
+            login.perform_login(bench_server.base_url, defaults.email, defaults.password)
+            return login
+
+        # Also runs after a failed login, so the trial's context never leaks
+        samples = measure(login_once, benchmark_suite.trials, benchmark_suite.warmup,
+                          before=before, after=lambda login: login.page.context.close())
+        _record(benchmark_suite, {f"{engine}/perform_login": samples})
@@ -1,7 +1,23 @@
 import os
+import json
+import time
+import logging
+import statistics
 import pytest
 from playwright.sync_api import Browser, BrowserContext, Page, sync_playwright
 from typing import Dict, Any
+from local_server.server import LocalMarkopoloServer
+from utils import perf_capture, step_profiler
+from utils.artifacts import ContextArtifacts, artifact_mode, close_artifact_store, get_artifact_store, video_dir
+from utils.auth_state import AuthStateCache
+from utils.browser_server import BrowserServer, browser_server_enabled
+from utils.context_pool import ContextPool
+from utils.credential_pool import get_credential_pool, leased_credential
+from utils.duration_history import DurationHistory, history_enabled, longest_first, shard
+from utils.env import env_flag
+from utils.har_replay import attach_har, har_mode, merge_recordings
+from utils.network_profiles import NetworkShaper, get_profile
+from utils.selector_cache import get_selector_cache
 
 # Get base URL from environment variable or use a default
 BASE_URL = os.getenv("BASE_URL", "https://beta-stg.markopolo.ai")
@@ -19,38 +35,159 @@ def browser_context_args() -> Dict[str, Any]:
             "height": 1080,
         },
         "ignore_https_errors": True,
-        "record_video_dir": "videos/" if os.getenv("RECORD_VIDEO", "false").lower() == "true" else None,
+        # Each xdist worker records into its own directory; artifact modes record to a scratch dir
+        "record_video_dir": video_dir() or (os.path.join("videos", os.getenv("PYTEST_XDIST_WORKER", ""))
+                                            if env_flag("RECORD_VIDEO") else None),
     }
 
 @pytest.fixture(scope="session")
-def base_url(pytestconfig) -> str:
-    return os.getenv("BASE_URL", BASE_URL)
+def local_server():
+    server = LocalMarkopoloServer.from_env()
+    base_url = server.start()
+    # Page objects and hooks read BASE_URL from the environment
+    os.environ["BASE_URL"] = base_url
+    try:
+        yield server
+    finally:
+        server.stop()
 
 @pytest.fixture(scope="session")
-def browser(pytestconfig, pw) -> Browser:
+def base_url(request, pytestconfig) -> str:
+    if BASE_URL == "local":
+        return request.getfixturevalue("local_server").base_url
+    return os.getenv("BASE_URL", BASE_URL)
+
+def _browser_name(config) -> str:
     # Read from pytest options if available (e.g., provided by pytest-playwright), else from env, else defaults
-    browser_opt = getattr(pytestconfig.option, "browser", None)
+    browser_opt = getattr(config.option, "browser", None)
     if isinstance(browser_opt, (list, tuple)):
         browser_name = (browser_opt[0] if browser_opt else None)
     else:
         browser_name = browser_opt
-    browser_name = browser_name or os.getenv("BROWSER", "chromium")
+    return browser_name or os.getenv("BROWSER", "chromium")
+
+def _matrix_engines(config) -> list:
+    # Several engines from BROWSERS=chromium,firefox,webkit or a repeated --browser option
+    engines = [name.strip() for name in os.getenv("BROWSERS", "").split(",") if name.strip()]
+    browser_opt = getattr(config.option, "browser", None)
+    if not engines and isinstance(browser_opt, (list, tuple)):
+        engines = list(browser_opt)
+    return list(dict.fromkeys(engines)) if len(set(engines)) > 1 else []
+
+def _item_engine(item) -> str:
+    callspec = getattr(item, "callspec", None)
+    return callspec.params.get("engine") if callspec else None
+
+@pytest.fixture(scope="session")
+def engine(request) -> str:
+    # Parametrized by pytest_generate_tests in matrix mode
+    return getattr(request, "param", None) or _browser_name(request.config)
+
+@pytest.fixture(scope="session")
+def browser(pytestconfig, pw, engine: str) -> Browser:
+    browser_name = engine
 
     headed_raw = getattr(pytestconfig.option, "headed", None)
     if headed_raw is None:
-        headed = os.getenv("HEADED", "false").lower() in ("1", "true", "yes", "y")
+        headed = env_flag("HEADED")
     else:
         headed = bool(headed_raw)
     slow_mo = int(os.getenv("SLOW_MO", "0"))
-    return getattr(pw, browser_name).launch(headless=not headed, slow_mo=slow_mo)
+    browser_type = getattr(pw, browser_name)
+    if not browser_server_enabled():
+        yield browser_type.launch(headless=not headed, slow_mo=slow_mo)
+        return
+    # Connect to the long-lived server instead of paying the browser cold start
+    server = BrowserServer(browser_name, headless=not headed)
+    browser = server.connect(browser_type, slow_mo=slow_mo)
+    try:
+        yield browser
+    finally:
+        server.release()
+        # Closes this run's contexts and disconnects; the server keeps running
+        browser.close()
+
+def _test_failed(item) -> bool:
+    return any(getattr(item, f"rep_{when}", None) is not None and getattr(item, f"rep_{when}").failed
+               for when in ("setup", "call"))
+
+def _keep_artifacts(item) -> bool:
+    # execution_count is set by pytest-rerunfailures on retried tests
+    return artifact_mode() == "on" or _test_failed(item) or getattr(item, "execution_count", 1) > 1
+
+def _record_artifacts(request, ctx: BrowserContext):
+    if artifact_mode() == "off":
+        return None
+    recorder = ContextArtifacts(ctx, request.node.nodeid)
+    recorder.start()
+    return recorder
+
+@pytest.fixture(scope="session")
+def context_pool(browser: Browser, browser_context_args: Dict[str, Any]):
+    if not env_flag("CONTEXT_POOL"):
+        yield None
+        return
+    pool = ContextPool(
+        browser,
+        browser_context_args,
+        size=int(os.getenv("CONTEXT_POOL_SIZE", "2")),
+        max_uses=int(os.getenv("CONTEXT_POOL_MAX_USES", "20")),
+    )
+    try:
+        yield pool
+    finally:
+        pool.close()
 
 @pytest.fixture(scope="function")
-def context(browser: Browser, browser_context_args: Dict[str, Any]) -> BrowserContext:
-    ctx = browser.new_context(**{k: v for k, v in browser_context_args.items() if v is not None})
+def context(request, browser: Browser, browser_context_args: Dict[str, Any], context_pool,
+            base_url: str) -> BrowserContext:
+    started = time.perf_counter()
+    if context_pool:
+        ctx = context_pool.acquire()
+    else:
+        ctx = browser.new_context(**{k: v for k, v in browser_context_args.items() if v is not None})
+    responder = attach_har(ctx, base_url) if har_mode() != "off" else None
+    recorder = _record_artifacts(request, ctx)
+    request.node.user_properties.append(("context_setup_ms", (time.perf_counter() - started) * 1000))
+
+    # An explicit NETWORK_PROFILE applies to the whole run; otherwise the marker picks the profile
+    marker = request.node.get_closest_marker("network_profile")
+    shaper = NetworkShaper(ctx, get_profile(os.getenv("NETWORK_PROFILE") or (marker.args[0] if marker else None)),
+                           base_url)
+    shaper.attach()
     try:
         yield ctx
     finally:
-        ctx.close()
+        shaper.detach()
+        stats = shaper.stats
+        if stats.blocked:
+            logging.getLogger(__name__).info(
+                f"Network profile {stats.profile}: blocked {stats.blocked}/{stats.requests} requests "
+                f"({stats.bytes_blocked} bytes known), received {stats.bytes_received} bytes"
+            )
+        request.node.user_properties.extend([
+            ("network_profile", stats.profile),
+            ("network_requests", stats.requests),
+            ("network_blocked_requests", stats.blocked),
+            ("network_blocked_bytes", stats.bytes_blocked),
+            ("network_received_bytes", stats.bytes_received),
+        ])
+
+        replay_problem = responder.finish() if responder else None
+
+        started = time.perf_counter()
+        keep = _keep_artifacts(request.node)
+        if recorder:
+            recorder.stop(keep)
+        if context_pool:
+            context_pool.release(ctx, failed=_test_failed(request.node))
+        else:
+            ctx.close()
+        if recorder:
+            recorder.finish(get_artifact_store(), keep)
+        request.node.user_properties.append(("context_teardown_ms", (time.perf_counter() - started) * 1000))
+        if replay_problem:
+            pytest.fail(replay_problem, pytrace=False)
 
 @pytest.fixture(scope="function")
 def page(context: BrowserContext, base_url: str) -> Page:
@@ -62,6 +199,57 @@ def page(context: BrowserContext, base_url: str) -> Page:
     finally:
         page.close()
 
+@pytest.fixture(scope="session")
+def auth_state(browser: Browser, browser_context_args: Dict[str, Any], base_url: str) -> AuthStateCache:
+    leased = leased_credential()
+    email = leased.email if leased else os.getenv("MANUAL_EMAIL")
+    password = leased.password if leased else os.getenv("MANUAL_PASSWORD")
+    if not email or not password:
+        pytest.skip("A credential pool or MANUAL_EMAIL and MANUAL_PASSWORD are required for authenticated tests")
+    return AuthStateCache(browser, browser_context_args, base_url, email, password)
+
+@pytest.fixture(scope="function")
+def authenticated_context(request, browser: Browser, browser_context_args: Dict[str, Any],
+                          auth_state: AuthStateCache) -> BrowserContext:
+    ctx = browser.new_context(
+        storage_state=auth_state.ensure(),
+        **{k: v for k, v in browser_context_args.items() if v is not None},
+    )
+    recorder = _record_artifacts(request, ctx)
+    try:
+        yield ctx
+    finally:
+        keep = _keep_artifacts(request.node)
+        if recorder:
+            recorder.stop(keep)
+        ctx.close()
+        if recorder:
+            recorder.finish(get_artifact_store(), keep)
+
+@pytest.fixture(scope="function")
+def authenticated_page(authenticated_context: BrowserContext, base_url: str) -> Page:
+    page = authenticated_context.new_page()
+    page.set_default_timeout(30000)
+    page.goto(base_url)
+    try:
+        yield page
+    finally:
+        page.close()
+
+@pytest.fixture(autouse=True)
+def perf_collector(request):
+    if not perf_capture.perf_enabled():
+        yield None
+        return
+    collector = perf_capture.PerfCollector(request.node.nodeid)
+    request.node.perf_collector = collector
+    perf_capture.activate(collector)
+    try:
+        yield collector
+    finally:
+        perf_capture.activate(None)
+        collector.write()
+
 # This hook allows adding custom markers
 def pytest_configure(config):
     config.addinivalue_line(
@@ -80,3 +268,331 @@ def pytest_configure(config):
         "markers",
         "manual: mark test as requiring manual interaction"
     )
+    # Start each run with empty result directories (once, on the controller)
+    if perf_capture.perf_enabled() and not hasattr(config, "workerinput"):
+        for stale in perf_capture.PERF_DIR.glob("*.jsonl"):
+            stale.unlink()
+    engines = _matrix_engines(config)
+    # Per-engine step latencies in matrix mode come from the step profiler too
+    if step_profiler.profile_enabled() or engines:
+        if not hasattr(config, "workerinput"):
+            for stale in step_profiler.PROFILE_DIR.glob("steps-*.json"):
+                stale.unlink()
+        step_profiler.activate(step_profiler.StepProfiler())
+    if history_enabled():
+        config.duration_history = DurationHistory(browsers=engines or [_browser_name(config)],
+                                                  base_url=os.getenv("BASE_URL", BASE_URL))
+
+
+def pytest_generate_tests(metafunc):
+    engines = _matrix_engines(metafunc.config)
+    if engines and "engine" in metafunc.fixturenames:
+        metafunc.parametrize("engine", engines, indirect=True, scope="session")
+
+
+def _history_id(item) -> str:
+    # --dist=loadgroup appends "@<group>" to node ids on workers
+    marker = item.get_closest_marker("xdist_group")
+    if marker and marker.args and item.nodeid.endswith(f"@{marker.args[0]}"):
+        return item.nodeid[:-len(marker.args[0]) - 1]
+    return item.nodeid
+
+
+# Before xdist's own hook, which turns xdist_group markers into node id suffixes
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    # Tag before setup so every phase's report carries the engine
+    for item in items:
+        if _item_engine(item):
+            item.user_properties.append(("engine", _item_engine(item)))
+    if not items:
+        return
+    history = getattr(config, "duration_history", None)
+    if history is not None:
+        known = [history.estimate(item.nodeid) for item in items]
+        default = statistics.median([e for e in known if e is not None] or [5.0])
+        estimates = {item.nodeid: estimate if estimate is not None else default
+                     for item, estimate in zip(items, known)}
+        if env_flag("TEST_ORDER_BY_DURATION", "true"):
+            items[:] = longest_first(items, estimates)
+    else:
+        # Without history every test counts the same, so shards balance by count
+        estimates = {item.nodeid: 1.0 for item in items}
+
+    # Duration-balanced shards; each xdist worker computes the same plan from the same snapshot.
+    # In matrix mode every engine gets its own shards, so engines run in separate workers.
+    workers = getattr(config, "workerinput", {}).get("workercount", 0)
+    # On workers xdist resets option.dist to "no" and sets option.loadgroup instead
+    if workers > 1 and getattr(config.option, "loadgroup", False):
+        by_engine: Dict[str, list] = {}
+        for item in items:
+            by_engine.setdefault(_item_engine(item) or "", []).append(item)
+        for name, group in by_engine.items():
+            assignment = shard(group, estimates, max(1, workers // len(by_engine)))
+            prefix = f"{name}-" if name else ""
+            for item in group:
+                if not item.get_closest_marker("xdist_group"):
+                    item.add_marker(pytest.mark.xdist_group(f"{prefix}shard{assignment[item.nodeid]}"))
+
+    # Retry only tests whose recent history flips between passing and failing
+    if history is not None and config.pluginmanager.hasplugin("rerunfailures"):
+        threshold = float(os.getenv("FLAKE_THRESHOLD", "0.2"))
+        reruns = int(os.getenv("FLAKE_RERUNS", "2"))
+        for item in items:
+            score = history.flake_score(item.nodeid)
+            if score >= threshold and not item.get_closest_marker("flaky"):
+                item.add_marker(pytest.mark.flaky(reruns=reruns))
+                item.user_properties.append(("flake_score", score))
+
+
+@pytest.hookimpl(tryfirst=True, hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    if call.when == "teardown" and worker:
+        # Lets the controller aggregate results per worker and account
+        item.user_properties.append(("xdist_worker", worker))
+        pool = get_credential_pool()
+        if pool and pool.held:
+            item.user_properties.append(("leased_account", pool.held.label))
+    outcome = yield
+    rep = outcome.get_result()
+    collector = getattr(item, "perf_collector", None)
+    if rep.when == "call" and rep.passed and collector:
+        problems = collector.violations(perf_capture.thresholds_for(item))
+        if problems:
+            rep.outcome = "failed"
+            rep.longrepr = "Performance regression: " + "; ".join(problems)
+    setattr(item, f"rep_{rep.when}", rep)
+    history = getattr(item.config, "duration_history", None)
+    if history is not None and rep.when == "teardown":
+        phases = [getattr(item, f"rep_{when}", None) for when in ("setup", "call", "teardown")]
+        phases = [phase for phase in phases if phase is not None]
+        if not any(phase.skipped for phase in phases):
+            history.record(_history_id(item), "failed" if any(phase.failed for phase in phases) else "passed",
+                           sum(phase.duration for phase in phases), browser=_item_engine(item))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    profiler = step_profiler.current()
+    if profiler is None:
+        yield
+        return
+    # The test itself is the root frame of the folded stacks
+    profiler.tag = _item_engine(item)
+    try:
+        with profiler.step(item.nodeid, ranked=False):
+            yield
+    finally:
+        profiler.tag = None
+
+
+def _finish_step_profile(session) -> None:
+    profiler = step_profiler.current()
+    if profiler is None:
+        return
+    worker = getattr(session.config, "workerinput", {}).get("workerid", "main")
+    profiler.dump(step_profiler.PROFILE_DIR / f"steps-{worker}.json")
+    if hasattr(session.config, "workerinput"):
+        return
+    merged = step_profiler.StepProfiler()
+    for path in step_profiler.PROFILE_DIR.glob("steps-*.json"):
+        with open(path, 'r', encoding='utf-8') as file:
+            merged.merge(json.load(file))
+    merged.write_folded(step_profiler.PROFILE_DIR / "steps.folded")
+    with open(step_profiler.PROFILE_DIR / "report.txt", 'w', encoding='utf-8') as file:
+        file.write("\n".join(merged.report_lines(limit=1000)) + "\n")
+    session.config.step_profile = merged
+
+
+def pytest_sessionfinish(session, exitstatus):
+    _finish_step_profile(session)
+    kept = close_artifact_store()
+    if kept:
+        logging.getLogger(__name__).info(f"Kept {len(kept)} artifact archives in {kept[0].parent}")
+    if perf_capture.perf_enabled() and not hasattr(session.config, "workerinput"):
+        perf_capture.write_summary()
+    # Recordings from every xdist worker are merged once, by the controller
+    if har_mode() == "record" and not hasattr(session.config, "workerinput"):
+        merge_recordings(os.getenv("BASE_URL", BASE_URL))
+    cache = get_selector_cache()
+    if cache:
+        cache.save()
+    history = getattr(session.config, "duration_history", None)
+    if history is not None:
+        history.save()
+    pool = get_credential_pool()
+    if pool:
+        pool.release()
+
+
+def _report_context_latency(terminalreporter) -> None:
+    timings: Dict[str, list] = {"context_setup_ms": [], "context_teardown_ms": []}
+    for reports in terminalreporter.stats.values():
+        for rep in reports:
+            if getattr(rep, "when", None) != "teardown":
+                continue
+            for name, value in getattr(rep, "user_properties", []):
+                if name in timings:
+                    timings[name].append(value)
+    if not timings["context_setup_ms"]:
+        return
+    mode = "pooled" if env_flag("CONTEXT_POOL") else "fresh"
+    terminalreporter.section(f"browser context latency ({mode})")
+    for name, values in timings.items():
+        if not values:
+            continue
+        ordered = sorted(values)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        terminalreporter.write_line(
+            f"{name}: n={len(values)} mean={statistics.mean(values):.1f} "
+            f"p50={statistics.median(values):.1f} p95={p95:.1f}"
+        )
+
+
+def _report_network_usage(terminalreporter) -> None:
+    totals: Dict[str, Dict[str, int]] = {}
+    for reports in terminalreporter.stats.values():
+        for rep in reports:
+            if getattr(rep, "when", None) != "teardown":
+                continue
+            properties = dict(getattr(rep, "user_properties", []))
+            if "network_profile" not in properties:
+                continue
+            profile = totals.setdefault(properties["network_profile"], {})
+            for name, value in properties.items():
+                if name.startswith("network_") and name != "network_profile":
+                    profile[name] = profile.get(name, 0) + value
+    blocking = {name: counts for name, counts in totals.items() if counts.get("network_blocked_requests")}
+    if not blocking:
+        return
+    terminalreporter.section("network profiles")
+    for name, counts in sorted(blocking.items()):
+        # Sizes are only known for URLs served unblocked earlier, so blocked bytes are a lower bound
+        terminalreporter.write_line(
+            f"{name:<8} blocked {counts['network_blocked_requests']}/{counts['network_requests']} requests, "
+            f"received {counts['network_received_bytes']} bytes, "
+            f"at least {counts['network_blocked_bytes']} bytes blocked (known sizes only)"
+        )
+
+
+def _report_perf_summary(terminalreporter) -> None:
+    summary_path = perf_capture.PERF_DIR / "summary.json"
+    if not perf_capture.perf_enabled() or not summary_path.exists():
+        return
+    with open(summary_path, 'r', encoding='utf-8') as file:
+        summary = json.load(file)
+    terminalreporter.section("browser performance (ms)")
+    for action, metrics in summary.items():
+        for metric, stats in metrics.items():
+            terminalreporter.write_line(
+                f"{action:<22} {metric:<13} n={stats['count']:<4} "
+                f"p50={stats['p50']:.0f} p95={stats['p95']:.0f} p99={stats['p99']:.0f}"
+            )
+
+
+def _report_worker_balance(terminalreporter) -> None:
+    durations: Dict[str, float] = {}
+    workers: Dict[str, str] = {}
+    accounts: Dict[str, str] = {}
+    for reports in terminalreporter.stats.values():
+        for rep in reports:
+            nodeid = getattr(rep, "nodeid", None)
+            if nodeid is None or not hasattr(rep, "duration"):
+                continue
+            durations[nodeid] = durations.get(nodeid, 0.0) + rep.duration
+            properties = dict(getattr(rep, "user_properties", []))
+            if "xdist_worker" in properties:
+                workers[nodeid] = properties["xdist_worker"]
+                if "leased_account" in properties:
+                    accounts[properties["xdist_worker"]] = properties["leased_account"]
+    if not workers:
+        return
+    per_worker: Dict[str, list] = {}
+    for nodeid, worker in workers.items():
+        per_worker.setdefault(worker, []).append(durations[nodeid])
+    terminalreporter.section("xdist workers")
+    for worker in sorted(per_worker, key=lambda name: int(name[2:]) if name[2:].isdigit() else 0):
+        times = per_worker[worker]
+        account = f" account={accounts[worker]}" if worker in accounts else ""
+        terminalreporter.write_line(f"{worker:<6} tests={len(times):<4} busy={sum(times):>7.1f}s{account}")
+
+
+def _report_engine_matrix(terminalreporter, config) -> None:
+    durations: Dict[str, float] = {}
+    engines: Dict[str, str] = {}
+    phases: Dict[str, Dict[str, str]] = {}
+    for reports in terminalreporter.stats.values():
+        for rep in reports:
+            nodeid = getattr(rep, "nodeid", None)
+            if nodeid is None or not hasattr(rep, "duration"):
+                continue
+            properties = dict(getattr(rep, "user_properties", []))
+            if "engine" not in properties:
+                continue
+            engines[nodeid] = properties["engine"]
+            durations[nodeid] = durations.get(nodeid, 0.0) + rep.duration
+            # Reports of attempts that pytest-rerunfailures retried have outcome "rerun"
+            if rep.outcome != "rerun":
+                phases.setdefault(nodeid, {})[rep.when] = rep.outcome
+    if not engines:
+        return
+    results: Dict[str, Dict[str, int]] = {}
+    for nodeid, engine in engines.items():
+        outcomes = phases.get(nodeid, {}).values()
+        if "failed" in outcomes:
+            status = "failed"
+        elif "skipped" in outcomes:
+            status = "skipped"
+        else:
+            status = "passed"
+        results.setdefault(engine, {"passed": 0, "failed": 0, "skipped": 0})[status] += 1
+    terminalreporter.section("cross-browser matrix")
+    for name in sorted(results):
+        busy = sum(durations[nodeid] for nodeid, engine in engines.items() if engine == name)
+        stats = results[name]
+        terminalreporter.write_line(f"{name:<10} passed={stats['passed']:<4} failed={stats['failed']:<4} "
+                                    f"skipped={stats['skipped']:<4} busy={busy:>7.1f}s")
+    merged = getattr(config, "step_profile", None)
+    if merged is not None:
+        for line in merged.comparison_lines():
+            terminalreporter.write_line(line)
+
+
+def _report_step_profile(terminalreporter, config) -> None:
+    merged = getattr(config, "step_profile", None)
+    if merged is None or not merged.steps or not step_profiler.profile_enabled():
+        return
+    terminalreporter.section("step profile")
+    for line in merged.report_lines():
+        terminalreporter.write_line(line)
+    terminalreporter.write_line(f"flamegraph input: {step_profiler.PROFILE_DIR / 'steps.folded'}")
+
+
+def _report_benchmarks(terminalreporter, config) -> None:
+    suite = getattr(config, "benchmark_suite", None)
+    if suite is None or not suite.results:
+        return
+    terminalreporter.section(f"benchmarks (ms, {suite.trials} trials after {suite.warmup} warmup)")
+    for line in suite.report_lines():
+        terminalreporter.write_line(line)
+    for problem in suite.regressions:
+        terminalreporter.write_line(f"REGRESSION {problem}", red=True)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    _report_context_latency(terminalreporter)
+    _report_network_usage(terminalreporter)
+    _report_perf_summary(terminalreporter)
+    _report_step_profile(terminalreporter, config)
+    _report_worker_balance(terminalreporter)
+    _report_engine_matrix(terminalreporter, config)
+    _report_benchmarks(terminalreporter, config)
+    cache = get_selector_cache()
+    if not cache:
+        return
+    rotted = cache.rot_report()
+    if rotted:
+        terminalreporter.section("rotted primary selectors")
+        for line in rotted:
+            terminalreporter.write_line(line)
@@ -0,0 +1,213 @@
+"""Local stand-in for the Markopolo login page and auth API.
+
+Reproduces the DOM the page object relies on (Mantine inputs, "required"
+validation text, the ``go`` error toast, the redirect to ``/dashboard``) and the
+auth semantics, with configurable latency, error rate and slow rendering.
+
+Usage (from the ``tests`` directory)::
+
+    python -m local_server.server --port 8765 --latency-ms 50
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any, List, Tuple
+from utils.credential_pool import load_accounts
+from utils.scenario_registry import get_registry
+
+logger = logging.getLogger(__name__)
+
+PAGES_DIR = Path(__file__).parent
+AUTH_ENDPOINT = "/api/v1/auth/login"
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s.]+(\.[^@\s.]+)+$")
+
+
+def _default_credentials() -> Tuple[str, str]:
+    """Valid credentials: MANUAL_EMAIL/MANUAL_PASSWORD, else the test data defaults."""
+    email, password = os.getenv("MANUAL_EMAIL"), os.getenv("MANUAL_PASSWORD")
+    if email and password:
+        return email, password
+    defaults = get_registry().defaults
+    return defaults.email, defaults.password
+
+
+class LocalMarkopoloServer:
+    """Threaded HTTP server that stands in for a Markopolo environment.
+
+    Every response is delayed by ``latency_ms``; a fraction ``error_rate`` of
+    auth requests fail with HTTP 500; and the login form is mounted
+    ``render_delay_ms`` after the document loads to mimic a slow SPA render.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0,
+                 error_rate: float = 0.0, render_delay_ms: float = 0.0,
+                 credentials: Optional[Tuple[str, str]] = None):
+        """Initialize the server (it does not listen until :meth:`start`).
+
+        Args:
+            host: Interface to bind
+            port: Port to bind; 0 picks a free one
+            latency_ms: Artificial delay added to every response
+            error_rate: Probability (0-1) that an auth request returns HTTP 500
+            render_delay_ms: Delay before the login form is mounted
+            credentials: Valid (email, password); defaults to MANUAL_* or test data.
+                Accounts in the credential pool are accepted as well.
+        """
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.render_delay_ms = render_delay_ms
+        self.credentials = credentials or _default_credentials()
+        self.accounts = {self.credentials} | {(account.email, account.password) for account in load_accounts()}
+        self.requests: Dict[str, int] = {}
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls) -> "LocalMarkopoloServer":
+        """Build a server configured from LOCAL_SERVER_* environment variables."""
+        return cls(
+            port=int(os.getenv("LOCAL_SERVER_PORT", "0")),
+            latency_ms=float(os.getenv("LOCAL_SERVER_LATENCY_MS", "0")),
+            error_rate=float(os.getenv("LOCAL_SERVER_ERROR_RATE", "0")),
+            render_delay_ms=float(os.getenv("LOCAL_SERVER_RENDER_DELAY_MS", "0")),
+        )
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> str:
+        """Start serving in a background thread and return the base URL."""
+        self._httpd = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="local-markopolo", daemon=True)
+        self._thread.start()
+        logger.info(f"Local Markopolo server listening on {self.base_url}")
+        return self.base_url
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def authenticate(self, email: str, password: str) -> Tuple[int, Dict[str, Any]]:
+        """Apply the auth semantics to a credential pair.
+
+        Returns:
+            (HTTP status, JSON body)
+        """
+        if random.random() < self.error_rate:
+            return 500, {"success": False, "message": "Internal server error"}
+        if not email.strip() or not password.strip():
+            return 422, {"success": False, "message": "Email and password are required"}
+        if not _EMAIL_RE.match(email) or len(email) > 254:
+            return 422, {"success": False, "message": "Please enter a valid email address"}
+        if (email, password) not in self.accounts:
+            return 401, {"success": False, "message": "Invalid credentials"}
+        token = f"local-{int(time.time() * 1000)}"
+        return 200, {"success": True, "message": "Login successful",
+                     "data": {"accessToken": token, "refreshToken": f"{token}-refresh"}}
+
+    def _render(self, name: str) -> bytes:
+        html = (PAGES_DIR / name).read_text(encoding="utf-8")
+        html = html.replace("__RENDER_DELAY_MS__", str(int(self.render_delay_ms)))
+        html = html.replace("__AUTH_ENDPOINT__", AUTH_ENDPOINT)
+        return html.encode("utf-8")
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug(f"{self.address_string()} {format % args}")
+
+            def _send(self, status: int, body: bytes = b"", content_type: str = "text/html; charset=utf-8",
+                      headers: Optional[List[Tuple[str, str]]] = None) -> None:
+                if server.latency_ms:
+                    time.sleep(server.latency_ms / 1000)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-store")
+                for name, value in headers or []:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _count(self) -> None:
+                path = self.path.split("?", 1)[0]
+                server.requests[path] = server.requests.get(path, 0) + 1
+
+            def do_GET(self) -> None:
+                self._count()
+                path = self.path.split("?", 1)[0]
+                if path == "/":
+                    self._send(302, headers=[("Location", "/login")])
+                elif path in ("/login", "/login/"):
+                    self._send(200, server._render("login.html"))
+                elif path.startswith("/dashboard"):
+                    self._send(200, server._render("dashboard.html"))
+                elif path == "/favicon.ico":
+                    self._send(204)
+                else:
+                    self._send(404, b"Not found", "text/plain")
+
+            def do_POST(self) -> None:
+                self._count()
+                if self.path.split("?", 1)[0] != AUTH_ENDPOINT:
+                    self._send(404, b"Not found", "text/plain")
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    payload = {}
+                if not isinstance(payload, dict):
+                    body = {"success": False, "message": "Request body must be a JSON object"}
+                    self._send(400, json.dumps(body).encode("utf-8"), "application/json")
+                    return
+                status, body = server.authenticate(str(payload.get("email", "")), str(payload.get("password", "")))
+                self._send(status, json.dumps(body).encode("utf-8"), "application/json")
+
+        return Handler
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("LOCAL_SERVER_PORT", "8765")))
+    parser.add_argument("--latency-ms", type=float, default=float(os.getenv("LOCAL_SERVER_LATENCY_MS", "0")))
+    parser.add_argument("--error-rate", type=float, default=float(os.getenv("LOCAL_SERVER_ERROR_RATE", "0")))
+    parser.add_argument("--render-delay-ms", type=float,
+                        default=float(os.getenv("LOCAL_SERVER_RENDER_DELAY_MS", "0")))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)8s] %(message)s")
+    server = LocalMarkopoloServer(args.host, args.port, args.latency_ms, args.error_rate, args.render_delay_ms)
+    server.start()
+    print(f"Serving on {server.base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
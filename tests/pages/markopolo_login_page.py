@@ -1,148 +1,407 @@
 from playwright.sync_api import Page, expect
 import os
-import json
+import re
+import time
 import logging
-from pathlib import Path
-from typing import Optional, Dict, Any
-from playwright.sync_api import Page, expect, TimeoutError as PlaywrightTimeoutError
+from dataclasses import dataclass
+from functools import reduce
+from typing import Optional, Dict, Any, List, Tuple
+from urllib.parse import urlparse
+from playwright.sync_api import Error as PlaywrightError, Page, expect, TimeoutError as PlaywrightTimeoutError
+from utils import credential_pool, perf_capture, step_profiler
+from utils.step_profiler import profiled_step
+from utils.scenario_registry import get_registry
+from utils.selector_cache import get_selector_cache
 
 logger = logging.getLogger(__name__)
 
-class MarkopoloLoginPage:
-    """Page Object Model for the Markopolo login page."""
-    
+
+# Primary selectors with fallbacks
+SELECTORS: Dict[str, List[str]] = {
+    'email': [
+        "xpath=/html/body/div[1]/div[3]/div/div/div/div[2]/form/div[1]/div[1]/div/input",
+        "//input[contains(@class, 'mantine-TextInput-input')]",
+        # Fallbacks (match Cypress)
+        "input[type='email']",
+        "input[placeholder*='email' i]",
+        "input[name*='email' i]",
+        "input[id*='email' i]",
+        "//label[contains(normalize-space(.), 'Email')]/following::input[1]"
+    ],
+    'password': [
+        "xpath=/html/body/div[1]/div[3]/div/div/div/div[2]/form/div[1]/div[2]/div/input",
+        "//input[contains(@class, 'mantine-PasswordInput-innerInput')]",
+        # Fallbacks (match Cypress)
+        "input[type='password']",
+        "input[placeholder*='password' i]",
+        "input[name*='password' i]",
+        "input[id*='password' i]",
+        "//label[contains(normalize-space(.), 'Password')]/following::input[1]"
+    ],
+    'sign_in': [
+        "//button[@type='submit']",
+        "button[type='submit']",
+        "button:has-text('Sign in')",
+        "//button[contains(translate(., 'IN', 'in'), 'sign in')]"
+    ],
+    'validation_message': [
+        "//*[contains(text(), 'required')]",
+        ".error-message:has-text('required')"
+    ],
+    'error_message': [
+        "//div[contains(@class, 'go') or contains(text(), 'Invalid') or contains(text(), 'credentials')]",
+        ".error-message:visible"
+    ]
+}
+
+# Post-login heuristics (any of these indicate a successful login)
+POST_LOGIN_SELECTORS: List[str] = [
+    "button:has-text('Logout')",
+    "[data-testid='logout']",
+    "[data-testid='sidebar']",
+    "nav[role='navigation']",
+    "img[alt*='avatar' i]",
+    "[class*='sidebar' i]",
+]
+
+# Form elements whose resolved locator is reused until the page navigates
+MEMOIZED_ELEMENTS = frozenset({'email', 'password', 'sign_in'})
+
+# Selector extensions only Playwright's engines understand
+PLAYWRIGHT_PSEUDO_CLASSES = (":has-text(", ":text(", ":text-is(", ":text-matches(", ":visible", ":nth-match(")
+
+# Sets every field in one evaluate: the native value setter (so React-controlled
+# inputs see the change) followed by input/change events. Returns, per field,
+# whether a visible, editable input matched and now holds the value; any other
+# field (unmatched, or reset by the page's own handlers) is filled the slow way.
+FILL_FORM_SCRIPT = """
+(fields) => fields.map(({kind, query, value}) => {
+    let matches;
+    try {
+        if (kind === 'xpath') {
+            const result = document.evaluate(query, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            matches = Array.from({length: result.snapshotLength}, (_, i) => result.snapshotItem(i));
+        } else {
+            matches = Array.from(document.querySelectorAll(query));
+        }
+    } catch (e) {
+        return false;
+    }
+    const input = matches.find(node => node instanceof HTMLInputElement
+        && node.getClientRects().length > 0 && getComputedStyle(node).visibility !== 'hidden');
+    if (!input || input.disabled || input.readOnly) {
+        return false;
+    }
+    input.focus();
+    Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set.call(input, value);
+    input.dispatchEvent(new Event('input', {bubbles: true}));
+    input.dispatchEvent(new Event('change', {bubbles: true}));
+    return input.value === value;
+})
+"""
+
+
+# Tags the error messages visible before a submit with their current text, so that
+# only error nodes rendered afterwards (or whose text changed) count as its outcome;
+# a re-rendered toast with the same message is still a new node
+MARK_BASELINE_ERRORS_SCRIPT = """
+(nodes) => nodes.forEach(node => { node.dataset.loginBaseline = node.textContent.trim(); })
+"""
+
+NEW_ERROR_TEXTS_SCRIPT = """
+(nodes) => nodes
+    .filter(node => node.dataset.loginBaseline !== node.textContent.trim())
+    .map(node => node.textContent.trim())
+    .filter(text => text)
+"""
+
+
+def dom_query(selector: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Translate a selector candidate to ``("css" | "xpath", query)`` for use in page scripts.
+
+    Returns None for selectors that need Playwright's engines (``:has-text``,
+    ``>>`` chains and the like), which :data:`FILL_FORM_SCRIPT` cannot evaluate.
+    """
+    if not selector or ">>" in selector:
+        return None
+    engine = re.match(r"^([a-z-]+)=", selector)
+    if engine:
+        if engine.group(1) not in ("css", "xpath"):
+            return None
+        return engine.group(1), selector[engine.end():]
+    if selector.startswith(("//", "..")):
+        return "xpath", selector
+    if any(pseudo in selector for pseudo in PLAYWRIGHT_PSEUDO_CLASSES):
+        return None
+    return "css", selector
+
+
+@dataclass(frozen=True)
+class SelectorResolution:
+    """Outcome of resolving an element type against its selector candidates."""
+
+    element_type: str
+    selector: Optional[str]
+    index: Optional[int]
+    locator: Any  # sync or async Playwright Locator
+    elapsed_ms: float
+
+
+@dataclass(frozen=True)
+class LoginOutcome:
+    """Result of waiting for the login form submission to resolve."""
+
+    status: str  # "success", "error" or "timeout"
+    detail: str
+    url: str
+    elapsed_ms: float
+
+
+class LoginPageBase:
+    """State and browser-independent logic shared by the sync and async login page objects.
+
+    Selectors, the per-navigation locator memo, selector cache bookkeeping,
+    credential precedence and the post-login URL check live here; subclasses
+    only add the Playwright calls, awaited or not.
+    """
+
     # Timeout settings (in milliseconds)
     TIMEOUT = 45000  # 45 seconds
-    
-    def __init__(self, page: Page):
-        """Initialize the login page object.
-        
+    # How often the URL is re-checked while waiting for a login outcome
+    OUTCOME_POLL_MS = 250
+
+    def __init__(self, page: Any):
+        """Initialize the shared state.
+
         Args:
-            page: Playwright Page instance
+            page: Playwright Page instance (sync or async API)
         """
         self.page = page
-        
+        self.base_url = os.getenv('BASE_URL', '').rstrip('/')
+        self.selector_cache = get_selector_cache()
+
         # Primary selectors with fallbacks
-        self._selectors = {
-            'email': [
-                "xpath=/html/body/div[1]/div[3]/div/div/div/div[2]/form/div[1]/div[1]/div/input",
-                "//input[contains(@class, 'mantine-TextInput-input')]",
-                # Fallbacks (match Cypress)
-                "input[type='email']",
-                "input[placeholder*='email' i]",
-                "input[name*='email' i]",
-                "input[id*='email' i]",
-                "//label[contains(normalize-space(.), 'Email')]/following::input[1]"
-            ],
-            'password': [
-                "xpath=/html/body/div[1]/div[3]/div/div/div/div[2]/form/div[1]/div[2]/div/input",
-                "//input[contains(@class, 'mantine-PasswordInput-innerInput')]",
-                # Fallbacks (match Cypress)
-                "input[type='password']",
-                "input[placeholder*='password' i]",
-                "input[name*='password' i]",
-                "input[id*='password' i]",
-                "//label[contains(normalize-space(.), 'Password')]/following::input[1]"
-            ],
-            'sign_in': [
-                "//button[@type='submit']",
-                "button[type='submit']",
-                "button:has-text('Sign in')",
-                "//button[contains(translate(., 'IN', 'in'), 'sign in')]"
-            ],
-            'validation_message': [
-                "//*[contains(text(), 'required')]",
-                ".error-message:has-text('required')"
-            ],
-            'error_message': [
-                "//div[contains(@class, 'go') or contains(text(), 'Invalid') or contains(text(), 'credentials')]",
-                ".error-message:visible"
-            ]
-        }
+        self._selectors = {name: list(candidates) for name, candidates in SELECTORS.items()}
 
         # Post-login heuristics (any of these indicate a successful login)
-        self._post_login_selectors = [
-            "button:has-text('Logout')",
-            "[data-testid='logout']",
-            "[data-testid='sidebar']",
-            "nav[role='navigation']",
-            "img[alt*='avatar' i]",
-            "[class*='sidebar' i]",
-        ]
-        
-        # Load test data
-        self.test_data_path = os.path.join(Path(__file__).parent.parent, 'test_data', 'markopolo_login_testdata.json')
-        self.test_data = self._load_test_data()
-        
+        self._post_login_selectors = list(POST_LOGIN_SELECTORS)
+
+        # Winning candidate of the most recent lookup per element type
+        self.last_resolutions: Dict[str, SelectorResolution] = {}
+
+        # Resolved form locators, reused until the page navigates or a frame detaches
+        self._memo: Dict[str, SelectorResolution] = {}
+        self.page.on("framenavigated", self._on_frame_navigated)
+        self.page.on("framedetached", self._on_frame_detached)
+
+        # Fallback credentials from the shared test data registry
+        self.test_data = get_registry().defaults
+
         # Set default timeout
         self.page.set_default_timeout(self.TIMEOUT)
+
+    def _on_frame_navigated(self, frame: Any) -> None:
+        if frame == self.page.main_frame:
+            self._memo.clear()
+
+    def _on_frame_detached(self, frame: Any) -> None:
+        self._memo.clear()
+
+    def _visible_candidate(self, selector: str) -> Any:
+        """Return a locator that only matches visible elements for ``selector``."""
+        return self.page.locator(f"{selector} >> visible=true")
+
+    def _any_visible(self, selectors: List[str]) -> Any:
+        """One locator matching whichever of ``selectors`` is visible."""
+        return reduce(lambda a, b: a.or_(b), map(self._visible_candidate, selectors))
+
+    def _error_candidates(self) -> Any:
+        return self._any_visible(self._selectors['error_message'])
+
+    def _success_candidates(self) -> Any:
+        return self._any_visible(self._post_login_selectors)
+
+    def _candidates(self, element_type: str) -> Tuple[List[str], List[str], List[Any]]:
+        """Selector candidates for an element type: (declared, most reliable first, locators)."""
+        declared = self._selectors.get(element_type, [])
+        if not declared:
+            raise ValueError(f"No selectors defined for element type: {element_type}")
+        selectors = self.selector_cache.order(self.base_url, element_type, declared) if self.selector_cache else declared
+        return declared, selectors, [self._visible_candidate(selector) for selector in selectors]
+
+    def _record_lookup(self, element_type: str, selector: str, hit: bool, elapsed_ms: float = 0.0) -> None:
+        if self.selector_cache:
+            self.selector_cache.record(self.base_url, element_type, selector, hit=hit, elapsed_ms=elapsed_ms)
+
+    def _not_found(self, element_type: str, selectors: List[str]) -> TimeoutError:
+        """Record a miss for every candidate and build the error to raise."""
+        for selector in selectors:
+            self._record_lookup(element_type, selector, hit=False)
+        return TimeoutError(f"Could not find visible element for {element_type} using any selector")
+
+    def _won(self, element_type: str, declared: List[str], selector: str, candidate: Any,
+             started: float) -> SelectorResolution:
+        """Record ``selector`` as the winner and describe the resolution."""
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        index = declared.index(selector)
+        logger.debug(f"Resolved {element_type} via candidate #{index} ({selector}) in {elapsed_ms:.0f} ms")
+        self._record_lookup(element_type, selector, hit=True, elapsed_ms=elapsed_ms)
+        return SelectorResolution(element_type, selector, index, candidate.first, elapsed_ms)
+
+    def _remember(self, element_type: str, resolution: SelectorResolution) -> Any:
+        """Memoize a form element's resolution (MEMOIZED_ELEMENTS only); returns its locator."""
+        if element_type in MEMOIZED_ELEMENTS:
+            self._memo[element_type] = resolution
+        self.last_resolutions[element_type] = resolution
+        return resolution.locator
+
+    def _fill_plan(self, values: Dict[str, str]) -> Tuple[List[Dict[str, str]], List[str]]:
+        """Split resolved fields into a :data:`FILL_FORM_SCRIPT` batch and those to fill directly."""
+        batch = []
+        fallback = []
+        for element_type, value in values.items():
+            query = dom_query(self.last_resolutions[element_type].selector)
+            if query:
+                batch.append({"element_type": element_type, "kind": query[0], "query": query[1], "value": value})
+            else:
+                fallback.append(element_type)
+        return batch, fallback
+
+    def _valid_credentials(self, email: Optional[str], password: Optional[str],
+                           leased: Optional[Any]) -> Tuple[str, str]:
+        """Credentials to log in with, by precedence.
+
+        Explicit arguments first, then the leased pool account, environment
+        variables (MANUAL_* or GOOGLE_*) and finally the test data.
+
+        Raises:
+            ValueError: If no email or password can be found
+        """
+        if leased:
+            email = email or leased.email
+            password = password or leased.password
+        email = (
+            email
+            or os.getenv('MANUAL_EMAIL')
+            or os.getenv('GOOGLE_EMAIL')
+            or self.test_data.email
+        )
+        password = (
+            password
+            or os.getenv('MANUAL_PASSWORD')
+            or os.getenv('GOOGLE_PASSWORD')
+            or self.test_data.password
+        )
+        if not email or not password:
+            raise ValueError("Email and password must be provided or set in environment variables")
+        return email, password
+
+    def _is_post_login_url(self, url: str) -> bool:
+        """Whether ``url`` is a page the app only shows to logged-in users."""
+        path = urlparse(url).path
+        if path.startswith(("/dashboard", "/home")):
+            return True
+        return bool(self.base_url) and url.startswith(self.base_url) and "/login" not in path
+
+
+class MarkopoloLoginPage(LoginPageBase):
+    """Page Object Model for the Markopolo login page."""
     
-    def _load_test_data(self) -> Dict[str, str]:
-        """Load test data from JSON file or return defaults."""
-        default_data = {
-            'prod_invalid_email': 'invalid@example.com',
-            'prod_invalid_pass': 'invalidpass123',
-            'prod_email': 'test@example.com',
-            'prod_pass': 'testpass123'
-        }
+    def __init__(self, page: Page):
+        """Initialize the login page object.
         
-        try:
-            with open(self.test_data_path, 'r', encoding='utf-8') as file:
-                return {**default_data, **json.load(file)}
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logger.warning(f"Could not load test data from {self.test_data_path}: {e}")
-            return default_data
+        Args:
+            page: Playwright Page instance
+        """
+        super().__init__(page)
+
+        # Browser-side timings, collected only when PERF_CAPTURE is on
+        self.perf = perf_capture.current()
+        if self.perf:
+            self.perf.watch(page)
     
+    def _record_perf(self, action: str, started: float, navigation: bool = False) -> None:
+        """Report an action's timings to the active performance collector, if any."""
+        if self.perf:
+            self.perf.capture(self.page, action, (time.perf_counter() - started) * 1000, navigation)
+
+    def _resolve_element(self, element_type: str, timeout: Optional[float] = None) -> SelectorResolution:
+        """Race every selector candidate for an element type and return the winner.
+
+        All candidates are combined into a single ``or`` locator so Playwright waits
+        for whichever one becomes visible first, instead of spending the full timeout
+        on each stale candidate in turn. Once something is visible, the candidates are
+        checked (without waiting) to report which one won, starting with the ones the
+        selector cache has seen win most often so the check usually costs one call.
+
+        Args:
+            element_type: The type of element to find (e.g., 'email', 'password')
+            timeout: Optional timeout in milliseconds
+
+        Returns:
+            SelectorResolution describing the winning candidate
+
+        Raises:
+            TimeoutError: If no candidate becomes visible within the timeout
+        """
+        declared, selectors, candidates = self._candidates(element_type)
+        race = reduce(lambda combined, candidate: combined.or_(candidate), candidates)
+        started = time.perf_counter()
+        try:
+            with step_profiler.attempt("wait", f"{element_type} visible", miss=(PlaywrightTimeoutError,)):
+                race.first.wait_for(state="visible", timeout=timeout or self.TIMEOUT)
+        except PlaywrightTimeoutError:
+            raise self._not_found(element_type, selectors)
+
+        for selector, candidate in zip(selectors, candidates):
+            checked = time.perf_counter()
+            visible = candidate.count() > 0
+            step_profiler.record_attempt("selector", selector, visible, (time.perf_counter() - checked) * 1000)
+            if visible:
+                return self._won(element_type, declared, selector, candidate, started)
+            self._record_lookup(element_type, selector, hit=False)
+
+        # The winning element disappeared between the race and the ownership check
+        # (e.g. a re-render); fall back to the combined locator rather than failing.
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.debug(f"Resolved {element_type} via combined locator in {elapsed_ms:.0f} ms")
+        return SelectorResolution(element_type, None, None, race.first, elapsed_ms)
+
+    @profiled_step
     def _find_element(self, element_type: str, timeout: Optional[float] = None) -> Any:
-        """Find an element using the first matching selector.
-        
+        """Find an element using the first selector candidate to become visible.
+
+        Form elements (MEMOIZED_ELEMENTS) are resolved once and reused until the
+        main frame navigates or a frame detaches.
+
         Args:
             element_type: The type of element to find (e.g., 'email', 'password')
             timeout: Optional timeout in milliseconds
-            
+
         Returns:
             The first matching element locator
-            
+
         Raises:
             TimeoutError: If no matching element is found within the timeout
         """
-        selectors = self._selectors.get(element_type, [])
-        if not selectors:
-            raise ValueError(f"No selectors defined for element type: {element_type}")
-        
-        for selector in selectors:
-            try:
-                locator = self.page.locator(selector).first
-                # For xpath= prefixed selectors, skip wait_for (it can fail on absolute paths)
-                # Just try to use it; if not found, continue to next selector
-                if selector.startswith("xpath="):
-                    # Absolute XPath: just check if it's there
-                    try:
-                        locator.is_visible(timeout=2000)
-                    except PlaywrightTimeoutError:
-                        continue
-                else:
-                    # CSS selector or relative XPath: wait for visibility
-                    locator.wait_for(state="visible", timeout=timeout or self.TIMEOUT)
-                return locator
-            except PlaywrightTimeoutError:
-                logger.debug(f"Selector not found or not visible: {selector}")
-                continue
-                
-        raise TimeoutError(f"Could not find visible element for {element_type} using any selector")
-    
+        return self._remember(element_type, self._memo.get(element_type) or self._resolve_element(element_type, timeout))
+
+    @profiled_step
     def navigate_to_prod_env(self, base_url: str) -> None:
         """Navigate to the login page.
         
         Args:
             base_url: Base URL of the application
         """
-        url = f"{base_url.rstrip('/')}/login"
+        started = time.perf_counter()
+        self.base_url = base_url.rstrip('/')
+        url = f"{self.base_url}/login"
         logger.info(f"Navigating to {url}")
         # More tolerant navigation: wait for DOM to be ready, not all resources
         self.page.goto(url, wait_until="domcontentloaded", timeout=self.TIMEOUT)
         try:
-            self.page.wait_for_url("**/login*", timeout=5000)
+            with step_profiler.attempt("wait", "url **/login*", miss=(PlaywrightTimeoutError,)):
+                self.page.wait_for_url("**/login*", timeout=5000)
         except PlaywrightTimeoutError:
             # If URL check is slow/flaky, proceed if we're already on a login-like URL
             if "/login" not in (self.page.url or ""):
@@ -153,18 +412,22 @@ class MarkopoloLoginPage:
         except Exception:
             # Do not fail navigation; tests will surface exact failure later
             logger.debug("Email field not ready immediately after navigation")
+        self._record_perf("navigate_to_prod_env", started, navigation=True)
     
+    @profiled_step
     def maximize_window(self) -> None:
         """Maximize the browser window."""
         self.page.set_viewport_size({"width": 1920, "height": 1080})
     
+    @profiled_step
     def enter_invalid_credentials(self) -> None:
         """Enter invalid login credentials."""
         self.enter_credentials(
-            email=self.test_data['prod_invalid_email'],
-            password=self.test_data['prod_invalid_pass']
+            email=self.test_data.invalid_email,
+            password=self.test_data.invalid_password
         )
     
+    @profiled_step
     def enter_credentials(self, email: str, password: str) -> None:
         """Enter email and password into the login form.
         
@@ -172,48 +435,61 @@ class MarkopoloLoginPage:
             email: Email to enter
             password: Password to enter
         """
-        # Fill email field (focus, clear, fill)
-        email_field = self._find_element('email')
-        email_field.click()
-        try:
-            email_field.clear()
-        except Exception:
-            email_field.press("Control+A")
-            email_field.press("Delete")
-        email_field.fill(email)
-        
-        # Fill password field
-        password_field = self._find_element('password')
-        password_field.click()
+        self.fill_form({'email': email, 'password': password})
+
+    @profiled_step
+    def fill_form(self, values: Dict[str, str]) -> None:
+        """Fill several input fields in a single browser round trip.
+
+        Each field is resolved as usual (memoized per navigation), then all of
+        them are set by one ``page.evaluate`` of :data:`FILL_FORM_SCRIPT`. Fields
+        whose winning selector the script cannot evaluate, that it finds no
+        editable input for, or whose value did not stick, fall back to
+        :meth:`_fill_field`.
+
+        Args:
+            values: Value to enter per element type (e.g. ``{'email': ..., 'password': ...}``)
+        """
+        for element_type in values:
+            self._find_element(element_type)
+        batch, fallback = self._fill_plan(values)
+        if batch:
+            try:
+                with step_profiler.attempt("fill", f"batch {', '.join(field['element_type'] for field in batch)}"):
+                    filled = self.page.evaluate(FILL_FORM_SCRIPT, batch)
+            except PlaywrightError as e:
+                # e.g. the page navigated mid-evaluate; fill every field directly instead
+                logger.debug(f"Batch fill failed: {e}")
+                filled = [False] * len(batch)
+            fallback += [field["element_type"] for field, ok in zip(batch, filled) if not ok]
+        for element_type in fallback:
+            logger.debug(f"Batch fill did not apply to {element_type}; filling it directly")
+            self._fill_field(element_type, values[element_type])
+
+    def _fill_field(self, element_type: str, value: str) -> None:
+        """Focus, clear and fill a single input field."""
+        field = self._find_element(element_type)
+        field.click()
         try:
-            password_field.clear()
+            with step_profiler.attempt("clear", element_type):
+                field.clear()
         except Exception:
-            password_field.press("Control+A")
-            password_field.press("Delete")
-        password_field.fill(password)
+            with step_profiler.attempt("clear fallback keypresses", element_type):
+                field.press("Control+A")
+                field.press("Delete")
+        field.fill(value)
 
+    @profiled_step
     def enter_email_only(self, email: str) -> None:
         """Enter only the email field, leave password empty."""
-        email_field = self._find_element('email')
-        email_field.click()
-        try:
-            email_field.clear()
-        except Exception:
-            email_field.press("Control+A")
-            email_field.press("Delete")
-        email_field.fill(email)
+        self.fill_form({'email': email})
 
+    @profiled_step
     def enter_password_only(self, password: str) -> None:
         """Enter only the password field, leave email empty."""
-        password_field = self._find_element('password')
-        password_field.click()
-        try:
-            password_field.clear()
-        except Exception:
-            password_field.press("Control+A")
-            password_field.press("Delete")
-        password_field.fill(password)
+        self.fill_form({'password': password})
     
+    @profiled_step
     def enter_valid_credentials(self, email: Optional[str] = None, password: Optional[str] = None) -> None:
         """Enter valid login credentials.
         
@@ -221,24 +497,8 @@ class MarkopoloLoginPage:
             email: Email to use for login. If None, uses from environment or test data.
             password: Password to use for login. If None, uses from environment or test data.
         """
-        # Get credentials from parameters, environment variables (MANUAL_* or GOOGLE_*), or test data
-        email = (
-            email
-            or os.getenv('MANUAL_EMAIL')
-            or os.getenv('GOOGLE_EMAIL')
-            or self.test_data.get('prod_email')
-        )
-        password = (
-            password
-            or os.getenv('MANUAL_PASSWORD')
-            or os.getenv('GOOGLE_PASSWORD')
-            or self.test_data.get('prod_pass')
-        )
-        
-        if not email or not password:
-            raise ValueError("Email and password must be provided or set in environment variables")
-            
-        self.enter_credentials(email, password)
+        leased = None if email and password else credential_pool.leased_credential()
+        self.enter_credentials(*self._valid_credentials(email, password, leased))
 
     def login_with_google(self, email: str, password: str) -> None:
         # Placeholder: align API with Cypress; actual Google OAuth not implemented yet
@@ -247,16 +507,21 @@ class MarkopoloLoginPage:
     def login_manually(self, email: str, password: str) -> None:
         self.perform_login(base_url=os.getenv('BASE_URL', ''), email=email, password=password)
     
+    @profiled_step
     def click_sign_in(self) -> None:
         """Click the sign in button."""
+        started = time.perf_counter()
         sign_in_button = self._find_element('sign_in')
         # Do not assume navigation will occur (validation may keep us on the same page)
         sign_in_button.click()
         try:
-            self.page.wait_for_load_state("load", timeout=10000)
+            with step_profiler.attempt("wait", "load state after sign-in", miss=(PlaywrightTimeoutError,)):
+                self.page.wait_for_load_state("load", timeout=10000)
         except PlaywrightTimeoutError:
             pass
+        self._record_perf("click_sign_in", started)
     
+    @profiled_step
     def verify_error_message(self, expected_text: str = "Invalid credentials") -> None:
         """Verify that the error message is displayed.
         
@@ -268,12 +533,14 @@ class MarkopoloLoginPage:
         if expected_text:
             expect(error_message).to_contain_text(expected_text)
     
+    @profiled_step
     def verify_validation_message_for_empty_fields(self) -> None:
         """Verify that validation messages for empty fields are displayed."""
         validation_message = self._find_element('validation_message')
         expect(validation_message).to_be_visible()
         expect(validation_message).to_contain_text("required")
     
+    @profiled_step
     def perform_login(self, base_url: str, email: Optional[str] = None, 
                      password: Optional[str] = None) -> None:
         """Perform a complete login with the given credentials.
@@ -284,112 +551,123 @@ class MarkopoloLoginPage:
             password: Password to use for login. If None, uses from environment or test data.
         """
         logger.info("Performing login")
+        started = time.perf_counter()
         self.navigate_to_prod_env(base_url)
         self.maximize_window()
         self.enter_valid_credentials(email, password)
+        self._mark_baseline_errors()
         self.click_sign_in()
 
-        # Wait for page to settle
+        outcome = self.detect_login_outcome()
+        self._record_perf("perform_login", started, navigation=outcome.status == "success")
+        if outcome.status == "success":
+            logger.info(f"Login successful ({outcome.detail}, {outcome.elapsed_ms:.0f} ms)")
+            return
+        if outcome.status == "error":
+            raise AssertionError(f"Login failed: {outcome.detail}")
+        # Surface current URL and title for debugging
+        raise AssertionError(
+            f"Login did not complete. URL={outcome.url}, Title={self.page.title()}"
+        )
+
+    def _mark_baseline_errors(self) -> None:
+        """Mark the error messages visible now, so :meth:`detect_login_outcome` ignores them."""
         try:
-            self.page.wait_for_load_state("networkidle", timeout=self.TIMEOUT)
-        except PlaywrightTimeoutError:
-            logger.debug("Network idle not reached; proceeding with URL/selector checks")
-
-        # Consider multiple possible post-login URLs
-        possible_urls = [
-            "**/dashboard*",
-            "**/home*",
-            f"{base_url.rstrip('/')}/*",
-        ]
-        url_ok = False
-        for pattern in possible_urls:
+            self._error_candidates().evaluate_all(MARK_BASELINE_ERRORS_SCRIPT)
+        except PlaywrightError as e:
+            logger.debug(f"Could not mark existing error messages: {e}")
+
+    def _new_error_texts(self) -> List[str]:
+        """Texts of visible error messages rendered or changed since they were last marked."""
+        try:
+            return self._error_candidates().evaluate_all(NEW_ERROR_TEXTS_SCRIPT)
+        except PlaywrightError:
+            # The page navigated mid-evaluate; the next poll looks at the new document
+            return []
+
+    @profiled_step
+    def detect_login_outcome(self, timeout: Optional[float] = None) -> LoginOutcome:
+        """Wait for whichever login outcome happens first after submitting the form.
+
+        The post-login URL, every post-login selector and every error-message
+        selector are watched together, so the result is known as soon as the
+        server responds instead of after a chain of sequential timeouts. Error
+        messages marked by :meth:`_mark_baseline_errors` before submitting do not
+        count, unless their text changed; a re-rendered message with the same
+        text is a new element and does.
+
+        Args:
+            timeout: Maximum time to wait in milliseconds (defaults to TIMEOUT)
+
+        Returns:
+            LoginOutcome with status "success", "error" or "timeout"
+        """
+        success = self._success_candidates()
+        either = success.or_(self._error_candidates())
+
+        started = time.perf_counter()
+        deadline = started + (timeout or self.TIMEOUT) / 1000
+
+        def outcome(status: str, detail: str) -> LoginOutcome:
+            return LoginOutcome(status, detail, self.page.url, (time.perf_counter() - started) * 1000)
+
+        while True:
+            # page.url is updated by navigation events processed during the waits below
+            if self._is_post_login_url(self.page.url):
+                return outcome("success", f"url {self.page.url}")
+            remaining_ms = (deadline - time.perf_counter()) * 1000
+            if remaining_ms <= 0:
+                return outcome("timeout", "no login outcome observed")
+            tick_ms = min(remaining_ms, self.OUTCOME_POLL_MS)
             try:
-                self.page.wait_for_url(pattern, timeout=8000)
-                url_ok = True
-                break
+                with step_profiler.attempt("wait", "login outcome", miss=(PlaywrightTimeoutError,)):
+                    either.first.wait_for(state="visible", timeout=tick_ms)
             except PlaywrightTimeoutError:
                 continue
-
-        # Also check for post-login UI selectors
-        selector_ok = False
-        for sel in self._post_login_selectors:
+            if success.count() > 0:
+                return outcome("success", "post-login indicator visible")
+            new_errors = self._new_error_texts()
+            if new_errors:
+                return outcome("error", new_errors[0])
+            # Only errors that were already there before submitting; keep waiting on success
             try:
-                self.page.wait_for_selector(sel, timeout=5000)
-                selector_ok = True
-                break
+                success.first.wait_for(state="visible", timeout=tick_ms)
             except PlaywrightTimeoutError:
-                continue
+                pass
 
-        if url_ok or selector_ok:
-            logger.info("Login successful")
-            return
-
-        # If reached here, try to pull error content if present
-        try:
-            error = self._find_element('error_message', timeout=3000)
-            error_text = (error.text_content() or "").strip()
-            raise AssertionError(f"Login failed: {error_text}")
-        except (TimeoutError, PlaywrightTimeoutError):
-            # Surface current URL and title for debugging
-            raise AssertionError(
-                f"Login did not complete. URL={self.page.url}, Title={self.page.title()}"
-            )
-    
+    @profiled_step
     def submit_again_and_wait_error_refresh(self, new_email: str, new_password: str, timeout_ms: int = 8000) -> None:
         """Submit credentials again and ensure the error state refreshes quickly.
         
         This guards against long global timeouts by bounding the waits to a short window.
         We consider it refreshed if:
+          - a new error message is rendered (even with the same text as before), or
           - the error text changes, or
-          - the error temporarily disappears and reappears, or
           - we navigate to a logged-in state.
+        The error already on screen is marked first, so it does not count by itself.
         """
-        # Capture existing error state if present
-        previous_error_text = ""
-        try:
-            existing_error = self._find_element('error_message', timeout=3000)
-            previous_error_text = (existing_error.text_content() or "").strip()
-        except (TimeoutError, PlaywrightTimeoutError):
-            # No prior error visible; proceed
-            pass
-
-        # Enter new credentials and submit
         self.enter_credentials(new_email, new_password)
+        self._mark_baseline_errors()
         self.click_sign_in()
 
-        # Fast-path: success indicators
-        try:
-            for sel in self._post_login_selectors:
-                self.page.wait_for_selector(sel, timeout=2000)
-                return
-        except PlaywrightTimeoutError:
-            pass
-
-        # Otherwise, ensure error refreshed within a bounded timeout
-        error_locator = self.page.locator(self._selectors['error_message'][0]).first
-        try:
-            # Wait for error to re-appear (in case it briefly disappears)
-            error_locator.wait_for(state="visible", timeout=timeout_ms)
-            # Do not require text to change; visibility suffices to prove refresh
-        except PlaywrightTimeoutError:
-            # As a fallback, check any error selector becomes visible even if first variant failed
-            for sel in self._selectors['error_message'][1:]:
-                try:
-                    self.page.locator(sel).first.wait_for(state="visible", timeout=1500)
-                    return
-                except PlaywrightTimeoutError:
-                    continue
+        outcome = self.detect_login_outcome(timeout=timeout_ms)
+        if outcome.status == "timeout":
             # If nothing matched within the bounded window, raise a concise assertion
             raise AssertionError("Error state did not refresh within expected time after retry")
     
-    def is_logged_in(self) -> bool:
+    @profiled_step
+    def is_logged_in(self, timeout: float = 3000) -> bool:
         """Check if the user is logged in.
         
+        Args:
+            timeout: How long to wait for the logged-in indicator, in milliseconds
+
         Returns:
             bool: True if logged in, False otherwise
         """
         try:
             # Check for a logged-in indicator (adjust selector as needed)
-            return self.page.locator("button:has-text('Logout')").is_visible(timeout=3000)
+            self.page.locator("button:has-text('Logout')").first.wait_for(state="visible", timeout=timeout)
+            return True
         except PlaywrightTimeoutError:
             return False
@@ -0,0 +1,260 @@
+import time
+import asyncio
+import logging
+from functools import reduce
+from typing import Optional, Dict, Any, List
+from playwright.async_api import Error as PlaywrightError, expect, TimeoutError as PlaywrightTimeoutError
+from pages.markopolo_login_page import (
+    FILL_FORM_SCRIPT,
+    MARK_BASELINE_ERRORS_SCRIPT,
+    NEW_ERROR_TEXTS_SCRIPT,
+    LoginOutcome,
+    LoginPageBase,
+    SelectorResolution,
+)
+from utils import credential_pool
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMarkopoloLoginPage(LoginPageBase):
+    """Asyncio twin of :class:`MarkopoloLoginPage` for the Playwright async API.
+
+    Selectors, the locator memo, selector cache bookkeeping, credential
+    precedence and the outcome rules all come from :class:`LoginPageBase`, so
+    both page objects resolve elements and outcomes the same way; only the I/O
+    is awaited.
+    """
+
+    async def _resolve_element(self, element_type: str, timeout: Optional[float] = None) -> SelectorResolution:
+        """Race every selector candidate for an element type and return the winner.
+
+        See :meth:`MarkopoloLoginPage._resolve_element`.
+        """
+        declared, selectors, candidates = self._candidates(element_type)
+        race = reduce(lambda combined, candidate: combined.or_(candidate), candidates)
+        started = time.perf_counter()
+        try:
+            await race.first.wait_for(state="visible", timeout=timeout or self.TIMEOUT)
+        except PlaywrightTimeoutError:
+            raise self._not_found(element_type, selectors)
+
+        for selector, candidate in zip(selectors, candidates):
+            if await candidate.count() > 0:
+                return self._won(element_type, declared, selector, candidate, started)
+            self._record_lookup(element_type, selector, hit=False)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        return SelectorResolution(element_type, None, None, race.first, elapsed_ms)
+
+    async def _find_element(self, element_type: str, timeout: Optional[float] = None) -> Any:
+        """Find an element using the first selector candidate to become visible.
+
+        Form elements are memoized per navigation, as in :meth:`MarkopoloLoginPage._find_element`.
+        """
+        return self._remember(element_type,
+                              self._memo.get(element_type) or await self._resolve_element(element_type, timeout))
+
+    async def navigate_to_prod_env(self, base_url: str) -> None:
+        """Navigate to the login page.
+
+        Args:
+            base_url: Base URL of the application
+        """
+        self.base_url = base_url.rstrip('/')
+        url = f"{self.base_url}/login"
+        logger.info(f"Navigating to {url}")
+        await self.page.goto(url, wait_until="domcontentloaded", timeout=self.TIMEOUT)
+        try:
+            await self.page.wait_for_url("**/login*", timeout=5000)
+        except PlaywrightTimeoutError:
+            if "/login" not in (self.page.url or ""):
+                logger.debug(f"URL did not match login quickly, current URL: {self.page.url}")
+        try:
+            await self._find_element('email', timeout=8000)
+        except Exception:
+            logger.debug("Email field not ready immediately after navigation")
+
+    async def maximize_window(self) -> None:
+        """Maximize the browser window."""
+        await self.page.set_viewport_size({"width": 1920, "height": 1080})
+
+    async def fill_form(self, values: Dict[str, str]) -> None:
+        """Fill several input fields in a single browser round trip.
+
+        See :meth:`MarkopoloLoginPage.fill_form`.
+        """
+        for element_type in values:
+            await self._find_element(element_type)
+        batch, fallback = self._fill_plan(values)
+        if batch:
+            try:
+                filled = await self.page.evaluate(FILL_FORM_SCRIPT, batch)
+            except PlaywrightError as e:
+                logger.debug(f"Batch fill failed: {e}")
+                filled = [False] * len(batch)
+            fallback += [field["element_type"] for field, ok in zip(batch, filled) if not ok]
+        for element_type in fallback:
+            await self._fill_field(element_type, values[element_type])
+
+    async def _fill_field(self, element_type: str, value: str) -> None:
+        """Focus, clear and fill a single input field."""
+        field = await self._find_element(element_type)
+        await field.click()
+        try:
+            await field.clear()
+        except Exception:
+            await field.press("Control+A")
+            await field.press("Delete")
+        await field.fill(value)
+
+    async def enter_credentials(self, email: str, password: str) -> None:
+        """Enter email and password into the login form.
+
+        Args:
+            email: Email to enter
+            password: Password to enter
+        """
+        await self.fill_form({'email': email, 'password': password})
+
+    async def enter_email_only(self, email: str) -> None:
+        """Enter only the email field, leave password empty."""
+        await self.fill_form({'email': email})
+
+    async def enter_password_only(self, password: str) -> None:
+        """Enter only the password field, leave email empty."""
+        await self.fill_form({'password': password})
+
+    async def enter_invalid_credentials(self) -> None:
+        """Enter invalid login credentials."""
+        await self.enter_credentials(
+            email=self.test_data.invalid_email,
+            password=self.test_data.invalid_password
+        )
+
+    async def enter_valid_credentials(self, email: Optional[str] = None, password: Optional[str] = None) -> None:
+        """Enter valid login credentials.
+
+        Args:
+            email: Email to use for login. If None, uses from environment or test data.
+            password: Password to use for login. If None, uses from environment or test data.
+        """
+        # Leasing may wait for a free account
+        leased = None if email and password else await asyncio.to_thread(credential_pool.leased_credential)
+        await self.enter_credentials(*self._valid_credentials(email, password, leased))
+
+    async def click_sign_in(self) -> None:
+        """Click the sign in button."""
+        sign_in_button = await self._find_element('sign_in')
+        await sign_in_button.click()
+        try:
+            await self.page.wait_for_load_state("load", timeout=10000)
+        except PlaywrightTimeoutError:
+            pass
+
+    async def verify_error_message(self, expected_text: str = "Invalid credentials") -> None:
+        """Verify that the error message is displayed.
+
+        Args:
+            expected_text: Expected text in the error message
+        """
+        error_message = await self._find_element('error_message')
+        await expect(error_message).to_be_visible()
+        if expected_text:
+            await expect(error_message).to_contain_text(expected_text)
+
+    async def verify_validation_message_for_empty_fields(self) -> None:
+        """Verify that validation messages for empty fields are displayed."""
+        validation_message = await self._find_element('validation_message')
+        await expect(validation_message).to_be_visible()
+        await expect(validation_message).to_contain_text("required")
+
+    async def perform_login(self, base_url: str, email: Optional[str] = None,
+                            password: Optional[str] = None) -> None:
+        """Perform a complete login with the given credentials.
+
+        Args:
+            base_url: Base URL of the application
+            email: Email to use for login. If None, uses from environment or test data.
+            password: Password to use for login. If None, uses from environment or test data.
+        """
+        logger.info("Performing login")
+        await self.navigate_to_prod_env(base_url)
+        await self.maximize_window()
+        await self.enter_valid_credentials(email, password)
+        await self._mark_baseline_errors()
+        await self.click_sign_in()
+
+        outcome = await self.detect_login_outcome()
+        if outcome.status == "success":
+            logger.info(f"Login successful ({outcome.detail}, {outcome.elapsed_ms:.0f} ms)")
+            return
+        if outcome.status == "error":
+            raise AssertionError(f"Login failed: {outcome.detail}")
+        raise AssertionError(
+            f"Login did not complete. URL={outcome.url}, Title={await self.page.title()}"
+        )
+
+    async def _mark_baseline_errors(self) -> None:
+        """Mark the error messages visible now, so :meth:`detect_login_outcome` ignores them."""
+        try:
+            await self._error_candidates().evaluate_all(MARK_BASELINE_ERRORS_SCRIPT)
+        except PlaywrightError as e:
+            logger.debug(f"Could not mark existing error messages: {e}")
+
+    async def _new_error_texts(self) -> List[str]:
+        """Texts of visible error messages rendered or changed since they were last marked."""
+        try:
+            return await self._error_candidates().evaluate_all(NEW_ERROR_TEXTS_SCRIPT)
+        except PlaywrightError:
+            return []
+
+    async def detect_login_outcome(self, timeout: Optional[float] = None) -> LoginOutcome:
+        """Wait for whichever login outcome happens first after submitting the form.
+
+        See :meth:`MarkopoloLoginPage.detect_login_outcome`.
+        """
+        success = self._success_candidates()
+        either = success.or_(self._error_candidates())
+
+        started = time.perf_counter()
+        deadline = started + (timeout or self.TIMEOUT) / 1000
+
+        def outcome(status: str, detail: str) -> LoginOutcome:
+            return LoginOutcome(status, detail, self.page.url, (time.perf_counter() - started) * 1000)
+
+        while True:
+            if self._is_post_login_url(self.page.url):
+                return outcome("success", f"url {self.page.url}")
+            remaining_ms = (deadline - time.perf_counter()) * 1000
+            if remaining_ms <= 0:
+                return outcome("timeout", "no login outcome observed")
+            tick_ms = min(remaining_ms, self.OUTCOME_POLL_MS)
+            try:
+                await either.first.wait_for(state="visible", timeout=tick_ms)
+            except PlaywrightTimeoutError:
+                continue
+            if await success.count() > 0:
+                return outcome("success", "post-login indicator visible")
+            new_errors = await self._new_error_texts()
+            if new_errors:
+                return outcome("error", new_errors[0])
+            try:
+                await success.first.wait_for(state="visible", timeout=tick_ms)
+            except PlaywrightTimeoutError:
+                pass
+
+    async def is_logged_in(self, timeout: float = 3000) -> bool:
+        """Check if the user is logged in.
+
+        Args:
+            timeout: How long to wait for the logged-in indicator, in milliseconds
+
+        Returns:
+            bool: True if logged in, False otherwise
+        """
+        try:
+            await self.page.locator("button:has-text('Logout')").first.wait_for(state="visible", timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            return False
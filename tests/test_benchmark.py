@@ -0,0 +1,81 @@
+import json
+import pytest
+from utils import benchmark
+from utils.benchmark import BenchmarkStats, BenchmarkSuite, regression
+
+
+def _stats(median_ms: float, name: str = "chromium/page_setup") -> BenchmarkStats:
+    return BenchmarkStats(name, 5, median_ms, median_ms, median_ms, 0.0, median_ms)
+
+
+class TestBenchmarkStats:
+    """Summaries of timed trials."""
+
+    def test_from_samples(self):
+        stats = BenchmarkStats.from_samples("b", [float(ms) for ms in range(1, 21)])
+        assert (stats.trials, stats.median_ms, stats.mean_ms, stats.min_ms) == (20, 10.5, 10.5, 1.0)
+        assert stats.p95_ms == 20.0
+
+    def test_single_sample_has_no_spread(self):
+        assert BenchmarkStats.from_samples("b", [4.0]).stdev_ms == 0.0
+
+    def test_no_samples_is_an_error(self):
+        with pytest.raises(ValueError, match="no samples"):
+            BenchmarkStats.from_samples("b", [])
+
+
+class TestRegression:
+    """A regression needs both the relative and the absolute slowdown."""
+
+    def test_without_baseline(self):
+        assert regression(_stats(100.0), None, 0.15, 2.0) is None
+
+    def test_within_threshold(self):
+        assert regression(_stats(114.0), {"median_ms": 100.0}, 0.15, 2.0) is None
+
+    def test_beyond_threshold(self):
+        problem = regression(_stats(120.0), {"median_ms": 100.0}, 0.15, 2.0)
+        assert problem == "chromium/page_setup: median 120.0 ms vs baseline 100.0 ms (+20%, limit 15%)"
+
+    def test_small_absolute_slowdown_is_jitter(self):
+        assert regression(_stats(1.5), {"median_ms": 1.0}, 0.15, 2.0) is None
+
+    def test_faster_is_fine(self):
+        assert regression(_stats(50.0), {"median_ms": 100.0}, 0.15, 2.0) is None
+
+
+class TestSuiteAndCompare:
+    """Recording, saving and comparing results files."""
+
+    @pytest.fixture
+    def files(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("BENCHMARK_SAVE_BASELINE", raising=False)
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps({"results": {"fast": {"median_ms": 10.0}, "slow": {"median_ms": 10.0}}}),
+                            encoding="utf-8")
+        return tmp_path, baseline
+
+    def test_record_flags_regressions(self, files):
+        _, baseline = files
+        suite = BenchmarkSuite(trials=3, warmup=0, threshold=0.15, min_delta_ms=2.0, baseline_path=baseline)
+        assert suite.record("fast", [9.0, 10.0, 11.0]) is None
+        problem = suite.record("slow", [30.0, 30.0, 30.0])
+        assert problem.startswith("slow: median 30.0 ms")
+        assert suite.regressions == [problem]
+
+    def test_saved_results_compare_against_baseline(self, files):
+        directory, baseline = files
+        suite = BenchmarkSuite(trials=3, warmup=0, baseline_path=baseline)
+        suite.record("fast", [10.0, 10.0, 10.0])
+        results = directory / "latest.json"
+        suite.save(results)
+        assert benchmark.main(["compare", str(results), str(baseline)]) == 0
+        suite.record("slow", [30.0, 30.0, 30.0])
+        suite.save(results)
+        assert benchmark.main(["compare", str(results), str(baseline)]) == 1
+
+    def test_saving_a_baseline_ignores_the_old_one(self, files, monkeypatch):
+        _, baseline = files
+        monkeypatch.setenv("BENCHMARK_SAVE_BASELINE", "true")
+        suite = BenchmarkSuite(trials=3, warmup=0, baseline_path=baseline)
+        assert suite.record("slow", [30.0, 30.0, 30.0]) is None
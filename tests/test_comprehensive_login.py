@@ -33,3 +33,31 @@ class TestLoginCoreFlows:
         self.login.verify_error_message()
         expect(self.page).to_have_url(f"{self.base_url}/login")
 
+    def test_enter_credentials_sets_input_values(self):
+        """Re-entering credentials leaves exactly the new values in both inputs."""
+        self.login.navigate_to_prod_env(self.base_url)
+        self.login.enter_credentials("first@example.com", "first-pass")
+        self.login.enter_credentials("second@example.com", "second-pass")
+        expect(self.page.locator("input[type='email']")).to_have_value("second@example.com")
+        expect(self.page.locator("input[type='password']")).to_have_value("second-pass")
+
+    def test_credentials_can_be_entered_after_navigating(self):
+        """Form fields found before a navigation are found again on the reloaded page."""
+        self.login.navigate_to_prod_env(self.base_url)
+        self.login.enter_credentials("first@example.com", "first-pass")
+        self.login.navigate_to_prod_env(self.base_url)
+        expect(self.page.locator("input[type='email']")).to_have_value("")
+        self.login.enter_invalid_credentials()
+        self.login.click_sign_in()
+        self.login.verify_error_message()
+
+
+@pytest.mark.login
+@pytest.mark.manual
+class TestAuthenticatedSession:
+    """Post-login coverage that starts from the cached authenticated state."""
+
+    def test_cached_session_is_logged_in(self, authenticated_page: Page):
+        """A context built from the cached storage state should skip the login form."""
+        login = MarkopoloLoginPage(authenticated_page)
+        assert login.is_logged_in(timeout=10000)
@@ -0,0 +1,70 @@
+import json
+import pytest
+from utils import credential_pool
+from utils.credential_pool import Credential, CredentialPool
+
+ACCOUNTS = [Credential("qa1@example.com", "pass-1"), Credential("qa2@example.com", "pass-2")]
+DEAD_PID = 999_999
+
+
+@pytest.fixture
+def lease_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(credential_pool, "pid_alive", lambda pid: pid != DEAD_PID)
+    return tmp_path / "leases"
+
+
+def _pool(lease_dir, accounts=ACCOUNTS):
+    return CredentialPool(accounts, lease_dir=lease_dir, wait_timeout=0)
+
+
+def _write_lease(pool: CredentialPool, account: Credential, pid: int) -> None:
+    path = pool._lease_path(account)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"run": "old", "worker": "gw9", "pid": pid, "leased_at": 0}), encoding="utf-8")
+
+
+class TestLeasing:
+    """Exclusive leases and stale lease takeover."""
+
+    def test_pools_never_share_an_account(self, lease_dir):
+        first, second = _pool(lease_dir), _pool(lease_dir)
+        assert first.lease() != second.lease()
+        with pytest.raises(RuntimeError, match="No free account"):
+            _pool(lease_dir).lease()
+
+    def test_released_account_can_be_leased_again(self, lease_dir):
+        first = _pool(lease_dir, ACCOUNTS[:1])
+        first.lease()
+        first.release()
+        assert _pool(lease_dir, ACCOUNTS[:1]).lease() == ACCOUNTS[0]
+
+    def test_stale_lease_is_taken_over(self, lease_dir):
+        pool = _pool(lease_dir, ACCOUNTS[:1])
+        _write_lease(pool, ACCOUNTS[0], DEAD_PID)
+        assert pool.lease() == ACCOUNTS[0]
+        owner = json.loads(pool._lease_path(ACCOUNTS[0]).read_text(encoding="utf-8"))
+        assert owner["pid"] != DEAD_PID
+
+    def test_live_lease_is_not_broken(self, lease_dir):
+        pool = _pool(lease_dir, ACCOUNTS[:1])
+        _write_lease(pool, ACCOUNTS[0], DEAD_PID + 1)
+        with pytest.raises(RuntimeError):
+            pool.lease()
+
+    def test_late_breaker_keeps_the_new_lease(self, lease_dir):
+        # Both saw the dead holder; the first took the account, the second must not delete its lease
+        first, late = _pool(lease_dir, ACCOUNTS[:1]), _pool(lease_dir, ACCOUNTS[:1])
+        _write_lease(first, ACCOUNTS[0], DEAD_PID)
+        assert first.lease() == ACCOUNTS[0]
+        path = late._lease_path(ACCOUNTS[0])
+        assert not late._break_stale_lease(path)
+        assert path.exists()
+        assert not late._try_lease(ACCOUNTS[0])
+
+    def test_break_waits_for_the_worker_already_breaking(self, lease_dir):
+        pool = _pool(lease_dir, ACCOUNTS[:1])
+        _write_lease(pool, ACCOUNTS[0], DEAD_PID)
+        path = pool._lease_path(ACCOUNTS[0])
+        path.with_suffix(".break").touch()
+        assert not pool._try_lease(ACCOUNTS[0])
+        assert json.loads(path.read_text(encoding="utf-8"))["pid"] == DEAD_PID
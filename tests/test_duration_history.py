@@ -0,0 +1,67 @@
+import itertools
+from types import SimpleNamespace
+import pytest
+from utils import duration_history
+from utils.duration_history import DurationHistory, longest_first, shard
+
+
+def _items(*nodeids):
+    return [SimpleNamespace(nodeid=nodeid) for nodeid in nodeids]
+
+
+@pytest.fixture
+def history_with(tmp_path, monkeypatch):
+    """Write the given outcomes of one test as separate earlier runs, oldest first."""
+    clock = itertools.count(1_000_000)
+    monkeypatch.setattr(duration_history.time, "time", lambda: next(clock))
+
+    def build(outcomes, duration_s=1.0):
+        path = tmp_path / "history.sqlite"
+        for run, outcome in enumerate(outcomes):
+            monkeypatch.setenv("PYTEST_XDIST_TESTRUNUID", f"run-{run}")
+            history = DurationHistory(path, base_url="http://127.0.0.1:8000")
+            history.record("test_a", outcome, duration_s)
+            history.save()
+        monkeypatch.setenv("PYTEST_XDIST_TESTRUNUID", "current")
+        return DurationHistory(path, base_url="http://127.0.0.1:9000")
+
+    return build
+
+
+class TestScheduling:
+    """Ordering and sharding by estimated duration."""
+
+    def test_longest_first_is_stable_for_ties(self):
+        items = _items("a", "b", "c", "d")
+        ordered = longest_first(items, {"a": 1.0, "b": 3.0, "c": 1.0, "d": 2.0})
+        assert [item.nodeid for item in ordered] == ["b", "d", "a", "c"]
+
+    def test_shard_assigns_longest_to_least_loaded(self):
+        # 8 | 7 -> 8 | 13 -> 13 | 13 -> 17 | 13 (ties go to the first shard)
+        estimates = {"a": 8.0, "b": 7.0, "c": 6.0, "d": 5.0, "e": 4.0}
+        assignment = shard(_items(*estimates), estimates, 2)
+        loads = [sum(estimates[nodeid] for nodeid, index in assignment.items() if index == worker)
+                 for worker in range(2)]
+        assert loads == [17.0, 13.0]
+
+    def test_shard_with_more_workers_than_items(self):
+        estimates = {"a": 1.0, "b": 1.0}
+        assert sorted(shard(_items("a", "b"), estimates, 4).values()) == [0, 1]
+
+
+class TestFlakeScore:
+    """Flake scores from recorded outcomes."""
+
+    def test_always_failing_test_is_not_flaky(self, history_with):
+        assert history_with(["failed"] * 5).flake_score("test_a") == 0.0
+
+    def test_alternating_outcomes_score_one(self, history_with):
+        assert history_with(["passed", "failed", "passed", "failed"]).flake_score("test_a") == 1.0
+
+    def test_single_run_scores_zero(self, history_with):
+        assert history_with(["failed"]).flake_score("test_a") == 0.0
+
+    def test_estimate_uses_passing_runs_only(self, history_with):
+        history = history_with(["passed", "failed", "passed"], duration_s=2.0)
+        assert history.estimate("test_a") == 2.0
+        assert history.estimate("unknown") is None
@@ -0,0 +1,64 @@
+import json
+from utils import har_replay
+from utils.har_replay import REDACTED, auth_api_pattern, scrub_entry
+
+
+def _entry(post_text: str, response_text: str):
+    return {
+        "request": {
+            "method": "POST", "url": "https://app.example.com/api/v1/auth/login",
+            "headers": [{"name": "Authorization", "value": "Bearer abc"}, {"name": "Accept", "value": "*/*"}],
+            "cookies": [{"name": "sid", "value": "s3cr3t"}],
+            "postData": {"mimeType": "application/json", "text": post_text},
+        },
+        "response": {
+            "status": 200,
+            "headers": [{"name": "Set-Cookie", "value": "sid=s3cr3t"}],
+            "cookies": [{"name": "sid", "value": "s3cr3t"}],
+            "content": {"mimeType": "application/json", "text": response_text},
+        },
+    }
+
+
+class TestScrubEntry:
+    """Secrets are stripped before a recording becomes an archive."""
+
+    def test_json_login_is_scrubbed(self):
+        entry = scrub_entry(_entry(
+            json.dumps({"email": "qa@example.com", "password": "hunter2"}),
+            json.dumps({"success": True, "data": {"accessToken": "a", "refreshToken": "r", "name": "QA"}}),
+        ))
+        assert json.loads(entry["request"]["postData"]["text"]) == {"email": "qa@example.com", "password": REDACTED}
+        assert json.loads(entry["response"]["content"]["text"])["data"] == {
+            "accessToken": REDACTED, "refreshToken": REDACTED, "name": "QA"}
+        assert entry["request"]["headers"] == [{"name": "Accept", "value": "*/*"}]
+        assert entry["response"]["headers"] == []
+        assert entry["request"]["cookies"] == entry["response"]["cookies"] == []
+
+    def test_form_encoded_login_is_scrubbed(self):
+        entry = scrub_entry(_entry("email=qa%40example.com&password=hunter2", "<html></html>"))
+        assert entry["request"]["postData"]["text"] == f"email=qa%40example.com&password={REDACTED}"
+        assert entry["response"]["content"]["text"] == "<html></html>"
+
+    def test_other_bodies_are_kept(self):
+        entry = scrub_entry(_entry("query=shoes", "plain text"))
+        assert entry["request"]["postData"]["text"] == "query=shoes"
+
+
+class TestAuthApiPattern:
+    """The login API glob is never guessed for a real environment."""
+
+    def test_unset_for_remote_environments(self, monkeypatch):
+        monkeypatch.setattr(har_replay, "AUTH_API_PATTERN", None)
+        monkeypatch.setenv("BASE_URL", "https://beta-stg.markopolo.ai")
+        assert auth_api_pattern() is None
+
+    def test_local_stand_in_has_a_default(self, monkeypatch):
+        monkeypatch.setattr(har_replay, "AUTH_API_PATTERN", None)
+        monkeypatch.setenv("BASE_URL", "local")
+        assert auth_api_pattern() == "**/api/v1/auth/login"
+
+    def test_configured_pattern_wins(self, monkeypatch):
+        monkeypatch.setattr(har_replay, "AUTH_API_PATTERN", "**/session/new")
+        monkeypatch.setenv("BASE_URL", "local")
+        assert auth_api_pattern() == "**/session/new"
@@ -0,0 +1,53 @@
+import pytest
+from utils.load_generator import LATENCY_BUCKETS_MS, UserResult, arrival_schedule, summarize
+
+
+def _result(user: int, started_s: float, latency_ms: float, passed: bool = True) -> UserResult:
+    return UserResult(user, "valid", passed, started_s, latency_ms, queued_ms=float(user))
+
+
+class TestArrivalSchedule:
+    """Open-model arrival times."""
+
+    def test_zero_rate_spreads_users_over_the_ramp(self):
+        assert arrival_schedule(4, 0.0, 8.0) == [0.0, 2.0, 4.0, 6.0]
+
+    def test_ramp_then_constant_rate(self):
+        # 2 users/s after a 4 s ramp: k users have arrived by t = 2 * sqrt(k), so 4 arrive
+        # during the ramp, then one every 0.5 s
+        schedule = arrival_schedule(8, 2.0, 4.0)
+        assert schedule[:4] == pytest.approx([0.0, 2.0, 2 * 2 ** 0.5, 2 * 3 ** 0.5])
+        assert schedule[4:] == pytest.approx([4.0, 4.5, 5.0, 5.5])
+        assert schedule == sorted(schedule)
+
+    def test_no_ramp_is_a_constant_rate(self):
+        assert arrival_schedule(3, 4.0, 0.0) == pytest.approx([0.0, 0.25, 0.5])
+
+
+class TestSummarize:
+    """Throughput, errors and latency per window."""
+
+    def test_no_results(self):
+        assert summarize([]) == {"users": 0, "windows": []}
+
+    def test_overall_and_windows(self):
+        results = [
+            _result(0, 0.0, 1000.0),
+            _result(1, 1.0, 3000.0, passed=False),
+            _result(2, 6.0, 500.0),
+            _result(3, 7.0, 20000.0),
+        ]
+        summary = summarize(results, window_s=5.0)
+        assert summary["users"] == 4
+        assert summary["errors"] == 1
+        assert summary["wall_s"] == 27.0
+        assert summary["max_queued_ms"] == 3.0
+        assert summary["p50_ms"] == 1000.0
+        assert summary["histogram_bounds_ms"] == list(LATENCY_BUCKETS_MS)
+        # 500 ms, 1000 ms, 3000 ms and an open-ended 20 s
+        assert summary["histogram"] == [0, 1, 1, 0, 1, 0, 0, 1]
+        # Users count in the window they finished in
+        assert [(window["start_s"], window["users"]) for window in summary["windows"]] == [
+            (0.0, 2), (5.0, 1), (25.0, 1)]
+        assert summary["windows"][0]["error_rate"] == 0.5
+        assert summary["windows"][0]["throughput_per_s"] == 0.4
@@ -0,0 +1,71 @@
+import os
+import re
+import pytest
+from playwright.sync_api import Page, expect
+from pages.markopolo_login_page import MarkopoloLoginPage
+from utils.api_tier import LoginApiNotFound, api_endpoint_configured, load_api_cases, representative_cases, run_cases
+from utils.scenario_registry import get_registry
+
+API_CASES = load_api_cases()
+
+
+@pytest.fixture(scope="session")
+def api_results(base_url: str):
+    """Post every case concurrently once; the tests below only check the results.
+
+    A missing endpoint is returned instead of raised, so it fails one test rather than every case.
+    """
+    try:
+        return {result.name: result for result in run_cases(API_CASES, base_url)}
+    except LoginApiNotFound as e:
+        return e
+
+
+@pytest.fixture(scope="session")
+def missing_endpoint():
+    """Whether a missing login endpoint has already failed a test; the remaining cases then skip."""
+    return {"reported": False}
+
+
+@pytest.mark.api
+@pytest.mark.login
+@pytest.mark.skipif(not api_endpoint_configured(os.getenv("BASE_URL", "")),
+                    reason="login API endpoint unknown; set AUTH_API_URL or AUTH_API_PATH (or BASE_URL=local)")
+class TestLoginApiMatrix:
+    """Full credential edge-case matrix, checked against the login API."""
+
+    @pytest.mark.parametrize("case", get_registry().params())
+    def test_credentials_are_rejected(self, case, api_results, missing_endpoint):
+        """The API rejects the case with the expected status and an error message."""
+        if isinstance(api_results, LoginApiNotFound):
+            if missing_endpoint["reported"]:
+                pytest.skip(str(api_results))
+            missing_endpoint["reported"] = True
+            pytest.fail(str(api_results), pytrace=False)
+        result = api_results[case.name]
+        assert result.passed, f"{case.description}: {result.error} (status {result.status}, body {result.body})"
+
+
+@pytest.mark.login
+class TestLoginBrowserSubset:
+    """One case per expectation through the UI; the API tier covers the rest."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, page: Page, base_url: str):
+        self.page = page
+        self.base_url = base_url.rstrip("/")
+        self.login = MarkopoloLoginPage(page)
+
+    @pytest.mark.parametrize("case", representative_cases(API_CASES), ids=lambda case: case.name)
+    def test_credentials_are_rejected_in_browser(self, case):
+        """The form refuses the case and stays on the login page."""
+        self.login.navigate_to_prod_env(self.base_url)
+        self.login.enter_credentials(case.email, case.password)
+        self.login.click_sign_in()
+        if case.expect == "validation":
+            self.login.verify_validation_message_for_empty_fields()
+        elif case.expect == "invalid":
+            self.login.verify_error_message()
+        else:
+            assert self.login.detect_login_outcome(timeout=15000).status != "success"
+        expect(self.page).to_have_url(re.compile(r"/login"))
@@ -0,0 +1,70 @@
+import json
+from types import SimpleNamespace
+import pytest
+from utils import perf_capture
+from utils.perf_capture import PerfCollector, percentile, thresholds_for, write_summary
+
+
+def _item(*markers):
+    """A stand-in test item carrying ``markers`` (closest first)."""
+    marks = [marker.mark for marker in markers]
+    return SimpleNamespace(
+        iter_markers=lambda: iter(marks),
+        get_closest_marker=lambda name: next((mark for mark in marks if mark.name == name), None),
+    )
+
+
+class TestPercentile:
+    """Nearest-rank percentiles."""
+
+    @pytest.mark.parametrize("pct, expected", [(0, 1.0), (50, 5.0), (95, 10.0), (99, 10.0), (100, 10.0)])
+    def test_nearest_rank(self, pct, expected):
+        assert percentile([float(value) for value in range(10, 0, -1)], pct) == expected
+
+    def test_single_value(self):
+        assert percentile([7.0], 99) == 7.0
+
+
+class TestThresholds:
+    """Limits per marker, and violations of them."""
+
+    @pytest.fixture(autouse=True)
+    def thresholds_file(self, tmp_path, monkeypatch):
+        path = tmp_path / "perf_thresholds.json"
+        path.write_text(json.dumps({"smoke": {"ttfb_ms": 3000, "load_ms": 15000},
+                                    "login": {"ttfb_ms": 2000, "login_rtt_ms": 5000}}), encoding="utf-8")
+        monkeypatch.setattr(perf_capture, "THRESHOLDS_PATH", str(path))
+
+    def test_strictest_marker_wins(self):
+        assert thresholds_for(_item(pytest.mark.smoke, pytest.mark.login)) == {
+            "ttfb_ms": 2000, "load_ms": 15000, "login_rtt_ms": 5000}
+
+    def test_performance_marker_overrides(self):
+        item = _item(pytest.mark.performance(ttfb_ms=500), pytest.mark.login)
+        assert thresholds_for(item)["ttfb_ms"] == 500
+
+    def test_unmarked_test_has_no_limits(self):
+        assert thresholds_for(_item()) == {}
+
+    def test_violations(self):
+        collector = PerfCollector("test_a")
+        collector.records = [{"action": "navigate_to_prod_env", "ttfb_ms": 2500.0, "lcp_ms": None},
+                             {"action": "perform_login", "login_rtt_ms": 400.0}]
+        assert collector.violations({"ttfb_ms": 2000, "lcp_ms": 100, "login_rtt_ms": 5000}) == [
+            "navigate_to_prod_env ttfb_ms=2500 exceeds 2000"]
+
+
+class TestSummary:
+    """Aggregating per-test files."""
+
+    def test_summary_per_action_and_metric(self, tmp_path):
+        for index in range(4):
+            collector = PerfCollector(f"test_{index}")
+            collector.records = [{"action": "click_sign_in", "duration_ms": float(index + 1), "lcp_ms": None}]
+            collector.write(tmp_path)
+        summary = write_summary(tmp_path)
+        assert summary == {"click_sign_in": {"duration_ms": {"count": 4, "p50": 2.0, "p95": 4.0, "p99": 4.0}}}
+        assert json.loads((tmp_path / "summary.json").read_text(encoding="utf-8")) == summary
+
+    def test_nothing_recorded(self, tmp_path):
+        assert write_summary(tmp_path) is None
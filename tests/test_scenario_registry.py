@@ -0,0 +1,69 @@
+import json
+import pytest
+from utils.scenario_registry import CREDENTIAL_SECTIONS, ScenarioDataError, ScenarioRegistry
+
+VALID = {
+    "invalid_credentials": [{"email": "a@example.com", "password": "wrong", "description": "wrong password"}],
+    "edge_cases": {"empty_email": {"email": "", "password": "pass"}},
+    "boundary_cases": {"long_email": {"email": "x" * 64 + "@example.com", "password": "pass"}},
+    "prod_email": "qa@example.com",
+}
+
+
+@pytest.fixture
+def registry_for(tmp_path):
+    def build(document):
+        path = tmp_path / "testdata.json"
+        path.write_text(document if isinstance(document, str) else json.dumps(document), encoding="utf-8")
+        return ScenarioRegistry(str(path))
+
+    return build
+
+
+class TestScenarioRegistry:
+    """Loading and parametrizing the login test data."""
+
+    def test_params_cover_every_section_with_its_marker(self, registry_for):
+        params = registry_for(VALID).params()
+        assert [param.id for param in params] == ["invalid_credentials[0]", "empty_email", "long_email"]
+        assert [param.marks[0].name for param in params] == list(CREDENTIAL_SECTIONS.values())
+        assert params[1].values[0].has_empty_field
+
+    def test_defaults_fall_back_per_key(self, registry_for):
+        defaults = registry_for(VALID).defaults
+        assert defaults.email == "qa@example.com"
+        assert defaults.password == "testpass123"
+
+    def test_missing_file_uses_defaults(self, tmp_path):
+        registry = ScenarioRegistry(str(tmp_path / "missing.json"))
+        assert registry.params() == []
+        assert registry.defaults.invalid_email == "invalid@example.com"
+
+
+class TestMalformedTestData:
+    """A test data file that does not match the schema raises ScenarioDataError."""
+
+    @pytest.mark.parametrize("document, message", [
+        pytest.param("{not json", "invalid JSON", id="invalid-json"),
+        pytest.param([], "top level", id="top-level-list"),
+        pytest.param({"invalid_credentials": {}}, "must be a list", id="invalid-credentials-object"),
+        pytest.param({"edge_cases": []}, "must be an object", id="edge-cases-list"),
+        pytest.param({"edge_cases": {"case": "a@example.com"}}, "expected an object", id="case-not-object"),
+        pytest.param({"boundary_cases": {"case": {"email": "a@example.com"}}}, "'password' must be a string",
+                     id="missing-password"),
+        pytest.param({"edge_cases": {"case": {"email": "", "password": 1}}}, "'password' must be a string",
+                     id="non-string-password"),
+        pytest.param({"edge_cases": {"dup": {"email": "", "password": ""}},
+                      "boundary_cases": {"dup": {"email": "", "password": ""}}}, "duplicate case names",
+                     id="duplicate-names"),
+        pytest.param({"prod_email": 42}, "'prod_email' must be a string", id="non-string-default"),
+    ])
+    def test_raises_scenario_data_error(self, registry_for, document, message):
+        registry = registry_for(document)
+        with pytest.raises(ScenarioDataError, match=message):
+            registry.params()
+            registry.defaults
+
+    def test_unknown_section_is_rejected(self, registry_for):
+        with pytest.raises(ScenarioDataError, match="unknown credential section"):
+            registry_for(VALID).cases("valid_credentials")
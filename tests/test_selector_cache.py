@@ -0,0 +1,84 @@
+import pytest
+from utils import selector_cache
+from utils.selector_cache import SelectorCache
+
+DAY = 86400.0
+BASE_URL = "https://beta-stg.markopolo.ai"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = {"t": 1_000 * DAY}
+    monkeypatch.setattr(selector_cache.time, "time", lambda: now["t"])
+    return now
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "selector_cache.json"
+
+
+def _stats(cache: SelectorCache, selector: str) -> dict:
+    return cache._read()[BASE_URL]["email"]["selectors"][selector]
+
+
+class TestOrdering:
+    """Candidates are tried by smoothed hit rate."""
+
+    def test_reliable_fallback_moves_first(self, path):
+        cache = SelectorCache(path)
+        for _ in range(3):
+            cache.record(BASE_URL, "email", "#primary", hit=False)
+            cache.record(BASE_URL, "email", "#fallback", hit=True, elapsed_ms=5.0)
+        assert cache.order(BASE_URL, "email", ["#primary", "#fallback", "#unseen"]) == [
+            "#fallback", "#unseen", "#primary"]
+
+    def test_local_ports_share_history(self, path):
+        cache = SelectorCache(path)
+        cache.record("http://127.0.0.1:5001", "email", "#fallback", hit=True)
+        assert cache.order("http://127.0.0.1:6002/", "email", ["#primary", "#fallback"])[0] == "#fallback"
+
+
+class TestPersistence:
+    """Saving merges, decays and evicts."""
+
+    def test_counts_halve_every_half_life(self, path, clock):
+        cache = SelectorCache(path, half_life_days=3.0)
+        for _ in range(4):
+            cache.record(BASE_URL, "email", "#primary", hit=True, elapsed_ms=10.0)
+        cache.save()
+        clock["t"] += 3 * DAY
+        later = SelectorCache(path, half_life_days=3.0)
+        later.record(BASE_URL, "email", "#primary", hit=False)
+        later.save()
+        stats = _stats(later, "#primary")
+        assert (stats["wins"], stats["misses"], stats["total_ms"]) == pytest.approx((2.0, 1.0, 20.0))
+
+    def test_unseen_selectors_are_evicted(self, path, clock):
+        cache = SelectorCache(path, max_age_days=14.0)
+        cache.record(BASE_URL, "email", "#old", hit=True)
+        cache.save()
+        clock["t"] += 15 * DAY
+        later = SelectorCache(path, max_age_days=14.0)
+        later.record(BASE_URL, "email", "#new", hit=True)
+        later.save()
+        assert set(later._read()[BASE_URL]["email"]["selectors"]) == {"#new"}
+
+    def test_workers_do_not_drop_each_others_outcomes(self, path, clock):
+        first, second = SelectorCache(path), SelectorCache(path)
+        first.record(BASE_URL, "email", "#primary", hit=True)
+        second.record(BASE_URL, "email", "#primary", hit=True)
+        first.save()
+        second.save()
+        assert _stats(second, "#primary")["wins"] == 2.0
+        assert not path.with_suffix(path.suffix + ".lock").exists()
+
+    def test_rot_report_names_a_losing_primary(self, path, clock):
+        cache = SelectorCache(path)
+        cache.order(BASE_URL, "email", ["#primary", "#fallback"])
+        for _ in range(3):
+            cache.record(BASE_URL, "email", "#primary", hit=False)
+            cache.record(BASE_URL, "email", "#fallback", hit=True, elapsed_ms=12.0)
+        cache.save()
+        assert cache.rot_report() == [
+            f"{BASE_URL} email: primary '#primary' hit rate 0%; '#fallback' wins instead (avg 12 ms)"]
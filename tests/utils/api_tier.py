@@ -0,0 +1,216 @@
+"""Check the credential edge-case matrix against the login API, without a browser.
+
+Every invalid-credential, edge and boundary case from the login test data is
+posted straight to the login endpoint over a small pool of keep-alive
+connections, and the status and error payload are checked against the case's
+expectation. The browser suite only needs to cover a representative subset.
+
+Usage (from the ``tests`` directory)::
+
+    python -m utils.api_tier --base-url http://127.0.0.1:8765 --concurrency 16
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Optional, Dict, Any, List, Tuple
+from urllib.parse import urlparse
+from local_server.server import AUTH_ENDPOINT
+from utils.scenario_registry import CREDENTIAL_SECTIONS, TEST_DATA_PATH, CredentialCase, get_registry
+
+logger = logging.getLogger(__name__)
+
+# Path of the login API, relative to BASE_URL (AUTH_API_URL overrides the full URL).
+# Only the local stand-in's path is known; real environments must configure it.
+AUTH_API_PATH = os.getenv("AUTH_API_PATH", AUTH_ENDPOINT)
+
+# Accepted statuses and a required message fragment for each expectation
+EXPECTATIONS: Dict[str, Dict[str, Any]] = {
+    "validation": {"statuses": frozenset({400, 422}), "message": None},
+    "invalid": {"statuses": frozenset({400, 401}), "message": "invalid"},
+    "rejected": {"statuses": frozenset({400, 401, 422}), "message": None},
+}
+
+
+class LoginApiNotFound(RuntimeError):
+    """The login endpoint answered 404, so no case could be checked."""
+
+
+@dataclass(frozen=True)
+class ApiCase:
+    """A credential pair and how the login API must reject it.
+
+    ``expect`` is ``"validation"`` (a field is empty), ``"invalid"`` (well-formed
+    but wrong credentials) or ``"rejected"`` (any client error).
+    """
+
+    name: str
+    email: str
+    password: str
+    expect: str
+    description: str = ""
+
+
+@dataclass
+class ApiResult:
+    """Outcome of posting one :class:`ApiCase`."""
+
+    name: str
+    passed: bool
+    status: Optional[int]
+    elapsed_ms: float
+    body: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+def api_case(case: CredentialCase) -> ApiCase:
+    """Turn a registry case into an API case with its expectation.
+
+    Wrong credentials are ``invalid``; an edge or boundary case with an empty
+    field is a ``validation`` error, and any other is ``rejected``.
+    """
+    if case.section == "invalid_credentials":
+        expect = "invalid"
+    else:
+        expect = "validation" if case.has_empty_field else "rejected"
+    return ApiCase(case.name, case.email, case.password, expect, case.description)
+
+
+def load_api_cases(path: str = TEST_DATA_PATH) -> List[ApiCase]:
+    """Build API cases from the ``invalid_credentials``, ``edge_cases`` and ``boundary_cases`` sections."""
+    registry = get_registry(path)
+    return [api_case(case) for section in CREDENTIAL_SECTIONS for case in registry.cases(section)]
+
+
+def auth_url(base_url: str) -> str:
+    return os.getenv("AUTH_API_URL") or base_url.rstrip('/') + AUTH_API_PATH
+
+
+def api_endpoint_configured(base_url: str) -> bool:
+    """Whether the login endpoint is known for ``base_url``: set explicitly, or the local stand-in."""
+    return bool(os.getenv("AUTH_API_URL") or os.getenv("AUTH_API_PATH")) or base_url == "local"
+
+
+class LoginApiClient:
+    """Posts credentials to the login API over one keep-alive connection per thread."""
+
+    def __init__(self, url: str, timeout: float = 15.0):
+        self.url = urlparse(url)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.url.scheme == "https" else http.client.HTTPConnection
+            conn = cls(self.url.netloc, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def post(self, email: str, password: str) -> Tuple[int, Dict[str, Any]]:
+        """Post one credential pair; returns (status, parsed JSON body or {})."""
+        payload = json.dumps({"email": email, "password": password})
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request("POST", self.url.path or "/", body=payload, headers=headers)
+                response = conn.getresponse()
+                raw = response.read()
+                break
+            except (http.client.HTTPException, ConnectionError):
+                # The server closed the idle keep-alive connection; reconnect once
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise
+        try:
+            body = json.loads(raw or b"{}")
+        except json.JSONDecodeError:
+            body = {"raw": raw[:200].decode("utf-8", "replace")}
+        return response.status, body if isinstance(body, dict) else {"raw": body}
+
+
+def check_case(client: LoginApiClient, case: ApiCase) -> ApiResult:
+    """Post ``case`` and check the response against its expectation."""
+    started = time.perf_counter()
+    try:
+        status, body = client.post(case.email, case.password)
+    except Exception as e:
+        return ApiResult(case.name, False, None, (time.perf_counter() - started) * 1000, error=f"{type(e).__name__}: {e}")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    expectation = EXPECTATIONS[case.expect]
+    message = str(body.get("message") or body.get("error") or "")
+    problems = []
+    if status not in expectation["statuses"]:
+        problems.append(f"status {status} not in {sorted(expectation['statuses'])}")
+    if body.get("success") is True or "accessToken" in json.dumps(body):
+        problems.append("response reports a successful login")
+    if not message:
+        problems.append("error payload has no message")
+    elif expectation["message"] and expectation["message"] not in message.lower():
+        problems.append(f"message {message!r} does not mention {expectation['message']!r}")
+    return ApiResult(case.name, not problems, status, elapsed_ms, body, "; ".join(problems) or None)
+
+
+def representative_cases(cases: List[ApiCase]) -> List[ApiCase]:
+    """The first case of each expectation, for the browser-level subset."""
+    first: Dict[str, ApiCase] = {}
+    for case in cases:
+        first.setdefault(case.expect, case)
+    return list(first.values())
+
+
+def run_cases(cases: List[ApiCase], base_url: str, concurrency: int = 16) -> List[ApiResult]:
+    """Check every case concurrently; returns one result per case, in order.
+
+    Raises:
+        LoginApiNotFound: If the endpoint answers the first case with 404
+    """
+    if not cases:
+        return []
+    client = LoginApiClient(auth_url(base_url))
+    first = check_case(client, cases[0])
+    if first.status == 404:
+        raise LoginApiNotFound(f"No login API at {auth_url(base_url)} (HTTP 404); "
+                               f"set AUTH_API_URL or AUTH_API_PATH to the real endpoint")
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="api-tier") as executor:
+        return [first] + list(executor.map(lambda case: check_case(client, case), cases[1:]))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=os.getenv("BASE_URL", "https://beta-stg.markopolo.ai"))
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("API_TIER_CONCURRENCY", "16")))
+    parser.add_argument("--json", dest="json_path", help="Write per-case results to this file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)8s] %(message)s")
+    cases = load_api_cases()
+    started = time.perf_counter()
+    try:
+        results = run_cases(cases, args.base_url, args.concurrency)
+    except LoginApiNotFound as e:
+        print(e)
+        return 2
+    wall_s = time.perf_counter() - started
+    for result in results:
+        status = "PASS" if result.passed else "FAIL"
+        print(f"{status} {result.name} -> {result.status} ({result.elapsed_ms:.0f} ms)"
+              f"{' - ' + result.error if result.error else ''}")
+    failed = sum(not result.passed for result in results)
+    print(f"{len(results)} cases, {failed} failed in {wall_s:.2f}s ({len(results) / wall_s:.1f} cases/s)")
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as file:
+            json.dump([asdict(result) for result in results], file, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
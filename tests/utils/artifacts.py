@@ -0,0 +1,231 @@
+import os
+import re
+import time
+import zipfile
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, List
+from playwright.sync_api import BrowserContext, Error as PlaywrightError, Page
+from utils.env import env_flag
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_DIR = Path(os.getenv("ARTIFACT_DIR", os.path.join(Path(__file__).parent.parent.parent, "artifacts")))
+MODES = ("off", "on", "retain-on-failure")
+
+
+def artifact_mode() -> str:
+    """Current artifact mode from ARTIFACTS: ``off`` (default), ``on`` or ``retain-on-failure``."""
+    mode = os.getenv("ARTIFACTS", "off").lower()
+    if mode not in MODES:
+        raise ValueError(f"Unknown ARTIFACTS mode {mode!r}; expected one of {', '.join(MODES)}")
+    return mode
+
+
+def video_dir() -> Optional[str]:
+    """Where contexts record video in artifact mode, or None when video is not recorded."""
+    if artifact_mode() == "off" or not env_flag("ARTIFACT_VIDEO", "true"):
+        return None
+    return str(ARTIFACT_DIR / ".recording" / os.getenv("PYTEST_XDIST_WORKER", "main"))
+
+
+class ArtifactStore:
+    """Archives the artifacts of retained tests and deletes the rest, off the test thread.
+
+    Each retained test becomes one zip in ``directory``. After every archive the
+    directory is trimmed to ``budget_mb`` by evicting the least recently used
+    archives first (by access or modification time, whichever is later).
+    """
+
+    def __init__(self, directory: Path = ARTIFACT_DIR, budget_mb: Optional[float] = None, workers: int = 2):
+        """Initialize the store.
+
+        Args:
+            directory: Where archives are written
+            budget_mb: Disk budget for archives (defaults to ARTIFACT_BUDGET_MB or 500)
+            workers: Background threads compressing and deleting files
+        """
+        self.directory = Path(directory)
+        self.budget_bytes = (budget_mb if budget_mb is not None
+                             else float(os.getenv("ARTIFACT_BUDGET_MB", "500"))) * 1024 * 1024
+        self.kept: List[Path] = []
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="artifacts")
+        self._lock = threading.Lock()
+
+    def keep(self, test_id: str, files: List[Path]) -> None:
+        """Archive ``files`` for ``test_id`` in the background."""
+        if files:
+            self._executor.submit(self._archive, test_id, files)
+
+    def discard(self, files: List[Path]) -> None:
+        """Delete ``files`` in the background."""
+        if files:
+            self._executor.submit(self._delete, files)
+
+    @staticmethod
+    def _wait_until_written(path: Path, timeout: float = 30.0) -> None:
+        """Wait until ``path`` stops growing (videos are finalized after the page closes)."""
+        deadline = time.time() + timeout
+        last = -1
+        while time.time() < deadline:
+            try:
+                size = path.stat().st_size
+            except FileNotFoundError:
+                size = -1
+            if size == last and size > 0:
+                return
+            last = size
+            time.sleep(0.25)
+
+    def _archive(self, test_id: str, files: List[Path]) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            name = re.sub(r"[^\w.-]+", "_", test_id)[-120:]
+            archive = self.directory / f"{name}-{int(time.time() * 1000)}.zip"
+            with zipfile.ZipFile(archive, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+                for path in files:
+                    self._wait_until_written(path)
+                    if path.exists():
+                        zf.write(path, arcname=path.name)
+            with self._lock:
+                self.kept.append(archive)
+            self._delete(files)
+            self.enforce_budget(protect=archive)
+        except Exception as e:
+            logger.warning(f"Could not archive artifacts of {test_id}: {e}")
+
+    @staticmethod
+    def _delete(files: List[Path], timeout: float = 30.0) -> None:
+        """Delete files, retrying while they are still held open (Windows)."""
+        deadline = time.time() + timeout
+        pending = list(files)
+        while pending:
+            for path in list(pending):
+                try:
+                    path.unlink(missing_ok=True)
+                    pending.remove(path)
+                except PermissionError:
+                    pass
+            if pending:
+                if time.time() > deadline:
+                    logger.debug(f"Could not delete {len(pending)} artifact files")
+                    return
+                time.sleep(0.5)
+
+    def enforce_budget(self, protect: Optional[Path] = None) -> None:
+        """Evict least recently used archives until the directory fits the budget."""
+        with self._lock:
+            archives = []
+            for path in self.directory.glob("*.zip"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                archives.append((max(stat.st_atime, stat.st_mtime), stat.st_size, path))
+            total = sum(size for _, size, _ in archives)
+            for _, size, path in sorted(archives):
+                if total <= self.budget_bytes:
+                    break
+                if path == protect:
+                    continue
+                path.unlink(missing_ok=True)
+                total -= size
+                logger.info(f"Evicted artifact {path.name} to stay within the disk budget")
+
+    def close(self) -> List[Path]:
+        """Wait for pending work; returns the archives written by this process."""
+        self._executor.shutdown(wait=True)
+        return [path for path in self.kept if path.exists()]
+
+
+class ContextArtifacts:
+    """Records a Playwright trace and collects the videos of one test's context."""
+
+    def __init__(self, context: BrowserContext, test_id: str, trace: Optional[bool] = None):
+        """Initialize the recorder.
+
+        Args:
+            context: Context to record
+            test_id: Test node id, used to name the archive
+            trace: Whether to record a trace (defaults to ARTIFACT_TRACE, on)
+        """
+        self.context = context
+        self.test_id = test_id
+        self.trace = trace if trace is not None else env_flag("ARTIFACT_TRACE", "true")
+        self.files: List[Path] = []
+        self._pages: List[Page] = []
+
+    def _on_page(self, page: Page) -> None:
+        self._pages.append(page)
+
+    def start(self) -> None:
+        self.context.on("page", self._on_page)
+        if self.trace:
+            self.context.tracing.start(screenshots=True, snapshots=True)
+
+    def stop(self, keep: bool) -> None:
+        """Stop tracing (writing the trace only if ``keep``) and collect video files.
+
+        Call before the context is closed or returned to a pool.
+        """
+        # A pooled context outlives this recorder; stop collecting its pages
+        self.context.remove_listener("page", self._on_page)
+        if self.trace:
+            try:
+                if keep:
+                    path = ARTIFACT_DIR / ".recording" / f"trace-{os.getpid()}-{id(self)}.zip"
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    self.context.tracing.stop(path=path)
+                    self.files.append(path)
+                else:
+                    self.context.tracing.stop()
+            except PlaywrightError as e:
+                logger.debug(f"Could not stop tracing for {self.test_id}: {e}")
+        for page in self._pages:
+            if not page.video:
+                continue
+            try:
+                self.files.append(Path(page.video.path()))
+            except PlaywrightError:
+                # Connected to a remote browser server: the file is only reachable through save_as,
+                # which waits for the page to close (popups or extra pages may still be open)
+                if not keep:
+                    continue
+                path = ARTIFACT_DIR / ".recording" / f"video-{os.getpid()}-{id(page)}.webm"
+                try:
+                    if not page.is_closed():
+                        page.close()
+                    page.video.save_as(path)
+                    self.files.append(path)
+                except PlaywrightError as e:
+                    logger.debug(f"Could not save video for {self.test_id}: {e}")
+
+    def finish(self, store: ArtifactStore, keep: bool) -> None:
+        """Hand the collected files to ``store``; call after the context is closed."""
+        if keep:
+            store.keep(self.test_id, self.files)
+        else:
+            store.discard(self.files)
+
+
+_store: Optional[ArtifactStore] = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Return the process-wide artifact store."""
+    global _store
+    if _store is None:
+        _store = ArtifactStore()
+    return _store
+
+
+def close_artifact_store() -> List[Path]:
+    """Drain the process-wide store (if it was used); returns the archives it wrote."""
+    global _store
+    if _store is None:
+        return []
+    kept = _store.close()
+    _store = None
+    return kept
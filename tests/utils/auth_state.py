@@ -0,0 +1,96 @@
+import os
+import time
+import hashlib
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Any
+from urllib.parse import urlparse
+from playwright.sync_api import Browser
+from pages.markopolo_login_page import MarkopoloLoginPage
+
+logger = logging.getLogger(__name__)
+
+AUTH_STATE_DIR = Path(os.getenv(
+    "AUTH_STATE_DIR",
+    os.path.join(Path(__file__).parent.parent.parent, ".auth"),
+))
+
+
+class AuthStateCache:
+    """Login-once cache of an authenticated Playwright storage state.
+
+    The first call to :meth:`ensure` drives ``perform_login`` through the UI and
+    saves the resulting storage state. Later calls reuse the saved file until it
+    is older than the TTL; a file left over from an earlier run is validated with
+    ``is_logged_in`` before it is trusted. Each xdist worker and account keeps its
+    own file so workers never race on a half-written state.
+    """
+
+    def __init__(self, browser: Browser, context_args: Dict[str, Any], base_url: str,
+                 email: str, password: str, ttl: Optional[float] = None):
+        """Initialize the cache.
+
+        Args:
+            browser: Browser used for the login and validation contexts
+            context_args: Context options shared with the regular ``context`` fixture
+            base_url: Base URL of the application
+            email: Email to log in with
+            password: Password to log in with
+            ttl: Seconds a saved state is trusted (defaults to AUTH_STATE_TTL or 30 minutes)
+        """
+        self.browser = browser
+        self.context_args = {k: v for k, v in context_args.items() if v is not None and k != "record_video_dir"}
+        self.base_url = base_url.rstrip('/')
+        self.email = email
+        self.password = password
+        self.ttl = ttl if ttl is not None else float(os.getenv("AUTH_STATE_TTL", "1800"))
+        worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+        host = urlparse(self.base_url).netloc.replace(":", "_") or "default"
+        account = hashlib.sha1(email.encode('utf-8')).hexdigest()[:8]
+        self.path = AUTH_STATE_DIR / f"{host}-{worker}-{account}.json"
+        self._validated = False
+
+    def _age(self) -> Optional[float]:
+        """Seconds since the state file was written, or None if it does not exist."""
+        try:
+            return time.time() - self.path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _login(self) -> None:
+        """Log in through the UI and save the storage state."""
+        logger.info(f"Logging in once to cache storage state at {self.path}")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        ctx = self.browser.new_context(**self.context_args)
+        try:
+            page = ctx.new_page()
+            MarkopoloLoginPage(page).perform_login(self.base_url, self.email, self.password)
+            ctx.storage_state(path=str(self.path))
+        finally:
+            ctx.close()
+        self._validated = True
+
+    def _is_valid(self) -> bool:
+        """Check that the saved state still yields a logged-in session."""
+        ctx = self.browser.new_context(storage_state=str(self.path), **self.context_args)
+        try:
+            page = ctx.new_page()
+            page.goto(self.base_url, wait_until="domcontentloaded")
+            return MarkopoloLoginPage(page).is_logged_in(timeout=10000)
+        finally:
+            ctx.close()
+
+    def ensure(self) -> str:
+        """Return the path of a fresh authenticated storage state, logging in if needed."""
+        age = self._age()
+        if age is None or age > self.ttl:
+            if age is not None:
+                logger.info(f"Cached storage state is {age:.0f}s old (TTL {self.ttl:.0f}s); logging in again")
+            self._login()
+        elif not self._validated:
+            if self._is_valid():
+                self._validated = True
+            else:
+                logger.info("Cached storage state is no longer logged in; logging in again")
+                self._login()
+        return str(self.path)
@@ -0,0 +1,225 @@
+"""Repeated-trial timings of framework overhead, with a stored baseline to compare against.
+
+The benchmarks in ``tests/benchmarks`` time fixture setup/teardown and the login
+page object against the local stand-in server, so the numbers reflect the
+framework rather than the network. Each benchmark runs a few warmup iterations
+and then ``BENCHMARK_TRIALS`` timed trials; the median is compared against the
+baseline.
+
+Usage (from the ``tests`` directory)::
+
+    python -m utils.benchmark compare ../.benchmarks/latest.json ../.benchmarks/baseline.json
+"""
+import os
+import sys
+import json
+import time
+import logging
+import platform
+import argparse
+import statistics
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Callable, Optional, Dict, Any, List, Tuple
+from utils.env import env_flag
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_DIR = Path(os.getenv(
+    "BENCHMARK_DIR",
+    os.path.join(Path(__file__).parent.parent.parent, ".benchmarks"),
+))
+RESULTS_PATH = BENCHMARK_DIR / "latest.json"
+BASELINE_PATH = Path(os.getenv("BENCHMARK_BASELINE", str(BENCHMARK_DIR / "baseline.json")))
+
+
+def benchmark_enabled() -> bool:
+    return env_flag("BENCHMARK")
+
+
+def save_baseline_requested() -> bool:
+    return env_flag("BENCHMARK_SAVE_BASELINE")
+
+
+@dataclass(frozen=True)
+class BenchmarkStats:
+    """Summary of the timed trials of one benchmark, in milliseconds."""
+
+    name: str
+    trials: int
+    mean_ms: float
+    median_ms: float
+    p95_ms: float
+    stdev_ms: float
+    min_ms: float
+
+    @classmethod
+    def from_samples(cls, name: str, samples: List[float]) -> "BenchmarkStats":
+        if not samples:
+            raise ValueError(f"Benchmark {name} has no samples")
+        ordered = sorted(samples)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        stdev = statistics.stdev(samples) if len(samples) > 1 else 0.0
+        return cls(name, len(samples), statistics.mean(samples), statistics.median(samples), p95, stdev, ordered[0])
+
+
+def measure(operation: Callable[[Any], Any], trials: int, warmup: int,
+            before: Optional[Callable[[], Any]] = None,
+            after: Optional[Callable[[Any], None]] = None) -> List[float]:
+    """Time ``operation`` over ``trials`` runs after ``warmup`` untimed runs.
+
+    ``before`` prepares each run outside the timing and its result is passed to
+    ``operation``; ``after`` receives the operation's result and cleans up, also
+    untimed. If ``operation`` raises, ``after`` still runs, with the state from
+    ``before``, and the exception propagates.
+
+    Returns:
+        Duration of each timed trial in milliseconds
+    """
+    samples = []
+    for run in range(warmup + trials):
+        state = before() if before else None
+        result = state
+        try:
+            started = time.perf_counter()
+            result = operation(state)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        finally:
+            if after:
+                after(result)
+        if run >= warmup:
+            samples.append(elapsed_ms)
+    return samples
+
+
+def measure_lifecycle(setup: Callable[[], Any], teardown: Callable[[Any], None], trials: int,
+                      warmup: int) -> Tuple[List[float], List[float]]:
+    """Time ``setup`` and the ``teardown`` of what it returns, as separate samples.
+
+    Returns:
+        (setup durations, teardown durations) in milliseconds
+    """
+    setups, teardowns = [], []
+    for run in range(warmup + trials):
+        started = time.perf_counter()
+        resource = setup()
+        set_up = time.perf_counter()
+        teardown(resource)
+        finished = time.perf_counter()
+        if run >= warmup:
+            setups.append((set_up - started) * 1000)
+            teardowns.append((finished - set_up) * 1000)
+    return setups, teardowns
+
+
+def _load(path: Path) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file).get("results", {})
+    except FileNotFoundError:
+        return {}
+
+
+def regression(current: BenchmarkStats, baseline: Optional[Dict[str, Any]], threshold: float,
+               min_delta_ms: float) -> Optional[str]:
+    """Describe how ``current`` regressed against its baseline entry, or None if it did not.
+
+    A benchmark regresses when its median is more than ``threshold`` (a fraction)
+    above the baseline median and also more than ``min_delta_ms`` slower, so
+    sub-millisecond operations do not fail on jitter.
+    """
+    if not baseline:
+        return None
+    base = baseline["median_ms"]
+    delta = current.median_ms - base
+    if delta > base * threshold and delta > min_delta_ms:
+        increase = f" (+{delta / base:.0%}, limit {threshold:.0%})" if base else ""
+        return f"{current.name}: median {current.median_ms:.1f} ms vs baseline {base:.1f} ms{increase}"
+    return None
+
+
+class BenchmarkSuite:
+    """Collects benchmark results for one run and checks them against the baseline."""
+
+    def __init__(self, trials: Optional[int] = None, warmup: Optional[int] = None,
+                 threshold: Optional[float] = None, min_delta_ms: Optional[float] = None,
+                 baseline_path: Path = BASELINE_PATH):
+        """Initialize the suite.
+
+        Args:
+            trials: Timed trials per benchmark (defaults to BENCHMARK_TRIALS or 20)
+            warmup: Untimed runs before the trials (defaults to BENCHMARK_WARMUP or 3)
+            threshold: Allowed median slowdown as a fraction (defaults to BENCHMARK_THRESHOLD or 0.15)
+            min_delta_ms: Slowdowns smaller than this never count (defaults to BENCHMARK_MIN_DELTA_MS or 2)
+            baseline_path: Baseline results file
+        """
+        self.trials = trials if trials is not None else int(os.getenv("BENCHMARK_TRIALS", "20"))
+        self.warmup = warmup if warmup is not None else int(os.getenv("BENCHMARK_WARMUP", "3"))
+        self.threshold = threshold if threshold is not None else float(os.getenv("BENCHMARK_THRESHOLD", "0.15"))
+        self.min_delta_ms = (min_delta_ms if min_delta_ms is not None
+                             else float(os.getenv("BENCHMARK_MIN_DELTA_MS", "2")))
+        self.baseline_path = Path(baseline_path)
+        self.baseline = {} if save_baseline_requested() else _load(self.baseline_path)
+        self.results: Dict[str, BenchmarkStats] = {}
+        self.regressions: List[str] = []
+
+    def record(self, name: str, samples: List[float]) -> Optional[str]:
+        """Summarize ``samples`` under ``name``; returns a regression message, if any."""
+        stats = BenchmarkStats.from_samples(name, samples)
+        self.results[name] = stats
+        problem = regression(stats, self.baseline.get(name), self.threshold, self.min_delta_ms)
+        if problem:
+            self.regressions.append(problem)
+        return problem
+
+    def save(self, path: Path = RESULTS_PATH) -> None:
+        """Write this run's results; ``path`` can later serve as a baseline."""
+        if not self.results:
+            return
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        document = {
+            "recorded_at": time.time(),
+            "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                            "trials": self.trials, "warmup": self.warmup},
+            "results": {name: asdict(stats) for name, stats in self.results.items()},
+        }
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(document, file, indent=2)
+        os.replace(tmp_path, path)
+
+    def report_lines(self) -> List[str]:
+        lines = []
+        for name, stats in self.results.items():
+            base = self.baseline.get(name)
+            versus = f" baseline={base['median_ms']:.1f}" if base else ""
+            lines.append(f"{name:<36} n={stats.trials:<3} mean={stats.mean_ms:>8.1f} p50={stats.median_ms:>8.1f} "
+                         f"p95={stats.p95_ms:>8.1f} sd={stats.stdev_ms:>7.1f}{versus}")
+        return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    compare = sub.add_parser("compare", help="Compare a results file against a baseline")
+    compare.add_argument("results")
+    compare.add_argument("baseline")
+    compare.add_argument("--threshold", type=float, default=float(os.getenv("BENCHMARK_THRESHOLD", "0.15")))
+    compare.add_argument("--min-delta-ms", type=float, default=float(os.getenv("BENCHMARK_MIN_DELTA_MS", "2")))
+    args = parser.parse_args(argv)
+
+    results, baseline = _load(Path(args.results)), _load(Path(args.baseline))
+    failed = 0
+    for name, entry in results.items():
+        stats = BenchmarkStats(**entry)
+        problem = regression(stats, baseline.get(name), args.threshold, args.min_delta_ms)
+        base = baseline.get(name)
+        versus = f"{base['median_ms']:>8.1f}" if base else "     new"
+        print(f"{'FAIL' if problem else 'ok  '} {name:<36} p50={stats.median_ms:>8.1f} baseline={versus}")
+        failed += bool(problem)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+"""Long-lived Playwright browser server shared by successive pytest runs.
+
+The first run launches ``playwright launch-server`` in its own process group
+and records its WebSocket endpoint in a state file; later runs connect to that
+endpoint instead of launching a browser. A watchdog process shuts the server
+down once no client has sent a heartbeat for ``BROWSER_SERVER_IDLE_S`` seconds.
+
+Usage (from the ``tests`` directory)::
+
+    python -m utils.browser_server status
+    python -m utils.browser_server stop --browser chromium
+"""
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import logging
+import argparse
+import threading
+import subprocess
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+from urllib.parse import urlparse
+from playwright.sync_api import Browser, BrowserType
+from utils.credential_pool import pid_alive
+from utils.env import env_flag
+
+logger = logging.getLogger(__name__)
+
+# Detach servers from the launching run so they outlive it (and its Ctrl+C)
+_DETACHED: Dict[str, Any] = (
+    {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS}
+    if os.name == "nt" else {"start_new_session": True}
+)
+
+STATE_DIR = Path(os.getenv(
+    "BROWSER_SERVER_DIR",
+    os.path.join(Path(__file__).parent.parent.parent, ".browser_server"),
+))
+
+
+def browser_server_enabled() -> bool:
+    return env_flag("BROWSER_SERVER")
+
+
+def _port_open(ws_endpoint: str, timeout: float = 0.5) -> bool:
+    parsed = urlparse(ws_endpoint)
+    try:
+        with socket.create_connection((parsed.hostname, parsed.port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+class BrowserServer:
+    """A browser server for one browser/headless combination.
+
+    The state file holds the server's pid and endpoint. Its mtime is the last
+    client heartbeat, which the idle watchdog compares against ``idle_s``.
+    """
+
+    def __init__(self, browser_name: str = "chromium", headless: bool = True,
+                 state_dir: Path = STATE_DIR, idle_s: Optional[float] = None):
+        """Initialize the handle (nothing is launched until :meth:`endpoint`).
+
+        Args:
+            browser_name: chromium, firefox or webkit
+            headless: Whether the server's browser runs headless
+            state_dir: Directory for state, lock and log files
+            idle_s: Seconds without a heartbeat before the server shuts down
+                (defaults to BROWSER_SERVER_IDLE_S or 15 minutes)
+        """
+        self.browser_name = browser_name
+        self.headless = headless
+        self.state_dir = Path(state_dir)
+        self.idle_s = idle_s if idle_s is not None else float(os.getenv("BROWSER_SERVER_IDLE_S", "900"))
+        name = f"{browser_name}-{'headless' if headless else 'headed'}"
+        self.state_path = self.state_dir / f"{name}.json"
+        self.log_path = self.state_dir / f"{name}.log"
+        self._heartbeat: Optional[threading.Event] = None
+
+    def read_state(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def healthy(self, state: Optional[Dict[str, Any]] = None) -> bool:
+        """Whether the recorded server process is alive and accepting connections."""
+        state = state or self.read_state()
+        return bool(state) and pid_alive(state["pid"]) and _port_open(state["ws_endpoint"])
+
+    def touch(self) -> None:
+        """Record a client heartbeat."""
+        try:
+            os.utime(self.state_path)
+        except FileNotFoundError:
+            pass
+
+    def endpoint(self, launch_timeout: float = 30.0) -> str:
+        """Endpoint of a healthy server, launching (or relaunching) one if needed."""
+        state = self.read_state()
+        if self.healthy(state):
+            self.touch()
+            return state["ws_endpoint"]
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        lock_path = self.state_path.with_suffix(".lock")
+        deadline = time.time() + launch_timeout
+        # Only one process launches; the others wait for its state file
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                state = self.read_state()
+                if self.healthy(state):
+                    self.touch()
+                    return state["ws_endpoint"]
+                try:
+                    if time.time() - lock_path.stat().st_mtime > launch_timeout:
+                        lock_path.unlink(missing_ok=True)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.time() > deadline:
+                    raise TimeoutError(f"Timed out waiting for another process to launch the {self.browser_name} server")
+                time.sleep(0.1)
+        try:
+            state = self.read_state()
+            if self.healthy(state):
+                return state["ws_endpoint"]
+            if state:
+                logger.warning(f"Browser server pid {state['pid']} is gone or unresponsive; relaunching")
+                self._kill(state["pid"])
+            return self._launch(launch_timeout)["ws_endpoint"]
+        finally:
+            lock_path.unlink(missing_ok=True)
+
+    def _launch(self, timeout: float) -> Dict[str, Any]:
+        config = self.state_dir / f"{self.state_path.stem}.config.json"
+        with open(config, 'w', encoding='utf-8') as file:
+            json.dump({"headless": self.headless}, file)
+        offset = self.log_path.stat().st_size if self.log_path.exists() else 0
+        with open(self.log_path, 'ab') as log:
+            process = subprocess.Popen(
+                [sys.executable, "-m", "playwright", "launch-server", "--browser", self.browser_name,
+                 "--config", str(config)],
+                stdout=log, stderr=log, stdin=subprocess.DEVNULL, **_DETACHED,
+            )
+        started = time.time()
+        ws_endpoint = self._wait_for_endpoint(process, offset, started + timeout)
+        state = {"pid": process.pid, "ws_endpoint": ws_endpoint, "browser": self.browser_name,
+                 "headless": self.headless, "started_at": started}
+        tmp_path = self.state_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(state, file)
+        os.replace(tmp_path, self.state_path)
+        with open(self.log_path, 'ab') as log:
+            subprocess.Popen(
+                [sys.executable, "-m", "utils.browser_server", "watch", "--state", str(self.state_path),
+                 "--idle", str(self.idle_s)],
+                cwd=Path(__file__).parent.parent, stdin=subprocess.DEVNULL, stdout=log, stderr=log, **_DETACHED,
+            )
+        logger.info(f"Launched {self.browser_name} server (pid {process.pid}) in "
+                    f"{time.time() - started:.1f}s at {ws_endpoint}")
+        return state
+
+    def _wait_for_endpoint(self, process: subprocess.Popen, offset: int, deadline: float) -> str:
+        """Read the WebSocket endpoint that launch-server prints once the browser is up."""
+        while time.time() < deadline and process.poll() is None:
+            with open(self.log_path, 'rb') as log:
+                log.seek(offset)
+                for line in log.read().decode("utf-8", "replace").splitlines():
+                    if line.startswith("ws://"):
+                        return line.strip()
+            time.sleep(0.05)
+        self._kill(process.pid)
+        raise RuntimeError(f"{self.browser_name} server did not start; see {self.log_path}")
+
+    @staticmethod
+    def _kill(pid: int) -> None:
+        """Terminate the server and the driver and browser processes under it."""
+        if os.name == "nt":
+            subprocess.run(["taskkill", "/T", "/F", "/PID", str(pid)], capture_output=True)
+            return
+        try:
+            os.killpg(pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def connect(self, browser_type: BrowserType, slow_mo: int = 0) -> Browser:
+        """Connect ``browser_type`` to the server and keep a heartbeat while connected.
+
+        A failed connection (for example, the server crashed between the health
+        check and the connect) relaunches the server once.
+        """
+        try:
+            browser = browser_type.connect(self.endpoint(), slow_mo=slow_mo, timeout=10000)
+        except Exception as e:
+            logger.warning(f"Could not connect to the browser server ({e}); relaunching")
+            state = self.read_state()
+            if state:
+                self._kill(state["pid"])
+                self.state_path.unlink(missing_ok=True)
+            browser = browser_type.connect(self.endpoint(), slow_mo=slow_mo, timeout=10000)
+        self._start_heartbeat(browser)
+        return browser
+
+    def _start_heartbeat(self, browser: Browser) -> None:
+        stopped = threading.Event()
+        browser.on("disconnected", lambda _: stopped.set())
+        self._heartbeat = stopped
+
+        def beat():
+            while not stopped.wait(min(30.0, self.idle_s / 3)):
+                self.touch()
+
+        threading.Thread(target=beat, name="browser-server-heartbeat", daemon=True).start()
+
+    def release(self) -> None:
+        """Stop the heartbeat; the idle timer starts from now."""
+        if self._heartbeat:
+            self._heartbeat.set()
+            self._heartbeat = None
+        self.touch()
+
+    def stop(self) -> bool:
+        """Shut the server down now; returns False if none was running."""
+        state = self.read_state()
+        self.state_path.unlink(missing_ok=True)
+        if not state:
+            return False
+        self._kill(state["pid"])
+        return True
+
+
+def watch(state_path: Path, idle_s: float, poll_s: float = 5.0) -> None:
+    """Shut down the server recorded in ``state_path`` once it has been idle for ``idle_s``.
+
+    Exits when the server dies or the state file is replaced by a newer server.
+    """
+    try:
+        with open(state_path, 'r', encoding='utf-8') as file:
+            pid = json.load(file)["pid"]
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return
+    while pid_alive(pid):
+        try:
+            with open(state_path, 'r', encoding='utf-8') as file:
+                if json.load(file).get("pid") != pid:
+                    return
+            idle = time.time() - state_path.stat().st_mtime
+        except (FileNotFoundError, json.JSONDecodeError):
+            idle = float("inf")
+        if idle > idle_s:
+            print(f"Browser server pid {pid} idle for {idle:.0f}s; shutting down", flush=True)
+            BrowserServer._kill(pid)
+            try:
+                with open(state_path, 'r', encoding='utf-8') as file:
+                    if json.load(file).get("pid") == pid:
+                        state_path.unlink()
+            except (FileNotFoundError, json.JSONDecodeError):
+                pass
+            return
+        time.sleep(poll_s)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="List recorded servers and whether they are healthy")
+    stop = sub.add_parser("stop", help="Shut down running servers")
+    stop.add_argument("--browser", help="Only this browser (default: all)")
+    watcher = sub.add_parser("watch", help=argparse.SUPPRESS)
+    watcher.add_argument("--state", required=True)
+    watcher.add_argument("--idle", type=float, required=True)
+    args = parser.parse_args(argv)
+
+    if args.command == "watch":
+        watch(Path(args.state), args.idle)
+        return 0
+    for state_path in sorted(STATE_DIR.glob("*.json")):
+        if state_path.name.endswith(".config.json"):
+            continue
+        browser_name, _, mode = state_path.stem.partition("-")
+        server = BrowserServer(browser_name, mode == "headless")
+        state = server.read_state()
+        if not state:
+            continue
+        if args.command == "status":
+            idle = time.time() - state_path.stat().st_mtime
+            health = "healthy" if server.healthy(state) else "unhealthy"
+            print(f"{state_path.stem}: pid {state['pid']} {health}, idle {idle:.0f}s, {state['ws_endpoint']}")
+        elif args.browser in (None, browser_name):
+            server.stop()
+            print(f"Stopped {state_path.stem} (pid {state['pid']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
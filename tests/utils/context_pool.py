@@ -0,0 +1,131 @@
+import logging
+from typing import Dict, Any, List, Set
+from urllib.parse import urlparse
+from playwright.sync_api import Browser, BrowserContext, Error as PlaywrightError
+
+logger = logging.getLogger(__name__)
+
+# Runs on a blank document served for each visited origin during a scrub
+_CLEAR_STORAGE_JS = """async () => {
+    try { localStorage.clear(); } catch (e) {}
+    try { sessionStorage.clear(); } catch (e) {}
+    try {
+        if (indexedDB.databases) {
+            const dbs = await indexedDB.databases();
+            await Promise.all(dbs.map(db => new Promise(resolve => {
+                const request = indexedDB.deleteDatabase(db.name);
+                request.onsuccess = request.onerror = request.onblocked = () => resolve();
+            })));
+        }
+    } catch (e) {}
+    try {
+        const keys = await caches.keys();
+        await Promise.all(keys.map(key => caches.delete(key)));
+    } catch (e) {}
+}"""
+
+
+class ContextPool:
+    """Bounded pool of warm browser contexts that are scrubbed between tests.
+
+    Released contexts have their pages closed and their cookies, permissions,
+    routes, headers and per-origin storage cleared before they are handed out
+    again. A context is closed instead of reused once it has served
+    ``max_uses`` tests, when its test failed, or when the scrub itself fails.
+    Event listeners a test attaches directly to the context are not removed, so
+    tests that rely on them should use the non-pooled ``context`` fixture.
+    """
+
+    def __init__(self, browser: Browser, context_args: Dict[str, Any], size: int = 2, max_uses: int = 20):
+        """Initialize the pool.
+
+        Args:
+            browser: Browser that owns the pooled contexts
+            context_args: Options passed to ``browser.new_context``
+            size: Maximum number of idle contexts kept warm
+            max_uses: Tests a context may serve before it is recycled
+        """
+        self.browser = browser
+        self.context_args = {k: v for k, v in context_args.items() if v is not None}
+        self.size = size
+        self.max_uses = max_uses
+        self._idle: List[BrowserContext] = []
+        self._uses: Dict[BrowserContext, int] = {}
+        self._origins: Dict[BrowserContext, Set[str]] = {}
+
+    def _create(self) -> BrowserContext:
+        """Create a context and start tracking the origins its pages visit."""
+        ctx = self.browser.new_context(**self.context_args)
+        origins: Set[str] = set()
+
+        def track(page):
+            def on_navigated(frame):
+                parsed = urlparse(frame.url)
+                if parsed.scheme in ("http", "https"):
+                    origins.add(f"{parsed.scheme}://{parsed.netloc}")
+            page.on("framenavigated", on_navigated)
+
+        ctx.on("page", track)
+        self._uses[ctx] = 0
+        self._origins[ctx] = origins
+        return ctx
+
+    def acquire(self) -> BrowserContext:
+        """Return an idle scrubbed context, creating one if the pool is empty."""
+        ctx = self._idle.pop() if self._idle else self._create()
+        self._uses[ctx] += 1
+        return ctx
+
+    def release(self, ctx: BrowserContext, failed: bool = False) -> None:
+        """Return a context to the pool, or close it if it should be recycled.
+
+        Args:
+            ctx: Context previously returned by :meth:`acquire`
+            failed: Whether the test that used the context failed
+        """
+        if failed or self._uses.get(ctx, 0) >= self.max_uses or len(self._idle) >= self.size:
+            self._discard(ctx)
+            return
+        try:
+            self._scrub(ctx)
+        except PlaywrightError as e:
+            logger.debug(f"Scrubbing pooled context failed, discarding it: {e}")
+            self._discard(ctx)
+            return
+        self._idle.append(ctx)
+
+    def _scrub(self, ctx: BrowserContext) -> None:
+        """Reset a context to the state of a freshly created one."""
+        for page in list(ctx.pages):
+            page.close()
+        ctx.unroute_all(behavior="ignoreErrors")
+        ctx.clear_cookies()
+        ctx.clear_permissions()
+        ctx.set_extra_http_headers({})
+        ctx.set_offline(False)
+
+        origins = self._origins[ctx]
+        if origins:
+            # Serve an empty document for every visited origin so storage can be
+            # cleared in that origin without touching the network.
+            scratch = ctx.new_page()
+            scratch.route("**/*", lambda route: route.fulfill(status=200, content_type="text/html", body=""))
+            for origin in sorted(origins):
+                scratch.goto(origin)
+                scratch.evaluate(_CLEAR_STORAGE_JS)
+            scratch.close()
+            origins.clear()
+
+    def _discard(self, ctx: BrowserContext) -> None:
+        """Close a context and forget about it."""
+        self._uses.pop(ctx, None)
+        self._origins.pop(ctx, None)
+        try:
+            ctx.close()
+        except PlaywrightError as e:
+            logger.debug(f"Closing pooled context failed: {e}")
+
+    def close(self) -> None:
+        """Close every idle context."""
+        while self._idle:
+            self._discard(self._idle.pop())
@@ -0,0 +1,225 @@
+import os
+import json
+import time
+import atexit
+import hashlib
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+from utils.env import run_id
+
+logger = logging.getLogger(__name__)
+
+LEASE_DIR = Path(os.getenv(
+    "CREDENTIAL_LEASE_DIR",
+    os.path.join(Path(__file__).parent.parent.parent, ".auth", "leases"),
+))
+
+
+@dataclass(frozen=True)
+class Credential:
+    email: str
+    password: str
+
+    @property
+    def label(self) -> str:
+        """Email with the local part masked, safe to print in reports."""
+        local, _, domain = self.email.partition("@")
+        return f"{local[:2]}***@{domain}" if domain else f"{local[:2]}***"
+
+
+def load_accounts() -> List[Credential]:
+    """Accounts in the pool, from CREDENTIAL_POOL_FILE or CREDENTIAL_POOL.
+
+    CREDENTIAL_POOL_FILE points to a JSON list of ``{"email": ..., "password": ...}``
+    objects. CREDENTIAL_POOL is a comma- or newline-separated list of
+    ``email:password`` pairs. Without either the pool is empty.
+    """
+    path = os.getenv("CREDENTIAL_POOL_FILE")
+    if path:
+        with open(path, 'r', encoding='utf-8') as file:
+            return [Credential(entry["email"], entry["password"]) for entry in json.load(file)]
+    accounts = []
+    for pair in os.getenv("CREDENTIAL_POOL", "").replace("\n", ",").split(","):
+        email, sep, password = pair.strip().partition(":")
+        if sep and email and password:
+            accounts.append(Credential(email, password))
+    return accounts
+
+
+def pid_alive(pid: int) -> bool:
+    """Whether a process with ``pid`` is running on this machine."""
+    if os.name == "nt":
+        # os.kill(pid, 0) would send CTRL_C_EVENT on Windows
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        code = ctypes.c_ulong()
+        kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+        kernel32.CloseHandle(handle)
+        return code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class CredentialPool:
+    """Exclusive leasing of test accounts across xdist workers and concurrent runs.
+
+    A lease is a file created with ``O_EXCL`` in ``LEASE_DIR``, one per account,
+    recording the run, worker and process holding it. A worker leases one account
+    for its whole session, so no two workers ever share a login. Leases left
+    behind by a crashed process (one that is no longer alive) are broken by one
+    worker at a time.
+    """
+
+    def __init__(self, accounts: List[Credential], lease_dir: Path = LEASE_DIR, wait_timeout: float = 60.0):
+        """Initialize the pool.
+
+        Args:
+            accounts: Accounts that can be leased
+            lease_dir: Directory holding the lease files
+            wait_timeout: Seconds to wait for a free account before giving up
+        """
+        self.accounts = accounts
+        self.lease_dir = Path(lease_dir)
+        self.wait_timeout = wait_timeout
+        self._held: Optional[Credential] = None
+
+    def _lease_path(self, account: Credential) -> Path:
+        return self.lease_dir / f"{hashlib.sha1(account.email.encode('utf-8')).hexdigest()[:16]}.lease"
+
+    def _try_lease(self, account: Credential) -> bool:
+        path = self._lease_path(account)
+        if self._create_lease(path):
+            return True
+        if self._is_stale(path) and self._break_stale_lease(path):
+            # One retry: another worker may have taken the account since the lease was broken
+            return self._create_lease(path)
+        return False
+
+    @staticmethod
+    def _create_lease(path: Path) -> bool:
+        owner = {"run": run_id(), "worker": os.getenv("PYTEST_XDIST_WORKER", "main"),
+                 "pid": os.getpid(), "leased_at": time.time()}
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            json.dump(owner, file)
+        return True
+
+    def _break_stale_lease(self, path: Path) -> bool:
+        """Remove the lease at ``path`` if it is still stale; returns whether it is gone.
+
+        Breakers serialize on a ``.break`` file, so a worker that saw the same dead
+        holder cannot delete the lease another worker created after breaking it.
+        """
+        guard = path.with_suffix(".break")
+        try:
+            fd = os.open(guard, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                # Left behind by a process that died mid-break
+                if time.time() - guard.stat().st_mtime > 30:
+                    guard.unlink(missing_ok=True)
+            except FileNotFoundError:
+                pass
+            return False
+        os.close(fd)
+        try:
+            # Re-check under the guard: the lease may already be a live worker's
+            if not self._is_stale(path):
+                return False
+            logger.info(f"Breaking stale credential lease {path.name}")
+            path.unlink(missing_ok=True)
+            return True
+        finally:
+            guard.unlink(missing_ok=True)
+
+    @staticmethod
+    def _is_stale(path: Path) -> bool:
+        """A lease is stale when its holder process is gone."""
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                owner: Dict[str, Any] = json.load(file)
+        except FileNotFoundError:
+            return True
+        except (json.JSONDecodeError, OSError):
+            # Being written right now, or unreadable; trust it unless it is old
+            try:
+                return time.time() - path.stat().st_mtime > 60
+            except FileNotFoundError:
+                return True
+        return not pid_alive(int(owner.get("pid", 0)))
+
+    def lease(self) -> Credential:
+        """Lease an account for this process, waiting for one to free up.
+
+        Returns the already-held account on repeated calls.
+
+        Raises:
+            RuntimeError: If the pool is empty or no account frees up in time
+        """
+        if self._held:
+            return self._held
+        if not self.accounts:
+            raise RuntimeError("The credential pool is empty; set CREDENTIAL_POOL or CREDENTIAL_POOL_FILE")
+        self.lease_dir.mkdir(parents=True, exist_ok=True)
+        # Start at a worker-specific offset so workers do not all contend for the first account
+        worker = os.getenv("PYTEST_XDIST_WORKER", "gw0")
+        offset = int(worker[2:]) if worker[2:].isdigit() else 0
+        deadline = time.time() + self.wait_timeout
+        while True:
+            for i in range(len(self.accounts)):
+                account = self.accounts[(offset + i) % len(self.accounts)]
+                if self._try_lease(account):
+                    self._held = account
+                    logger.info(f"Leased test account {account.label}")
+                    return account
+            if time.time() > deadline:
+                raise RuntimeError(
+                    f"No free account in the credential pool of {len(self.accounts)} after "
+                    f"{self.wait_timeout:.0f}s; run with at most that many workers"
+                )
+            time.sleep(0.5)
+
+    @property
+    def held(self) -> Optional[Credential]:
+        return self._held
+
+    def release(self) -> None:
+        """Give back the account held by this process, if any."""
+        if self._held:
+            self._lease_path(self._held).unlink(missing_ok=True)
+            logger.info(f"Released test account {self._held.label}")
+            self._held = None
+
+
+_pool: Optional[CredentialPool] = None
+
+
+def get_credential_pool() -> Optional[CredentialPool]:
+    """Return the process-wide pool, or None when no pool is configured."""
+    global _pool
+    if _pool is None:
+        accounts = load_accounts()
+        if not accounts:
+            return None
+        _pool = CredentialPool(accounts, wait_timeout=float(os.getenv("CREDENTIAL_LEASE_TIMEOUT", "60")))
+        atexit.register(_pool.release)
+    return _pool
+
+
+def leased_credential() -> Optional[Credential]:
+    """The account leased by this process (leasing one on first use), or None without a pool."""
+    pool = get_credential_pool()
+    return pool.lease() if pool else None
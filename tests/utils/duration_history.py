@@ -0,0 +1,150 @@
+import os
+import time
+import sqlite3
+import logging
+import statistics
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+from utils.env import env_flag, env_key, run_id
+
+logger = logging.getLogger(__name__)
+
+HISTORY_PATH = Path(os.getenv(
+    "TEST_HISTORY_PATH",
+    os.path.join(Path(__file__).parent.parent.parent, ".test_history.sqlite"),
+))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    test_id TEXT NOT NULL,
+    browser TEXT NOT NULL,
+    base_url TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration_s REAL NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_key ON runs (test_id, browser, base_url, recorded_at);
+"""
+
+
+def history_enabled() -> bool:
+    return env_flag("TEST_HISTORY")
+
+
+class DurationHistory:
+    """Per-test durations and outcomes across runs, in a local SQLite file.
+
+    Rows are keyed by test id, browser and base URL. Each process buffers its
+    results and writes them once at the end of the session; rows of the run in
+    progress are ignored when reading, so every xdist worker plans from the
+    same snapshot.
+    """
+
+    def __init__(self, path: Path = HISTORY_PATH, browsers: Sequence[str] = ("chromium",), base_url: str = "",
+                 window: int = 20, max_age_days: float = 60.0):
+        """Initialize the history.
+
+        Args:
+            path: SQLite file
+            browsers: Browsers the current run uses (several in a cross-browser
+                matrix); the first is the default for :meth:`record`
+            base_url: Environment the current run targets
+            window: How many recent runs of a test are used for estimates
+            max_age_days: Rows older than this are deleted when results are saved
+        """
+        self.path = Path(path)
+        self.browsers = list(browsers)
+        self.base_url = env_key(base_url)
+        self.window = window
+        self.max_age_days = max_age_days
+        self._pending: List[Tuple[str, str, str, float]] = []
+        self._recent: Optional[Dict[str, List[Tuple[str, float]]]] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def recent(self) -> Dict[str, List[Tuple[str, float]]]:
+        """Most recent (outcome, duration) pairs per test, newest first."""
+        if self._recent is None:
+            self._recent = {}
+            if self.path.exists():
+                conn = self._connect()
+                try:
+                    rows = conn.execute(
+                        "SELECT test_id, outcome, duration_s FROM runs "
+                        f"WHERE browser IN ({', '.join('?' * len(self.browsers))}) AND base_url = ? AND run_id != ? "
+                        "ORDER BY recorded_at DESC",
+                        (*self.browsers, self.base_url, run_id()),
+                    ).fetchall()
+                finally:
+                    conn.close()
+                for test_id, outcome, duration in rows:
+                    runs = self._recent.setdefault(test_id, [])
+                    if len(runs) < self.window:
+                        runs.append((outcome, duration))
+        return self._recent
+
+    def estimate(self, test_id: str) -> Optional[float]:
+        """Median duration of the recent passing runs of ``test_id``, or None if unknown."""
+        durations = [duration for outcome, duration in self.recent().get(test_id, []) if outcome == "passed"]
+        return statistics.median(durations) if durations else None
+
+    def flake_score(self, test_id: str) -> float:
+        """How often recent outcomes flip between passed and failed (0 = stable, 1 = every run).
+
+        A test that always fails is broken, not flaky, and scores 0.
+        """
+        outcomes = [outcome for outcome, _ in self.recent().get(test_id, []) if outcome in ("passed", "failed")]
+        if len(outcomes) < 2:
+            return 0.0
+        flips = sum(1 for newer, older in zip(outcomes, outcomes[1:]) if newer != older)
+        return flips / (len(outcomes) - 1)
+
+    def record(self, test_id: str, outcome: str, duration_s: float, browser: Optional[str] = None) -> None:
+        """Buffer the result of one test run (``passed`` or ``failed``) on ``browser`` (default: the first)."""
+        self._pending.append((test_id, browser or self.browsers[0], outcome, duration_s))
+
+    def save(self) -> None:
+        """Write the buffered results and prune rows older than ``max_age_days``."""
+        if not self._pending:
+            return
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO runs (test_id, browser, base_url, run_id, outcome, duration_s, recorded_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(test_id, browser, self.base_url, run_id(), outcome, duration, now)
+                     for test_id, browser, outcome, duration in self._pending],
+                )
+                conn.execute("DELETE FROM runs WHERE recorded_at < ?", (now - self.max_age_days * 86400,))
+            self._pending = []
+        except sqlite3.Error as e:
+            logger.warning(f"Could not save test durations to {self.path}: {e}")
+        finally:
+            conn.close()
+
+
+def longest_first(items: List[Any], estimates: Dict[str, float]) -> List[Any]:
+    """Order items by estimated duration, longest first (stable for ties)."""
+    return sorted(items, key=lambda item: -estimates[item.nodeid])
+
+
+def shard(items: List[Any], estimates: Dict[str, float], workers: int) -> Dict[str, int]:
+    """Assign items to ``workers`` shards, longest first onto the least loaded shard.
+
+    Returns:
+        Shard index per node id
+    """
+    loads = [0.0] * workers
+    assignment = {}
+    for item in longest_first(items, estimates):
+        index = loads.index(min(loads))
+        loads[index] += estimates[item.nodeid]
+        assignment[item.nodeid] = index
+    return assignment
@@ -0,0 +1,20 @@
+import os
+from urllib.parse import urlparse
+
+
+def env_flag(name: str, default: str = "false") -> bool:
+    """Whether the environment variable ``name`` is set to a truthy value."""
+    return os.getenv(name, default).lower() in ("1", "true", "yes", "y")
+
+
+def run_id() -> str:
+    """Identifier shared by all workers of one pytest run."""
+    return os.getenv("PYTEST_XDIST_TESTRUNUID") or f"pid-{os.getpid()}"
+
+
+def env_key(base_url: str) -> str:
+    """Key for per-environment records; local servers on ephemeral ports share one key."""
+    parsed = urlparse(base_url)
+    if parsed.hostname in ("127.0.0.1", "localhost"):
+        return f"{parsed.scheme}://{parsed.hostname}"
+    return base_url.rstrip('/')
@@ -0,0 +1,260 @@
+import os
+import re
+import json
+import hashlib
+import logging
+import itertools
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+from urllib.parse import urlparse, parse_qs, urlencode
+from playwright.sync_api import BrowserContext, Request, Route
+from local_server.server import AUTH_ENDPOINT
+from utils.credential_pool import load_accounts
+
+logger = logging.getLogger(__name__)
+
+HAR_DIR = Path(os.getenv("HAR_DIR", os.path.join(Path(__file__).parent.parent, 'test_data', 'har')))
+AUTH_TEMPLATES_PATH = HAR_DIR / "auth_responses.json"
+# Glob for the login API request; its responses are templated during replay.
+# Only the local stand-in's endpoint is known; real environments must configure it.
+AUTH_API_PATTERN = os.getenv("AUTH_API_PATTERN")
+
+# Headers, cookies and body fields that must not end up in a committed archive
+SECRET_HEADERS = frozenset({"authorization", "cookie", "set-cookie", "proxy-authorization"})
+SECRET_FIELD = re.compile(r"pass|token|secret|session|api[_-]?key|authorization", re.IGNORECASE)
+REDACTED = "REDACTED"
+
+_recording_ids = itertools.count()
+
+
+def har_mode() -> str:
+    """Current HAR mode from HAR_MODE: ``off`` (default), ``record`` or ``replay``."""
+    mode = os.getenv("HAR_MODE", "off").lower()
+    if mode not in ("off", "record", "replay"):
+        raise ValueError(f"Unknown HAR_MODE {mode!r}; expected off, record or replay")
+    return mode
+
+
+def auth_api_pattern() -> Optional[str]:
+    """Glob of the login API: AUTH_API_PATTERN, or the local stand-in's endpoint with BASE_URL=local."""
+    if AUTH_API_PATTERN:
+        return AUTH_API_PATTERN
+    return f"**{AUTH_ENDPOINT}" if os.getenv("BASE_URL") == "local" else None
+
+
+def _host(base_url: str) -> str:
+    return urlparse(base_url).netloc.replace(":", "_") or "default"
+
+
+def har_path(base_url: str) -> Path:
+    """Archive used to replay ``base_url``."""
+    return HAR_DIR / f"{_host(base_url)}.har"
+
+
+def _recording_dir(base_url: str) -> Path:
+    return HAR_DIR / ".recording" / _host(base_url)
+
+
+def attach_har(context: BrowserContext, base_url: str, mode: Optional[str] = None) -> Optional["AuthResponder"]:
+    """Record the context's traffic, or serve it from the archive, depending on ``mode``.
+
+    In record mode each context writes its own HAR when it is closed; call
+    :func:`merge_recordings` once at the end of the session to build the archive.
+    In replay mode every request is served from the archive (unknown requests are
+    aborted, so nothing reaches the network) and the login API is answered from
+    the auth templates according to the submitted credentials.
+
+    Args:
+        context: Context to attach to
+        base_url: Base URL of the application
+        mode: ``off``, ``record`` or ``replay`` (defaults to HAR_MODE)
+
+    Returns:
+        The login API responder in replay mode (call its ``finish`` before the
+        context is closed or pooled), otherwise None
+
+    Raises:
+        ValueError: In replay mode, if the login API pattern is not configured
+    """
+    mode = mode or har_mode()
+    if mode == "record":
+        recording_dir = _recording_dir(base_url)
+        recording_dir.mkdir(parents=True, exist_ok=True)
+        path = recording_dir / f"{os.getpid()}-{next(_recording_ids)}.har"
+        context.route_from_har(path, update=True, update_content="embed", update_mode="full")
+    elif mode == "replay":
+        path = har_path(base_url)
+        if not path.exists():
+            raise FileNotFoundError(f"No HAR archive at {path}; run once with HAR_MODE=record against {base_url}")
+        pattern = auth_api_pattern()
+        if not pattern:
+            raise ValueError("HAR replay needs the login API glob; set AUTH_API_PATTERN (e.g. **/api/v1/auth/login)")
+        context.route_from_har(path, not_found="abort")
+        # Registered after the archive so it takes precedence for the login API
+        responder = AuthResponder(pattern)
+        responder.watch(context)
+        return responder
+    return None
+
+
+def _redact_fields(value: Any) -> Any:
+    """Replace the values of secret-looking keys in parsed JSON, recursively."""
+    if isinstance(value, dict):
+        return {key: REDACTED if SECRET_FIELD.search(key) else _redact_fields(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_redact_fields(item) for item in value]
+    return value
+
+
+def _redact_text(text: str) -> str:
+    """Redact secret fields of a JSON or form-encoded body; other bodies are kept as they are."""
+    try:
+        return json.dumps(_redact_fields(json.loads(text)))
+    except (json.JSONDecodeError, TypeError):
+        pass
+    fields = parse_qs(text, keep_blank_values=True)
+    if fields and any(SECRET_FIELD.search(key) for key in fields):
+        return urlencode([(key, REDACTED if SECRET_FIELD.search(key) else value)
+                          for key, values in fields.items() for value in values])
+    return text
+
+
+def scrub_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Strip credentials, cookies and tokens from one HAR entry, in place.
+
+    The login POST body and the session the site hands out are recorded along
+    with everything else; none of it is needed to replay, since the login API is
+    answered from the auth templates.
+    """
+    for message in (entry.get("request", {}), entry.get("response", {})):
+        message["headers"] = [header for header in message.get("headers", [])
+                              if header.get("name", "").lower() not in SECRET_HEADERS]
+        message["cookies"] = []
+    post_data = entry.get("request", {}).get("postData")
+    if post_data:
+        for param in post_data.get("params", []):
+            if SECRET_FIELD.search(param.get("name", "")):
+                param["value"] = REDACTED
+        if post_data.get("text"):
+            post_data["text"] = _redact_text(post_data["text"])
+    content = entry.get("response", {}).get("content", {})
+    if content.get("text") and content.get("encoding") != "base64":
+        content["text"] = _redact_text(content["text"])
+    return entry
+
+
+def _entry_key(entry: Dict[str, Any]) -> str:
+    request = entry["request"]
+    body = (request.get("postData") or {}).get("text", "")
+    return f"{request['method']} {request['url']} {hashlib.sha1(body.encode('utf-8')).hexdigest()}"
+
+
+def merge_recordings(base_url: str) -> Optional[Path]:
+    """Combine the per-context recordings for ``base_url`` into its archive.
+
+    The previous archive is replaced, so re-recording picks up frontend changes.
+    When the same request was recorded more than once, the latest response wins.
+    Every entry is scrubbed of credentials, cookies and tokens (see :func:`scrub_entry`).
+
+    Returns:
+        Path of the written archive, or None if nothing was recorded
+    """
+    recordings = sorted(_recording_dir(base_url).glob("*.har"), key=lambda path: path.stat().st_mtime)
+    if not recordings:
+        return None
+    merged: Dict[str, Any] = {}
+    log: Dict[str, Any] = {}
+    for recording in recordings:
+        try:
+            with open(recording, 'r', encoding='utf-8') as file:
+                data = json.load(file)["log"]
+        except (json.JSONDecodeError, KeyError, OSError) as e:
+            logger.warning(f"Skipping unreadable HAR recording {recording}: {e}")
+            continue
+        log = log or {key: value for key, value in data.items() if key != "entries"}
+        for entry in data.get("entries", []):
+            merged[_entry_key(entry)] = scrub_entry(entry)
+
+    path = har_path(base_url)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({"log": {**log, "entries": list(merged.values())}}, file)
+    for recording in recordings:
+        recording.unlink()
+    logger.info(f"Recorded {len(merged)} requests for {base_url} into {path}")
+    return path
+
+
+class AuthResponder:
+    """Answers the login API from templates chosen by the submitted credentials.
+
+    Credentials matching MANUAL_EMAIL/MANUAL_PASSWORD or a credential pool account
+    get the ``valid`` template, an empty or whitespace-only field gets
+    ``validation_error`` and anything else gets ``invalid``.
+    """
+
+    def __init__(self, pattern: str, templates_path: Path = AUTH_TEMPLATES_PATH):
+        with open(templates_path, 'r', encoding='utf-8') as file:
+            self.templates: Dict[str, Dict[str, Any]] = json.load(file)
+        self.pattern = pattern
+        self.hits = 0
+        self.aborted_posts: List[str] = []
+        self._context: Optional[BrowserContext] = None
+
+    def watch(self, context: BrowserContext) -> None:
+        """Answer the login API of ``context`` and note POSTs the archive had to abort."""
+        self._context = context
+        context.route(self.pattern, self.handle)
+        context.on("requestfailed", self._on_request_failed)
+
+    def _on_request_failed(self, request: Request) -> None:
+        if request.method == "POST":
+            self.aborted_posts.append(request.url)
+
+    def finish(self) -> Optional[str]:
+        """Stop answering; returns a problem when a login was submitted but never reached this responder."""
+        if self._context:
+            self._context.unroute(self.pattern, self.handle)
+            self._context.remove_listener("requestfailed", self._on_request_failed)
+            self._context = None
+        if self.aborted_posts and not self.hits:
+            return (f"Replay aborted POST {', '.join(sorted(set(self.aborted_posts)))} and the login API was "
+                    f"never answered; AUTH_API_PATTERN ({self.pattern}) does not match the login request")
+        return None
+
+    @staticmethod
+    def _credentials(post_data: Optional[str]) -> List[str]:
+        """Extract (email, password) from a JSON or form-encoded body."""
+        if not post_data:
+            return ["", ""]
+        try:
+            fields = json.loads(post_data)
+        except json.JSONDecodeError:
+            fields = {key: values[0] for key, values in parse_qs(post_data, keep_blank_values=True).items()}
+        if not isinstance(fields, dict):
+            return ["", ""]
+        email = next((str(v) for k, v in fields.items() if "email" in k.lower() or "user" in k.lower()), "")
+        password = next((str(v) for k, v in fields.items() if "pass" in k.lower()), "")
+        return [email, password]
+
+    def classify(self, email: str, password: str) -> str:
+        """Pick the template name for a credential pair."""
+        if not email.strip() or not password.strip():
+            return "validation_error"
+        if email == os.getenv("MANUAL_EMAIL") and password == os.getenv("MANUAL_PASSWORD"):
+            return "valid"
+        if any(email == account.email and password == account.password for account in load_accounts()):
+            return "valid"
+        return "invalid"
+
+    def handle(self, route: Route) -> None:
+        if route.request.method != "POST":
+            route.fallback()
+            return
+        self.hits += 1
+        email, password = self._credentials(route.request.post_data)
+        template = self.templates[self.classify(email, password)]
+        route.fulfill(
+            status=template["status"],
+            headers={"content-type": "application/json", **template.get("headers", {})},
+            body=json.dumps(template["body"]),
+        )
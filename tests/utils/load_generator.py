@@ -0,0 +1,293 @@
+"""Drive the login path with synthetic virtual users to find its capacity limits.
+
+Each virtual user gets its own browser context and runs one login flow through
+:class:`AsyncMarkopoloLoginPage`. Users arrive on an open-model schedule (a
+linear ramp up to a target arrival rate), are spread over a bounded number of
+browser processes, and are reported as throughput, error rate and latency
+histograms per time window.
+
+Usage (from the ``tests`` directory)::
+
+    python -m utils.load_generator --users 200 --rate 5 --ramp-up 30 --max-browsers 4
+"""
+import os
+import sys
+import math
+import time
+import json
+import asyncio
+import logging
+import argparse
+from dataclasses import dataclass, asdict
+from typing import Optional, Dict, Any, List, Tuple
+from playwright.async_api import Browser, async_playwright
+from local_server.server import LocalMarkopoloServer
+from pages.markopolo_login_page_async import AsyncMarkopoloLoginPage
+from utils.credential_pool import Credential, load_accounts
+from utils.perf_capture import percentile
+
+logger = logging.getLogger(__name__)
+
+FLOWS = ("valid", "invalid", "mixed")
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (250, 500, 1000, 2000, 4000, 8000, 16000)
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    """Shape of a load run.
+
+    ``rate`` is the target arrival rate in users per second, reached linearly
+    over ``ramp_up_s``. A rate of 0 starts users as fast as capacity allows
+    (spread evenly over the ramp-up). At most ``max_browsers`` browser
+    processes are open, each with at most ``contexts_per_browser`` users in flight.
+    """
+
+    users: int
+    flow: str = "valid"
+    rate: float = 0.0
+    ramp_up_s: float = 0.0
+    max_browsers: int = 2
+    contexts_per_browser: int = 8
+    window_s: float = 5.0
+
+
+@dataclass
+class UserResult:
+    """Outcome of one virtual user."""
+
+    user: int
+    flow: str
+    passed: bool
+    started_s: float
+    latency_ms: float
+    queued_ms: float
+    error: Optional[str] = None
+
+
+def arrival_schedule(users: int, rate: float, ramp_up_s: float) -> List[float]:
+    """Seconds after the start at which each user arrives.
+
+    The arrival rate grows linearly from 0 to ``rate`` over ``ramp_up_s`` and
+    then stays constant; the k-th user arrives when the cumulative arrivals
+    reach k. With ``rate`` 0 users are spaced evenly over the ramp-up.
+    """
+    if rate <= 0:
+        return [ramp_up_s * k / users for k in range(users)]
+    schedule = []
+    ramp_arrivals = rate * ramp_up_s / 2
+    for k in range(users):
+        if k < ramp_arrivals:
+            schedule.append(math.sqrt(2 * k * ramp_up_s / rate))
+        else:
+            schedule.append(ramp_up_s + (k - ramp_arrivals) / rate)
+    return schedule
+
+
+class _BrowserFleet:
+    """Launches up to ``limit`` browsers lazily and hands out the least loaded one."""
+
+    def __init__(self, browser_type, limit: int, headless: bool):
+        self.browser_type = browser_type
+        self.limit = limit
+        self.headless = headless
+        self.load: Dict[Browser, int] = {}
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, per_browser: int) -> Browser:
+        async with self._lock:
+            idle = [browser for browser, users in self.load.items() if users < per_browser]
+            if not idle and len(self.load) < self.limit:
+                browser = await self.browser_type.launch(headless=self.headless)
+                self.load[browser] = 0
+                idle = [browser]
+            browser = min(idle or self.load, key=self.load.get)
+            self.load[browser] += 1
+            return browser
+
+    def release(self, browser: Browser) -> None:
+        self.load[browser] -= 1
+
+    async def close(self) -> None:
+        await asyncio.gather(*(browser.close() for browser in self.load), return_exceptions=True)
+
+
+async def run_user(browser: Browser, flow: str, base_url: str, context_args: Dict[str, Any],
+                   credential: Optional[Credential] = None) -> Tuple[bool, Optional[str]]:
+    """Run one login flow in a fresh context; returns (passed, error)."""
+    ctx = await browser.new_context(**context_args)
+    try:
+        login = AsyncMarkopoloLoginPage(await ctx.new_page())
+        if flow == "valid":
+            await login.perform_login(base_url, credential.email if credential else None,
+                                      credential.password if credential else None)
+            return True, None
+        await login.navigate_to_prod_env(base_url)
+        await login.enter_invalid_credentials()
+        await login.click_sign_in()
+        outcome = await login.detect_login_outcome()
+        if outcome.status == "error":
+            return True, None
+        return False, f"expected a login error, got {outcome.status}: {outcome.detail}"
+    except Exception as e:
+        return False, f"{type(e).__name__}: {e}"
+    finally:
+        await ctx.close()
+
+
+async def run_load(profile: LoadProfile, base_url: str, browser_name: str = "chromium", headless: bool = True,
+                   context_args: Optional[Dict[str, Any]] = None) -> List[UserResult]:
+    """Run every virtual user of ``profile`` and return their results in arrival order.
+
+    Args:
+        profile: Users, flow, schedule and capacity of the run
+        base_url: Base URL of the application (a real environment or the local server)
+        browser_name: chromium, firefox or webkit
+        headless: Whether to run the browsers headless
+        context_args: Options passed to ``browser.new_context``
+    """
+    if profile.flow not in FLOWS:
+        raise ValueError(f"Unknown flow {profile.flow!r}; expected one of {', '.join(FLOWS)}")
+    context_args = context_args or {"viewport": {"width": 1920, "height": 1080}, "ignore_https_errors": True}
+    accounts = load_accounts()
+    schedule = arrival_schedule(profile.users, profile.rate, profile.ramp_up_s)
+    capacity = asyncio.Semaphore(profile.max_browsers * profile.contexts_per_browser)
+
+    async with async_playwright() as p:
+        fleet = _BrowserFleet(getattr(p, browser_name), profile.max_browsers, headless)
+        started = time.perf_counter()
+
+        async def virtual_user(user: int, arrival_s: float) -> UserResult:
+            await asyncio.sleep(max(0.0, arrival_s - (time.perf_counter() - started)))
+            arrived = time.perf_counter()
+            flow = profile.flow if profile.flow != "mixed" else ("valid", "invalid")[user % 2]
+            credential = accounts[user % len(accounts)] if accounts and flow == "valid" else None
+            async with capacity:
+                browser = await fleet.acquire(profile.contexts_per_browser)
+                begun = time.perf_counter()
+                try:
+                    passed, error = await run_user(browser, flow, base_url, context_args, credential)
+                finally:
+                    fleet.release(browser)
+            return UserResult(user, flow, passed, begun - started, (time.perf_counter() - begun) * 1000,
+                              (begun - arrived) * 1000, error)
+
+        try:
+            return await asyncio.gather(*(virtual_user(user, at) for user, at in enumerate(schedule)))
+        finally:
+            await fleet.close()
+
+
+def _histogram(latencies: List[float]) -> List[int]:
+    counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    for latency in latencies:
+        counts[next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if latency <= bound),
+                    len(LATENCY_BUCKETS_MS))] += 1
+    return counts
+
+
+def summarize(results: List[UserResult], window_s: float = 5.0) -> Dict[str, Any]:
+    """Throughput, error rate and latency distribution, overall and per time window.
+
+    Users are assigned to the window in which they finished.
+    """
+    if not results:
+        return {"users": 0, "windows": []}
+    finished = [(result.started_s + result.latency_ms / 1000, result) for result in results]
+    wall_s = max(end for end, _ in finished) - min(result.started_s for result in results)
+
+    def stats(group: List[UserResult], seconds: float) -> Dict[str, Any]:
+        latencies = [result.latency_ms for result in group]
+        errors = sum(not result.passed for result in group)
+        return {
+            "users": len(group),
+            "errors": errors,
+            "error_rate": errors / len(group),
+            "throughput_per_s": len(group) / seconds if seconds > 0 else 0.0,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "histogram": _histogram(latencies),
+        }
+
+    windows: Dict[int, List[UserResult]] = {}
+    for end, result in finished:
+        windows.setdefault(int(end // window_s), []).append(result)
+    return {
+        **stats(results, wall_s),
+        "wall_s": wall_s,
+        "max_queued_ms": max(result.queued_ms for result in results),
+        "histogram_bounds_ms": list(LATENCY_BUCKETS_MS),
+        "windows": [{"start_s": index * window_s, **stats(group, window_s)}
+                    for index, group in sorted(windows.items())],
+    }
+
+
+def report_lines(summary: Dict[str, Any]) -> List[str]:
+    """Human-readable report of a :func:`summarize` result."""
+    if not summary["users"]:
+        return ["no users ran"]
+    bounds = [f"<={bound}" for bound in summary["histogram_bounds_ms"]] + [f">{summary['histogram_bounds_ms'][-1]}"]
+    lines = [
+        f"{summary['users']} users in {summary['wall_s']:.1f}s: {summary['throughput_per_s']:.2f} logins/s, "
+        f"error rate {summary['error_rate']:.1%}, p50={summary['p50_ms']:.0f} p95={summary['p95_ms']:.0f} "
+        f"p99={summary['p99_ms']:.0f} ms, max queued {summary['max_queued_ms']:.0f} ms",
+        f"{'window':>8} {'users':>6} {'/s':>6} {'err%':>6} {'p50':>7} {'p95':>7}  " + " ".join(f"{b:>7}" for b in bounds),
+    ]
+    for window in summary["windows"]:
+        lines.append(
+            f"{window['start_s']:>7.0f}s {window['users']:>6} {window['throughput_per_s']:>6.2f} "
+            f"{window['error_rate']:>6.1%} {window['p50_ms']:>7.0f} {window['p95_ms']:>7.0f}  "
+            + " ".join(f"{count:>7}" for count in window["histogram"])
+        )
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=os.getenv("BASE_URL", "https://beta-stg.markopolo.ai"),
+                        help="Target environment, or 'local' to start the local stand-in server")
+    parser.add_argument("--browser", default=os.getenv("BROWSER", "chromium"))
+    parser.add_argument("--users", type=int, default=int(os.getenv("LOAD_USERS", "20")))
+    parser.add_argument("--flow", choices=FLOWS, default=os.getenv("LOAD_FLOW", "valid"))
+    parser.add_argument("--rate", type=float, default=float(os.getenv("LOAD_RATE", "0")),
+                        help="Target arrival rate in users/s (0 = as fast as capacity allows)")
+    parser.add_argument("--ramp-up", type=float, default=float(os.getenv("LOAD_RAMP_UP_S", "0")),
+                        help="Seconds to ramp the arrival rate up to --rate")
+    parser.add_argument("--max-browsers", type=int, default=int(os.getenv("LOAD_MAX_BROWSERS", "2")))
+    parser.add_argument("--contexts-per-browser", type=int, default=int(os.getenv("LOAD_CONTEXTS_PER_BROWSER", "8")))
+    parser.add_argument("--window", type=float, default=5.0, help="Report window in seconds")
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--json", dest="json_path", help="Write the summary and per-user results to this file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)8s] %(message)s")
+    profile = LoadProfile(args.users, args.flow, args.rate, args.ramp_up, args.max_browsers,
+                          args.contexts_per_browser, args.window)
+    server = None
+    base_url = args.base_url
+    if base_url == "local":
+        server = LocalMarkopoloServer.from_env()
+        base_url = server.start()
+        os.environ["BASE_URL"] = base_url
+    try:
+        results = asyncio.run(run_load(profile, base_url, args.browser, headless=not args.headed))
+    finally:
+        if server:
+            server.stop()
+
+    summary = summarize(results, profile.window_s)
+    for line in report_lines(summary):
+        print(line)
+    for result in results:
+        if result.error:
+            logger.debug(f"user {result.user} ({result.flow}): {result.error}")
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as file:
+            json.dump({"profile": asdict(profile), "summary": summary,
+                       "results": [asdict(result) for result in results]}, file, indent=2)
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+import os
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Optional
+from urllib.parse import urlparse
+from playwright.sync_api import BrowserContext, Request, Response, Route
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class NetworkProfile:
+    """Which requests a context is allowed to make."""
+
+    name: str
+    blocked_resource_types: FrozenSet[str] = frozenset()
+    block_third_party: bool = False
+
+
+PROFILES: Dict[str, NetworkProfile] = {
+    "full": NetworkProfile("full"),
+    "lean": NetworkProfile("lean", frozenset({"image", "font", "media"})),
+    "minimal": NetworkProfile("minimal", frozenset({"image", "font", "media"}), block_third_party=True),
+}
+
+# Sizes of responses seen unblocked in this process, used to estimate blocked bytes
+_known_sizes: Dict[str, int] = {}
+
+
+def get_profile(name: Optional[str]) -> NetworkProfile:
+    """Look up a profile by name, defaulting to NETWORK_PROFILE or ``full``."""
+    name = (name or os.getenv("NETWORK_PROFILE", "full")).lower()
+    if name not in PROFILES:
+        raise ValueError(f"Unknown network profile {name!r}; expected one of {', '.join(PROFILES)}")
+    return PROFILES[name]
+
+
+def _site(host: str) -> str:
+    """Approximate registrable domain (last two labels) of a host name."""
+    return ".".join(host.split(".")[-2:])
+
+
+@dataclass
+class NetworkStats:
+    """Per-test request accounting for a network profile."""
+
+    profile: str
+    requests: int = 0
+    blocked: int = 0
+    blocked_by_type: Dict[str, int] = field(default_factory=dict)
+    bytes_received: int = 0
+    bytes_blocked: int = 0
+
+
+class NetworkShaper:
+    """Applies a :class:`NetworkProfile` to a browser context and counts traffic.
+
+    Blocked requests are aborted in a context route; the ``full`` profile installs
+    no route at all, so it adds no per-request overhead. The byte count of a
+    blocked request is only known if the same URL was served unblocked earlier
+    in this process, so ``bytes_blocked`` is a lower bound.
+    """
+
+    def __init__(self, context: BrowserContext, profile: NetworkProfile, base_url: str):
+        """Initialize the shaper.
+
+        Args:
+            context: Context to shape
+            profile: Profile to apply
+            base_url: Base URL of the application; its site is first-party
+        """
+        self.context = context
+        self.profile = profile
+        self.stats = NetworkStats(profile.name)
+        allowed = os.getenv("NETWORK_ALLOW_HOSTS", "")
+        self._first_party = {_site(urlparse(base_url).hostname or "")}
+        self._first_party.update(_site(host.strip()) for host in allowed.split(",") if host.strip())
+
+    def _should_block(self, request: Request) -> bool:
+        if request.resource_type in self.profile.blocked_resource_types:
+            return True
+        if self.profile.block_third_party:
+            parsed = urlparse(request.url)
+            if parsed.scheme in ("http", "https") and _site(parsed.hostname or "") not in self._first_party:
+                return True
+        return False
+
+    def _on_route(self, route: Route) -> None:
+        request = route.request
+        if self._should_block(request):
+            self.stats.blocked += 1
+            kind = request.resource_type
+            self.stats.blocked_by_type[kind] = self.stats.blocked_by_type.get(kind, 0) + 1
+            self.stats.bytes_blocked += _known_sizes.get(request.url, 0)
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+    def _on_request(self, request: Request) -> None:
+        self.stats.requests += 1
+
+    def _on_response(self, response: Response) -> None:
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            self.stats.bytes_received += int(length)
+            _known_sizes[response.url] = int(length)
+
+    def attach(self) -> None:
+        """Install the profile's route and start counting requests."""
+        self.context.on("request", self._on_request)
+        self.context.on("response", self._on_response)
+        if self.profile.blocked_resource_types or self.profile.block_third_party:
+            self.context.route("**/*", self._on_route)
+
+    def detach(self) -> None:
+        """Remove the route and listeners so a pooled context can be reused."""
+        self.context.remove_listener("request", self._on_request)
+        self.context.remove_listener("response", self._on_response)
+        if self.profile.blocked_resource_types or self.profile.block_third_party:
+            try:
+                self.context.unroute("**/*", self._on_route)
+            except Exception as e:
+                logger.debug(f"Could not remove network profile route: {e}")
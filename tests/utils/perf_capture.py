@@ -0,0 +1,191 @@
+import os
+import re
+import json
+import math
+import logging
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+from playwright.sync_api import Page, Request
+from utils.env import env_flag
+from utils.har_replay import auth_api_pattern
+
+logger = logging.getLogger(__name__)
+
+PERF_DIR = Path(os.getenv("PERF_DIR", os.path.join(Path(__file__).parent.parent.parent, "perf_results")))
+THRESHOLDS_PATH = os.path.join(Path(__file__).parent.parent, 'test_data', 'perf_thresholds.json')
+METRICS = ("duration_ms", "ttfb_ms", "dcl_ms", "load_ms", "lcp_ms", "login_rtt_ms")
+
+# Navigation Timing and LCP of the current document, relative to navigation start
+_NAVIGATION_METRICS_JS = """async () => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const lcp = await new Promise(resolve => {
+        let value = null;
+        try {
+            const observer = new PerformanceObserver(list => {
+                const entries = list.getEntries();
+                if (entries.length) value = entries[entries.length - 1].startTime;
+            });
+            observer.observe({ type: 'largest-contentful-paint', buffered: true });
+            setTimeout(() => { observer.disconnect(); resolve(value); }, 50);
+        } catch (e) {
+            resolve(null);
+        }
+    });
+    const since = (end) => (nav && end > 0 ? end - nav.startTime : null);
+    return {
+        ttfb_ms: nav ? since(nav.responseStart) : null,
+        dcl_ms: nav ? since(nav.domContentLoadedEventEnd) : null,
+        load_ms: nav ? since(nav.loadEventEnd) : null,
+        lcp_ms: lcp,
+    };
+}"""
+
+
+def perf_enabled() -> bool:
+    return env_flag("PERF_CAPTURE")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (``pct`` in 0-100)."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class PerfCollector:
+    """Collects browser-side timings for the page-object actions of one test.
+
+    Navigation metrics come from the Navigation Timing and Largest Contentful
+    Paint APIs of the current document. The login round trip is taken from the
+    Playwright resource timing of the last request matching the login API glob
+    (AUTH_API_PATTERN, see :func:`utils.har_replay.auth_api_pattern`).
+    """
+
+    def __init__(self, test_id: str):
+        self.test_id = test_id
+        self.records: List[Dict[str, Any]] = []
+        self._login_rtt_ms: Optional[float] = None
+        self._watched: List[Page] = []
+
+    def watch(self, page: Page) -> None:
+        """Start timing login API requests made by ``page``."""
+        if page not in self._watched:
+            page.on("requestfinished", self._on_request_finished)
+            self._watched.append(page)
+
+    def _on_request_finished(self, request: Request) -> None:
+        pattern = auth_api_pattern()
+        if pattern and request.method == "POST" and fnmatch(request.url, pattern):
+            self._login_rtt_ms = request.timing["responseEnd"]
+
+    def capture(self, page: Page, action: str, duration_ms: float, navigation: bool = False) -> Dict[str, Any]:
+        """Record the metrics of one page-object action.
+
+        Args:
+            page: Page the action ran on
+            action: Page-object method name
+            duration_ms: Wall time of the action
+            navigation: Whether to include navigation metrics of the current document
+
+        Returns:
+            The recorded entry
+        """
+        record: Dict[str, Any] = {"test": self.test_id, "action": action, "url": page.url,
+                                  "duration_ms": duration_ms}
+        if navigation:
+            try:
+                record.update(page.evaluate(_NAVIGATION_METRICS_JS))
+            except Exception as e:
+                logger.debug(f"Could not read navigation timing for {action}: {e}")
+        if self._login_rtt_ms is not None:
+            record["login_rtt_ms"] = self._login_rtt_ms
+            self._login_rtt_ms = None
+        self.records.append(record)
+        return record
+
+    def write(self, directory: Path = PERF_DIR) -> Optional[Path]:
+        """Write this test's records as JSONL; returns the file path."""
+        if not self.records:
+            return None
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / (re.sub(r"[^\w.-]+", "_", self.test_id) + ".jsonl")
+        with open(path, 'w', encoding='utf-8') as file:
+            for record in self.records:
+                file.write(json.dumps(record) + "\n")
+        return path
+
+    def violations(self, thresholds: Dict[str, float]) -> List[str]:
+        """Describe every recorded metric that exceeds its threshold."""
+        problems = []
+        for record in self.records:
+            for metric, limit in thresholds.items():
+                value = record.get(metric)
+                if value is not None and value > limit:
+                    problems.append(f"{record['action']} {metric}={value:.0f} exceeds {limit:.0f}")
+        return problems
+
+
+def thresholds_for(item) -> Dict[str, float]:
+    """Thresholds that apply to a test item.
+
+    Per-marker thresholds come from ``test_data/perf_thresholds.json`` (keyed by
+    marker name, strictest wins); keyword arguments of a ``performance`` marker
+    on the test override them.
+    """
+    try:
+        with open(THRESHOLDS_PATH, 'r', encoding='utf-8') as file:
+            by_marker = json.load(file)
+    except FileNotFoundError:
+        by_marker = {}
+    thresholds: Dict[str, float] = {}
+    for marker in item.iter_markers():
+        for metric, limit in by_marker.get(marker.name, {}).items():
+            thresholds[metric] = min(limit, thresholds.get(metric, limit))
+    marker = item.get_closest_marker("performance")
+    if marker:
+        thresholds.update(marker.kwargs)
+    return thresholds
+
+
+def write_summary(directory: Path = PERF_DIR) -> Optional[Dict[str, Any]]:
+    """Aggregate every per-test JSONL file into ``summary.json`` with p50/p95/p99."""
+    values: Dict[str, Dict[str, List[float]]] = {}
+    for path in sorted(directory.glob("*.jsonl")):
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                record = json.loads(line)
+                for metric in METRICS:
+                    if record.get(metric) is not None:
+                        values.setdefault(record["action"], {}).setdefault(metric, []).append(record[metric])
+    if not values:
+        return None
+    summary = {
+        action: {
+            metric: {
+                "count": len(samples),
+                "p50": percentile(samples, 50),
+                "p95": percentile(samples, 95),
+                "p99": percentile(samples, 99),
+            }
+            for metric, samples in metrics.items()
+        }
+        for action, metrics in values.items()
+    }
+    with open(directory / "summary.json", 'w', encoding='utf-8') as file:
+        json.dump(summary, file, indent=2)
+    return summary
+
+
+_active: Optional[PerfCollector] = None
+
+
+def activate(collector: Optional[PerfCollector]) -> None:
+    """Make ``collector`` the one page objects report to (None to stop)."""
+    global _active
+    _active = collector
+
+
+def current() -> Optional[PerfCollector]:
+    """The collector of the running test, if performance capture is on."""
+    return _active
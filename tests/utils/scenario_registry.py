@@ -0,0 +1,148 @@
+import os
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+import pytest
+
+logger = logging.getLogger(__name__)
+
+TEST_DATA_PATH = os.path.join(Path(__file__).parent.parent, 'test_data', 'markopolo_login_testdata.json')
+
+# Sections holding credential cases, and the marker their pytest params carry
+CREDENTIAL_SECTIONS = {
+    "invalid_credentials": "login",
+    "edge_cases": "edge_case",
+    "boundary_cases": "boundary",
+}
+
+
+class ScenarioDataError(ValueError):
+    """The test data file does not match the expected schema."""
+
+
+@dataclass(frozen=True)
+class CredentialCase:
+    """One credential pair from a test data section."""
+
+    name: str
+    section: str
+    email: str
+    password: str
+    description: str = ""
+
+    @property
+    def has_empty_field(self) -> bool:
+        """Whether either field is empty or whitespace only."""
+        return not self.email.strip() or not self.password.strip()
+
+
+@dataclass(frozen=True)
+class LoginDefaults:
+    """Fallback credentials from the flat ``prod_*`` keys."""
+
+    invalid_email: str = "invalid@example.com"
+    invalid_password: str = "invalidpass123"
+    email: str = "test@example.com"
+    password: str = "testpass123"
+
+
+def _require(condition: bool, path: str, message: str) -> None:
+    if not condition:
+        raise ScenarioDataError(f"{path}: {message}")
+
+
+def _credential(section: str, name: str, entry: Any, path: str) -> CredentialCase:
+    where = f"{path} {section}.{name}"
+    _require(isinstance(entry, dict), where, "expected an object")
+    for key in ("email", "password"):
+        _require(isinstance(entry.get(key), str), where, f"'{key}' must be a string")
+    return CredentialCase(name, section, entry["email"], entry["password"], str(entry.get("description", "")))
+
+
+class ScenarioRegistry:
+    """Process-wide, read-only view of the login test data.
+
+    The JSON file is read once, on first use; the credential sections are
+    validated and turned into immutable cases the first time one is accessed,
+    and :meth:`params` yields pytest params for parametrizing tests directly
+    from them. Case names are unique across sections.
+    """
+
+    def __init__(self, path: str = TEST_DATA_PATH):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._raw: Optional[Dict[str, Any]] = None
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        """The parsed JSON document, loaded on first access."""
+        if self._raw is None:
+            with self._lock:
+                if self._raw is None:
+                    try:
+                        with open(self.path, 'r', encoding='utf-8') as file:
+                            data = json.load(file)
+                    except FileNotFoundError:
+                        logger.warning(f"Test data file {self.path} not found; using defaults")
+                        data = {}
+                    except json.JSONDecodeError as e:
+                        raise ScenarioDataError(f"{self.path}: invalid JSON: {e}") from e
+                    _require(isinstance(data, dict), self.path, "expected a JSON object at the top level")
+                    self._raw = data
+        return self._raw
+
+    def cases(self, section: str) -> Tuple[CredentialCase, ...]:
+        """Credential cases of ``section`` (one of CREDENTIAL_SECTIONS), in file order."""
+        _require(section in CREDENTIAL_SECTIONS, self.path, f"unknown credential section {section!r}")
+        return self._sections[section]
+
+    @cached_property
+    def _sections(self) -> Dict[str, Tuple[CredentialCase, ...]]:
+        sections = {}
+        for section in CREDENTIAL_SECTIONS:
+            entries = self.raw.get(section, [] if section == "invalid_credentials" else {})
+            if section == "invalid_credentials":
+                _require(isinstance(entries, list), self.path, f"'{section}' must be a list")
+                items = [(f"{section}[{index}]", entry) for index, entry in enumerate(entries)]
+            else:
+                _require(isinstance(entries, dict), self.path, f"'{section}' must be an object")
+                items = list(entries.items())
+            sections[section] = tuple(_credential(section, name, entry, self.path) for name, entry in items)
+        # Results and test ids are keyed by case name
+        names = [case.name for cases in sections.values() for case in cases]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        _require(not duplicates, self.path, f"duplicate case names {duplicates}")
+        return sections
+
+    @cached_property
+    def defaults(self) -> LoginDefaults:
+        """Fallback credentials, overridden by the ``prod_*`` keys when present."""
+        fields = {"invalid_email": "prod_invalid_email", "invalid_password": "prod_invalid_pass",
+                  "email": "prod_email", "password": "prod_pass"}
+        values = {}
+        for attribute, key in fields.items():
+            if key in self.raw:
+                _require(isinstance(self.raw[key], str), self.path, f"'{key}' must be a string")
+                values[attribute] = self.raw[key]
+        return LoginDefaults(**values)
+
+    def params(self, *sections: str) -> List[Any]:
+        """pytest params (id = case name, marked with the section's marker) for parametrizing tests."""
+        return [pytest.param(case, id=case.name, marks=getattr(pytest.mark, CREDENTIAL_SECTIONS[section]))
+                for section in sections or CREDENTIAL_SECTIONS for case in self.cases(section)]
+
+
+_registries: Dict[str, ScenarioRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(path: str = TEST_DATA_PATH) -> ScenarioRegistry:
+    """Return the process-wide registry for ``path``."""
+    with _registries_lock:
+        if str(path) not in _registries:
+            _registries[str(path)] = ScenarioRegistry(path)
+        return _registries[str(path)]
@@ -0,0 +1,170 @@
+"""Run many login scenarios concurrently inside a single browser process.
+
+Each scenario gets its own browser context and page, driven through
+:class:`AsyncMarkopoloLoginPage`. Concurrency is bounded by a semaphore, so one
+worker keeps several pages busy while each waits on the network.
+
+Usage (from the ``tests`` directory)::
+
+    python -m utils.scenario_runner --concurrency 8 --browser chromium
+
+Pass ``--base-url local`` to run against the bundled stand-in server instead.
+"""
+import os
+import sys
+import time
+import json
+import asyncio
+import logging
+import argparse
+from dataclasses import dataclass, asdict
+from typing import Optional, Dict, Any, List
+from playwright.async_api import Browser, async_playwright
+from local_server.server import LocalMarkopoloServer
+from pages.markopolo_login_page_async import AsyncMarkopoloLoginPage
+from utils.scenario_registry import TEST_DATA_PATH, get_registry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LoginScenario:
+    """A single login attempt and the outcome it should produce.
+
+    ``expect`` is one of ``"success"``, ``"error"`` (server rejects the
+    credentials) or ``"validation"`` (the form refuses to submit).
+    """
+
+    name: str
+    email: str
+    password: str
+    expect: str
+    expected_text: str = ""
+
+
+@dataclass
+class ScenarioResult:
+    """Outcome of running one :class:`LoginScenario`."""
+
+    name: str
+    passed: bool
+    duration_ms: float
+    error: Optional[str] = None
+
+
+def load_scenarios(path: str = TEST_DATA_PATH) -> List[LoginScenario]:
+    """Build scenarios from the login test data file.
+
+    Invalid credentials expect the server error, edge cases with an empty or
+    whitespace-only field expect the "required" validation, and the remaining edge cases expect any
+    visible error. A success scenario is added when MANUAL_EMAIL/MANUAL_PASSWORD
+    are set.
+    """
+    registry = get_registry(path)
+    scenarios = []
+    for case in registry.cases("invalid_credentials"):
+        scenarios.append(LoginScenario(case.name, case.email, case.password, "error", "Invalid credentials"))
+    for case in registry.cases("edge_cases"):
+        expect = "validation" if case.has_empty_field else "error"
+        scenarios.append(LoginScenario(case.name, case.email, case.password, expect))
+
+    email, password = os.getenv("MANUAL_EMAIL"), os.getenv("MANUAL_PASSWORD")
+    if email and password:
+        scenarios.append(LoginScenario("valid_credentials", email, password, "success"))
+    return scenarios
+
+
+async def run_scenario(browser: Browser, scenario: LoginScenario, base_url: str,
+                       context_args: Dict[str, Any]) -> ScenarioResult:
+    """Run one scenario in a fresh context and report whether it behaved as expected."""
+    started = time.perf_counter()
+    ctx = await browser.new_context(**context_args)
+    try:
+        login = AsyncMarkopoloLoginPage(await ctx.new_page())
+        if scenario.expect == "success":
+            await login.perform_login(base_url, scenario.email, scenario.password)
+        else:
+            await login.navigate_to_prod_env(base_url)
+            await login.enter_credentials(scenario.email, scenario.password)
+            await login.click_sign_in()
+            if scenario.expect == "validation":
+                await login.verify_validation_message_for_empty_fields()
+            else:
+                await login.verify_error_message(scenario.expected_text)
+        return ScenarioResult(scenario.name, True, (time.perf_counter() - started) * 1000)
+    except Exception as e:
+        return ScenarioResult(scenario.name, False, (time.perf_counter() - started) * 1000, f"{type(e).__name__}: {e}")
+    finally:
+        await ctx.close()
+
+
+async def run_scenarios(scenarios: List[LoginScenario], base_url: str, concurrency: int = 8,
+                        browser_name: str = "chromium", headless: bool = True,
+                        context_args: Optional[Dict[str, Any]] = None) -> List[ScenarioResult]:
+    """Run scenarios concurrently as separate contexts of one browser.
+
+    Args:
+        scenarios: Scenarios to run
+        base_url: Base URL of the application
+        concurrency: Maximum number of scenarios in flight at once
+        browser_name: chromium, firefox or webkit
+        headless: Whether to run the browser headless
+        context_args: Options passed to ``browser.new_context``
+
+    Returns:
+        One result per scenario, in the order given
+    """
+    context_args = context_args or {"viewport": {"width": 1920, "height": 1080}, "ignore_https_errors": True}
+    semaphore = asyncio.Semaphore(concurrency)
+    async with async_playwright() as p:
+        browser = await getattr(p, browser_name).launch(headless=headless)
+        try:
+            async def bounded(scenario: LoginScenario) -> ScenarioResult:
+                async with semaphore:
+                    return await run_scenario(browser, scenario, base_url, context_args)
+
+            return await asyncio.gather(*(bounded(scenario) for scenario in scenarios))
+        finally:
+            await browser.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=os.getenv("BASE_URL", "https://beta-stg.markopolo.ai"))
+    parser.add_argument("--browser", default=os.getenv("BROWSER", "chromium"))
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("SCENARIO_CONCURRENCY", "8")))
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--json", dest="json_path", help="Write per-scenario results to this file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)8s] %(message)s")
+    scenarios = load_scenarios()
+    server = LocalMarkopoloServer.from_env() if args.base_url == "local" else None
+    base_url = server.start() if server else args.base_url
+    if server:
+        # Page objects read BASE_URL from the environment
+        os.environ["BASE_URL"] = base_url
+    started = time.perf_counter()
+    try:
+        results = asyncio.run(run_scenarios(
+            scenarios, base_url, args.concurrency, args.browser, headless=not args.headed
+        ))
+    finally:
+        if server:
+            server.stop()
+    wall_s = time.perf_counter() - started
+
+    for result in results:
+        status = "PASS" if result.passed else "FAIL"
+        print(f"{status} {result.name} ({result.duration_ms:.0f} ms){' - ' + result.error if result.error else ''}")
+    failed = sum(not result.passed for result in results)
+    print(f"{len(results)} scenarios, {failed} failed in {wall_s:.1f}s "
+          f"({len(results) / wall_s:.2f} scenarios/s, concurrency {args.concurrency})")
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as file:
+            json.dump([asdict(result) for result in results], file, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
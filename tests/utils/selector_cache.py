@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+from utils.env import env_flag, env_key
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = Path(os.getenv(
+    "SELECTOR_CACHE_PATH",
+    os.path.join(Path(__file__).parent.parent.parent, ".selector_cache.json"),
+))
+
+
+class SelectorCache:
+    """Persistent record of which selector candidates resolve each element type.
+
+    Outcomes are keyed by base URL and element type. Each selector keeps decayed
+    win/miss counts and total time-to-resolve, which the page object uses to try
+    historically reliable candidates first. Counts decay with a half-life so the
+    ordering adapts after a frontend deploy, and entries not seen for
+    ``max_age_days`` are evicted.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path = CACHE_PATH, half_life_days: float = 3.0, max_age_days: float = 14.0):
+        """Initialize the cache.
+
+        Args:
+            path: JSON file the cache is persisted to
+            half_life_days: Days after which recorded counts lose half their weight
+            max_age_days: Selectors not seen for this long are evicted on save
+        """
+        self.path = Path(path)
+        self.half_life_days = half_life_days
+        self.max_age_days = max_age_days
+        self._entries = self._read()
+        # Outcomes recorded by this process, merged into the file on save()
+        self._pending: Dict[str, Dict[str, Dict[str, Dict[str, float]]]] = {}
+        self._primaries: Dict[str, Dict[str, str]] = {}
+
+    def _read(self) -> Dict[str, Any]:
+        """Load cache entries from disk, ignoring a missing or corrupt file."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Ignoring unreadable selector cache {self.path}: {e}")
+            return {}
+        if data.get("version") != self.VERSION:
+            return {}
+        return data.get("entries", {})
+
+    @staticmethod
+    def _score(stats: Optional[Dict[str, float]]) -> float:
+        """Smoothed hit rate; unseen selectors score 0.5."""
+        if not stats:
+            return 0.5
+        return (stats.get("wins", 0.0) + 1) / (stats.get("wins", 0.0) + stats.get("misses", 0.0) + 2)
+
+    def _stats(self, base_url: str, element_type: str) -> Dict[str, Dict[str, float]]:
+        """Combined persisted and pending stats for one element type."""
+        persisted = self._entries.get(base_url, {}).get(element_type, {}).get("selectors", {})
+        pending = self._pending.get(base_url, {}).get(element_type, {})
+        merged = {selector: dict(stats) for selector, stats in persisted.items()}
+        for selector, stats in pending.items():
+            target = merged.setdefault(selector, {"wins": 0.0, "misses": 0.0, "total_ms": 0.0})
+            for key in ("wins", "misses", "total_ms"):
+                target[key] = target.get(key, 0.0) + stats[key]
+        return merged
+
+    def order(self, base_url: str, element_type: str, selectors: List[str]) -> List[str]:
+        """Return ``selectors`` sorted by historical hit rate (stable for ties).
+
+        Args:
+            base_url: Environment the selectors are used against
+            element_type: The type of element (e.g., 'email', 'password')
+            selectors: Candidates in their declared order; the first is the primary
+
+        Returns:
+            The candidates, most reliable first
+        """
+        base_url = env_key(base_url)
+        if selectors:
+            self._primaries.setdefault(base_url, {})[element_type] = selectors[0]
+        stats = self._stats(base_url, element_type)
+        return sorted(selectors, key=lambda selector: -self._score(stats.get(selector)))
+
+    def record(self, base_url: str, element_type: str, selector: str, hit: bool, elapsed_ms: float = 0.0) -> None:
+        """Record a single lookup outcome for a selector.
+
+        Args:
+            base_url: Environment the selector was used against
+            element_type: The type of element (e.g., 'email', 'password')
+            selector: The candidate selector
+            hit: Whether this candidate resolved the element
+            elapsed_ms: Time until the element resolved (only meaningful for hits)
+        """
+        stats = (self._pending.setdefault(env_key(base_url), {})
+                 .setdefault(element_type, {})
+                 .setdefault(selector, {"wins": 0.0, "misses": 0.0, "total_ms": 0.0}))
+        if hit:
+            stats["wins"] += 1
+            stats["total_ms"] += elapsed_ms
+        else:
+            stats["misses"] += 1
+
+    def save(self) -> None:
+        """Merge this process's outcomes into the cache file.
+
+        The file is re-read under a lock so concurrent workers do not drop each
+        other's updates, existing counts are decayed by their age, and stale
+        selectors are evicted before the result is written atomically.
+        """
+        if not self._pending and not self._primaries:
+            return
+        lock_path = self.path.with_suffix(self.path.suffix + ".lock")
+        if not self._acquire_lock(lock_path):
+            logger.warning(f"Could not lock {lock_path}; selector outcomes from this run were not saved")
+            return
+        try:
+            now = time.time()
+            entries = self._read()
+            for base_url, types in entries.items():
+                for element_type, entry in types.items():
+                    for selector, stats in list(entry.get("selectors", {}).items()):
+                        age_days = (now - stats.get("last_seen", now)) / 86400
+                        if age_days > self.max_age_days:
+                            del entry["selectors"][selector]
+                            continue
+                        weight = 0.5 ** ((now - stats.get("updated", now)) / 86400 / self.half_life_days)
+                        for key in ("wins", "misses", "total_ms"):
+                            stats[key] = stats.get(key, 0.0) * weight
+                        stats["updated"] = now
+
+            for base_url, types in self._pending.items():
+                for element_type, selectors in types.items():
+                    entry = entries.setdefault(base_url, {}).setdefault(element_type, {"selectors": {}})
+                    for selector, delta in selectors.items():
+                        stats = entry["selectors"].setdefault(selector, {"wins": 0.0, "misses": 0.0, "total_ms": 0.0})
+                        for key in ("wins", "misses", "total_ms"):
+                            stats[key] = stats.get(key, 0.0) + delta[key]
+                        stats["last_seen"] = now
+                        stats["updated"] = now
+            for base_url, types in self._primaries.items():
+                for element_type, primary in types.items():
+                    entries.setdefault(base_url, {}).setdefault(element_type, {"selectors": {}})["primary"] = primary
+
+            tmp_path = self.path.with_suffix(self.path.suffix + f".{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump({"version": self.VERSION, "entries": entries}, file, indent=2)
+            os.replace(tmp_path, self.path)
+            self._entries = entries
+            self._pending = {}
+            self._primaries = {}
+        finally:
+            # Missing if another worker broke the lock as stale; that must not hide an error above
+            lock_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _acquire_lock(lock_path: Path, timeout: float = 10.0) -> bool:
+        """Create ``lock_path`` exclusively, breaking locks older than ``timeout``."""
+        deadline = time.time() + timeout
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return True
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > timeout:
+                        os.unlink(lock_path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.time() > deadline:
+                    return False
+                time.sleep(0.05)
+
+    def rot_report(self, min_lookups: float = 3.0) -> List[str]:
+        """Describe element types whose primary selector is losing to a fallback.
+
+        Args:
+            min_lookups: Minimum decayed lookup count before a primary is judged
+
+        Returns:
+            One human-readable line per rotted primary selector
+        """
+        lines = []
+        for base_url, types in sorted(self._read().items()):
+            for element_type, entry in sorted(types.items()):
+                primary = entry.get("primary")
+                selectors = entry.get("selectors", {})
+                if not primary or not selectors:
+                    continue
+                stats = selectors.get(primary, {})
+                lookups = stats.get("wins", 0.0) + stats.get("misses", 0.0)
+                best, best_stats = max(selectors.items(), key=lambda item: item[1].get("wins", 0.0))
+                if best == primary or lookups < min_lookups:
+                    continue
+                avg_ms = best_stats.get("total_ms", 0.0) / max(best_stats.get("wins", 0.0), 1e-9)
+                lines.append(
+                    f"{base_url} {element_type}: primary {primary!r} hit rate "
+                    f"{stats.get('wins', 0.0) / lookups:.0%}; {best!r} wins instead (avg {avg_ms:.0f} ms)"
+                )
+        return lines
+
+
+_cache: Optional[SelectorCache] = None
+
+
+def get_selector_cache() -> Optional[SelectorCache]:
+    """Return the process-wide selector cache, or None unless SELECTOR_CACHE=true."""
+    global _cache
+    if not env_flag("SELECTOR_CACHE"):
+        return None
+    if _cache is None:
+        _cache = SelectorCache()
+    return _cache
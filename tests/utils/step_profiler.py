@@ -0,0 +1,208 @@
+import os
+import json
+import time
+import logging
+import functools
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Callable, Iterator
+from utils.env import env_flag
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", os.path.join(Path(__file__).parent.parent.parent, "profile_results")))
+
+
+def profile_enabled() -> bool:
+    return env_flag("STEP_PROFILE")
+
+
+class StepProfiler:
+    """Times page-object steps and the individual selector/wait attempts inside them.
+
+    Steps nest (``perform_login`` -> ``click_sign_in`` -> ``_find_element``), so
+    each keeps both total and self time. Attempts are leaves recorded as a hit
+    or a timed-out miss; the time spent in misses is the wasted wait. Every
+    timing is also accumulated as a folded stack (``test;step;...;attempt``) in
+    microseconds, the input format of flamegraph.pl and speedscope. While
+    ``tag`` is set (for example to the browser engine) step timings are also
+    kept per tag, for side-by-side comparison.
+    """
+
+    def __init__(self):
+        self.steps: Dict[str, Dict[str, float]] = {}
+        self.attempts: Dict[str, Dict[str, float]] = {}
+        self.folded: Dict[str, float] = {}
+        self.tagged: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self.tag: Optional[str] = None
+        # Open frames: [name, start time, time spent in children]
+        self._stack: List[List[Any]] = []
+
+    def _fold(self, leaf: str, elapsed_s: float) -> None:
+        key = ";".join([frame[0] for frame in self._stack] + [leaf])
+        self.folded[key] = self.folded.get(key, 0.0) + elapsed_s * 1e6
+
+    @contextmanager
+    def step(self, name: str, ranked: bool = True) -> Iterator[None]:
+        """Time a step nested inside whatever step is currently open.
+
+        Args:
+            name: Step name, usually the page-object method
+            ranked: False for frames (such as the test itself) that should only
+                appear in the folded stacks, not in the ranked step report
+        """
+        frame = [name, time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            total = time.perf_counter() - frame[1]
+            own = total - frame[2]
+            if self._stack:
+                self._stack[-1][2] += total
+            self._fold(name, own)
+            if ranked:
+                stats = self.steps.setdefault(name, {"calls": 0, "total_ms": 0.0, "self_ms": 0.0})
+                stats["calls"] += 1
+                stats["total_ms"] += total * 1000
+                stats["self_ms"] += own * 1000
+                if self.tag:
+                    tagged = self.tagged.setdefault(self.tag, {}).setdefault(name, {"calls": 0, "total_ms": 0.0})
+                    tagged["calls"] += 1
+                    tagged["total_ms"] += total * 1000
+
+    def attempt(self, kind: str, target: str, hit: bool, elapsed_ms: float) -> None:
+        """Record one selector or wait attempt that already finished.
+
+        Args:
+            kind: Attempt category, e.g. ``selector`` or ``wait``
+            target: What was waited for (a selector, load state, ...)
+            hit: True if it succeeded, False if it timed out or missed
+            elapsed_ms: Time the attempt took
+        """
+        name = f"{kind}:{target}"
+        stats = self.attempts.setdefault(name, {"calls": 0, "hits": 0, "misses": 0, "total_ms": 0.0, "wasted_ms": 0.0})
+        stats["calls"] += 1
+        stats["total_ms"] += elapsed_ms
+        if hit:
+            stats["hits"] += 1
+        else:
+            stats["misses"] += 1
+            stats["wasted_ms"] += elapsed_ms
+        if self._stack:
+            self._stack[-1][2] += elapsed_ms / 1000
+        self._fold(f"{name} ({'hit' if hit else 'miss'})", elapsed_ms / 1000)
+
+    @contextmanager
+    def timed_attempt(self, kind: str, target: str, miss: tuple = (Exception,)) -> Iterator[None]:
+        """Time the enclosed block as an attempt; raising one of ``miss`` counts as a miss."""
+        started = time.perf_counter()
+        try:
+            yield
+        except miss:
+            self.attempt(kind, target, False, (time.perf_counter() - started) * 1000)
+            raise
+        self.attempt(kind, target, True, (time.perf_counter() - started) * 1000)
+
+    def dump(self, path: Path) -> None:
+        """Write the raw aggregates so another process can merge them."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({"steps": self.steps, "attempts": self.attempts, "folded": self.folded,
+                       "tagged": self.tagged}, file)
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        """Add aggregates produced by :meth:`dump` in another process."""
+        for section in ("steps", "attempts"):
+            target = getattr(self, section)
+            for name, stats in data.get(section, {}).items():
+                merged = target.setdefault(name, {key: 0 for key in stats})
+                for key, value in stats.items():
+                    merged[key] = merged.get(key, 0) + value
+        for stack, value in data.get("folded", {}).items():
+            self.folded[stack] = self.folded.get(stack, 0.0) + value
+        for tag, steps in data.get("tagged", {}).items():
+            for name, stats in steps.items():
+                merged = self.tagged.setdefault(tag, {}).setdefault(name, {"calls": 0, "total_ms": 0.0})
+                merged["calls"] += stats["calls"]
+                merged["total_ms"] += stats["total_ms"]
+
+    def report_lines(self, limit: int = 15) -> List[str]:
+        """Ranked report of steps by self time and attempts by wasted time."""
+        lines = ["steps by self time (ms):"]
+        for name, stats in sorted(self.steps.items(), key=lambda item: -item[1]["self_ms"])[:limit]:
+            lines.append(f"  {name:<40} calls={stats['calls']:<5} self={stats['self_ms']:>9.0f} "
+                         f"total={stats['total_ms']:>9.0f}")
+        lines.append("selector/wait attempts by wasted time (ms):")
+        for name, stats in sorted(self.attempts.items(),
+                                  key=lambda item: (-item[1]["wasted_ms"], -item[1]["total_ms"]))[:limit]:
+            lines.append(f"  {name[:60]:<60} hits={stats['hits']:<4} misses={stats['misses']:<4} "
+                         f"wasted={stats['wasted_ms']:>8.0f} total={stats['total_ms']:>8.0f}")
+        return lines
+
+    def comparison_lines(self, limit: int = 15) -> List[str]:
+        """Mean step latency per tag, one column per tag, slowest steps first."""
+        tags = sorted(self.tagged)
+        if not tags:
+            return []
+        names = sorted({name for steps in self.tagged.values() for name in steps},
+                       key=lambda name: -max(self.tagged[tag].get(name, {}).get("total_ms", 0.0) for tag in tags))
+        lines = [f"{'mean ms per call':<40} " + " ".join(f"{tag:>10}" for tag in tags)]
+        for name in names[:limit]:
+            cells = []
+            for tag in tags:
+                stats = self.tagged[tag].get(name)
+                cells.append(f"{stats['total_ms'] / stats['calls']:>10.0f}" if stats else f"{'-':>10}")
+            lines.append(f"{name:<40} " + " ".join(cells))
+        return lines
+
+    def write_folded(self, path: Path) -> None:
+        """Export folded stacks (one ``frame;frame;leaf microseconds`` line each)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            for stack, value in sorted(self.folded.items()):
+                file.write(f"{stack.replace(' ', '_')} {int(value)}\n")
+
+
+_active: Optional[StepProfiler] = None
+
+
+def activate(profiler: Optional[StepProfiler]) -> None:
+    """Make ``profiler`` the one page objects report to (None to stop)."""
+    global _active
+    _active = profiler
+
+
+def current() -> Optional[StepProfiler]:
+    """The session profiler, if step profiling is on."""
+    return _active
+
+
+def profiled_step(func: Callable) -> Callable:
+    """Decorate a page-object method so it is timed as a step when profiling is on."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = _active
+        if profiler is None:
+            return func(*args, **kwargs)
+        with profiler.step(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def record_attempt(kind: str, target: str, hit: bool, elapsed_ms: float) -> None:
+    """Record a finished attempt on the active profiler, if any."""
+    if _active is not None:
+        _active.attempt(kind, target, hit, elapsed_ms)
+
+
+@contextmanager
+def attempt(kind: str, target: str, miss: tuple = (Exception,)) -> Iterator[None]:
+    """Time the enclosed block as an attempt on the active profiler, if any."""
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+    with profiler.timed_attempt(kind, target, miss):
+        yield